@@ -1,6 +1,7 @@
 import * as cdk from 'aws-cdk-lib';
 import * as acm from 'aws-cdk-lib/aws-certificatemanager';
 import * as dynamodb from 'aws-cdk-lib/aws-dynamodb';
+import * as iam from 'aws-cdk-lib/aws-iam';
 import * as lambda from 'aws-cdk-lib/aws-lambda';
 import * as sources from 'aws-cdk-lib/aws-lambda-event-sources';
 import * as secrets from 'aws-cdk-lib/aws-secretsmanager';
@@ -14,7 +15,11 @@ import { Auth0Settings, DomainSettings } from '../constants';
 
 interface ApiProps {
   gameTable: dynamodb.ITable;
+  historyTable: dynamodb.ITable;
+  idempotencyTable: dynamodb.ITable;
+  leaseTable: dynamodb.ITable;
   memoryTable: dynamodb.ITable;
+  poolTable: dynamodb.ITable;
   questionTable: dynamodb.ITable;
 }
 
@@ -30,10 +35,20 @@ export class Api extends Construct {
     const handlerFunction = new pythonLambda.PythonFunction(this, 'HandlerFunction', {
       entry: 'lib/backend/app',
       environment: {
+        AUTH0_EMAIL_CLAIMS: ['email', Auth0Settings.EMAIL_CLAIM].join(','),
         GAME_TABLE: props.gameTable.tableName,
+        // 'single' keeps questions inside the game item, see app/migrate.py
+        GAME_LAYOUT: 'tables',
         SESSION_TABLE: props.memoryTable.tableName,
+        HISTORY_TABLE: props.historyTable.tableName,
         QUESTION_TABLE: props.questionTable.tableName,
+        LEASE_TABLE: props.leaseTable.tableName,
+        IDEMPOTENCY_TABLE: props.idempotencyTable.tableName,
         OPENAI_API_KEY_SECRET: apiKey.secretName,
+        POOL_TABLE: props.poolTable.tableName,
+        PREFETCH_QUESTIONS: 'true',
+        // 'history' or 'session' also keep the questions per game in a table
+        QUIZ_MEMORY: 'game',
       },
       memorySize: 256,
       runtime: lambda.Runtime.PYTHON_3_10,
@@ -42,8 +57,26 @@ export class Api extends Construct {
 
     apiKey.grantRead(handlerFunction);
 
+    // the handler invokes itself asynchronously to prefetch questions; the ARN
+    // is built by pattern since referencing the function would be circular
+    handlerFunction.addToRolePolicy(new iam.PolicyStatement({
+      actions: ['lambda:InvokeFunction'],
+      resources: [
+        cdk.Stack.of(this).formatArn({
+          service: 'lambda',
+          resource: 'function',
+          resourceName: `${cdk.Stack.of(this).stackName}-*`,
+          arnFormat: cdk.ArnFormat.COLON_RESOURCE_NAME,
+        }),
+      ],
+    }));
+
     props.gameTable.grantReadWriteData(handlerFunction);
+    props.historyTable.grantReadWriteData(handlerFunction);
+    props.idempotencyTable.grantReadWriteData(handlerFunction);
+    props.leaseTable.grantReadWriteData(handlerFunction);
     props.memoryTable.grantReadWriteData(handlerFunction);
+    props.poolTable.grantReadData(handlerFunction);
     props.questionTable.grantReadWriteData(handlerFunction);
 
     const quizIntegration = new integrations.HttpLambdaIntegration('Integration', handlerFunction);
@@ -56,6 +89,7 @@ export class Api extends Construct {
         allowHeaders: [
           'authorization',
           'content-type',
+          'idempotency-key',
           '*',
         ],
         allowMethods: [
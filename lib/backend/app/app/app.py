@@ -1,10 +1,8 @@
-import hashlib
+from functools import partial, wraps
 import json
 import os
-import urllib
 
-from auth0.authentication import Users
-from aws_lambda_powertools import Logger, Tracer
+from aws_lambda_powertools import Logger, Metrics, Tracer
 from aws_lambda_powertools.event_handler import (
     APIGatewayHttpResolver,
     Response,
@@ -16,57 +14,167 @@ from aws_lambda_powertools.event_handler.exceptions import (
 )
 from aws_lambda_powertools.logging import correlation_paths
 from aws_lambda_powertools.utilities.typing import LambdaContext
-import boto3
 
-from .game import Game, InvalidGame, QuestionsLimitReached
-from .game_service import OpenAIService
-from .gateway import DynamoGateway, NoSuchGame, NoSuchQuestion
+from .game import Game, InvalidGame, NoOpenQuestion, QuestionsLimitReached
+from .game_service import (
+    DedupGameService,
+    DuplicateFilter,
+    LazyGameService,
+    PooledGameService,
+)
+from .game_service.base import BaseGameService
+from .gateway import (
+    DynamoGateway,
+    DynamoIdempotencyStore,
+    DynamoLeaseStore,
+    DynamoQuestionPool,
+    MemoryIdempotencyStore,
+    MemoryLeaseStore,
+    NoSuchGame,
+    NoSuchQuestion,
+    SingleItemGateway,
+    View,
+)
+from .idempotency import (
+    Idempotency,
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+)
+from .identity import IdentityResolver
 from .player import Player
+from .prefetch import LambdaPrefetcher, prefetch_question
+from .question import InvalidAnswer
+from .secrets_provider import SecretsProvider
+from .single_flight import SingleFlight
 
 
 tracer = Tracer()
 logger = Logger()
+metrics = Metrics(namespace=os.getenv("POWERTOOLS_METRICS_NAMESPACE", "AiQuiz"))
 app = APIGatewayHttpResolver()
+identity = IdentityResolver(
+    email_claims=os.getenv("AUTH0_EMAIL_CLAIMS", "email").split(","),
+    metrics=metrics,
+)
+prefetch_min_answered = int(os.getenv("PREFETCH_MIN_ANSWERED", "2"))
+secrets = SecretsProvider(ttl=float(os.getenv("SECRETS_TTL", "300")))
 
 
-def initialize():
-    global gateway, service
+def build_service() -> BaseGameService:
+    """The question generation stack, built on the first question asked."""
+    from .game_service import OpenAIService
 
-    secrets_client = boto3.client("secretsmanager")
-    openai_key = secrets_client.get_secret_value(
-        SecretId=os.getenv("OPENAI_API_KEY_SECRET")
-    )
-
-    gateway = DynamoGateway(
-        game_table=os.getenv("GAME_TABLE"),
-        question_table=os.getenv("QUESTION_TABLE"),
-    )
     service = OpenAIService(
-        api_key=openai_key["SecretString"],
-        session_table=os.getenv("SESSION_TABLE"),
+        api_key=partial(secrets.get, os.getenv("OPENAI_API_KEY_SECRET")),
+        history_table=(
+            os.getenv("HISTORY_TABLE")
+            if os.getenv("QUIZ_MEMORY") == "history"
+            else None
+        ),
+        session_table=(
+            os.getenv("SESSION_TABLE")
+            if os.getenv("QUIZ_MEMORY") == "session"
+            else None
+        ),
     )
 
+    # across games too: players of a topic draw from the same pool of facts
+    service = DedupGameService(service, DuplicateFilter(check_topic=True))
+
+    if os.getenv("POOL_TABLE"):
+        service = PooledGameService(
+            pool=DynamoQuestionPool(pool_table=os.getenv("POOL_TABLE")),
+            fallback=service,
+            duplicates=service.duplicates,
+        )
+
+    return service
+
+
+def initialize():
+    global gateway, service, prefetcher, single_flight, idempotency
+
+    if os.getenv("GAME_LAYOUT") == "single":
+        gateway = SingleItemGateway(
+            game_table=os.getenv("GAME_TABLE"),
+            compress=os.getenv("GAME_COMPRESSION") == "zlib",
+        )
+    else:
+        gateway = DynamoGateway(
+            game_table=os.getenv("GAME_TABLE"),
+            question_table=os.getenv("QUESTION_TABLE"),
+        )
+
+    service = LazyGameService(build_service)
+
+    if os.getenv("LEASE_TABLE"):
+        single_flight = SingleFlight(
+            DynamoLeaseStore(lease_table=os.getenv("LEASE_TABLE"))
+        )
+    else:
+        single_flight = SingleFlight(MemoryLeaseStore())
+
+    idempotency_window = float(os.getenv("IDEMPOTENCY_WINDOW", "86400"))
+
+    if os.getenv("IDEMPOTENCY_TABLE"):
+        idempotency = Idempotency(
+            DynamoIdempotencyStore(idempotency_table=os.getenv("IDEMPOTENCY_TABLE")),
+            window=idempotency_window,
+        )
+    else:
+        idempotency = Idempotency(MemoryIdempotencyStore(), window=idempotency_window)
+
+    if os.getenv("PREFETCH_QUESTIONS") == "true":
+        prefetcher = LambdaPrefetcher(
+            function_name=os.getenv("AWS_LAMBDA_FUNCTION_NAME"),
+        )
+    else:
+        prefetcher = None
+
 
 initialize()
 
 
+def idempotent(route):
+    """Replay the response to a request repeated with its Idempotency-Key.
+
+    The route gets the player, resolved once for both.
+    """
+
+    @wraps(route)
+    def wrapper(*args, **kwargs):
+        player = get_player(app.current_event)
+        key = app.current_event.get_header_value("Idempotency-Key")
+
+        if not key:
+            return route(*args, player=player, **kwargs)
+
+        return idempotency.handle(
+            f"{player.player_id}#{app.current_event.path}#{key}",
+            app.current_event.body or "",
+            partial(route, *args, player=player, **kwargs),
+        )
+
+    return wrapper
+
+
 @app.get("/games")
 @tracer.capture_method
 def get_games():
     player = get_player(app.current_event)
-    games = gateway.list_player_games(player.player_id)
+    games = gateway.list_player_games(player.player_id, View.SUMMARY)
 
     return {"games": [game.to_dict() for game in games]}
 
 
 @app.post("/games")
 @tracer.capture_method
-def start_game():
+@idempotent
+def start_game(player: Player):
     global gateway
 
     json_payload = app.current_event.json_body
 
-    player = get_player(app.current_event)
     game = Game.create(
         keywords=set(json_payload["keywords"]),
         questions_limit=15,
@@ -82,7 +190,7 @@ def get_game(game):
     global gateway
 
     player = get_player(app.current_event)
-    game = gateway.get_game(player.player_id, game)
+    game = gateway.get_game(player.player_id, game, View.SUMMARY)
 
     return game.to_dict()
 
@@ -93,7 +201,7 @@ def get_questions(game):
     global gateway
 
     player = get_player(app.current_event)
-    game = gateway.get_game(player.player_id, game)
+    game = gateway.get_game(player.player_id, game, View.RESULTS)
 
     return {
         "questions": [
@@ -117,10 +225,18 @@ def generate_question(game):
     global gateway, service
 
     player = get_player(app.current_event)
-    game = gateway.get_game(player.player_id, game)
+    game = gateway.get_game(player.player_id, game, View.RESULTS)
+
+    with single_flight.generation(
+        gateway, player.player_id, game, View.RESULTS
+    ) as game:
+        question = game.quiz(service)
 
-    question = game.quiz(service)
-    gateway.update_game(player.player_id, game)
+        if not gateway.flush(player.player_id, game):
+            # a prefetched question took the slot while this one was generated
+            game = gateway.get_game(player.player_id, game.game_id, View.RESULTS)
+            question = game.quiz(service)
+            gateway.flush(player.player_id, game)
 
     return {
         "prompt": question.prompt,
@@ -133,9 +249,17 @@ def generate_question(game):
 def get_question(game, question):
     global gateway
 
+    if not question.isdigit():
+        raise NotFoundError
+
     player = get_player(app.current_event)
-    game = gateway.get_game(player.player_id, game)
-    question = question.get_game_question(game, question)
+    question = gateway.get_game_question(
+        player.player_id, game, int(question), View.RESULTS
+    )
+
+    # questions generated ahead of time stay hidden until asked for
+    if question.pending:
+        raise NotFoundError
 
     return {
         "question": question.prompt,
@@ -145,18 +269,18 @@ def get_question(game, question):
 
 @app.post("/games/<game>/questions/answer")
 @tracer.capture_method
-def answer_question(game):
+@idempotent
+def answer_question(game, player: Player):
     global gateway
 
     json_payload = app.current_event.json_body
 
-    player = get_player(app.current_event)
-    game = gateway.get_game(player.player_id, game)
-
-    question = game.quiz(service)
-    feedback = question.answer(json_payload["choice"])
+    game, feedback = gateway.answer_question(
+        player.player_id, game, json_payload["choice"]
+    )
 
-    gateway.update_game(player.player_id, game)
+    if prefetcher is not None and game.can_prefetch(prefetch_min_answered):
+        prefetcher.schedule(player.player_id, game.game_id)
 
     return {
         "result": feedback.result,
@@ -184,6 +308,68 @@ def handle_invalid_game(ex: InvalidGame):
     )
 
 
+@app.exception_handler(InvalidAnswer)
+def handle_invalid_answer(ex: InvalidAnswer):
+    return Response(
+        status_code=400,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps({"errors": [{"field": "choice", "message": "No such option"}]}),
+    )
+
+
+@app.exception_handler(NoOpenQuestion)
+def handle_no_open_question(ex: NoOpenQuestion):
+    return Response(
+        status_code=409,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps(
+            {
+                "errors": [
+                    {
+                        "message": f"Game {ex.game.game_id} has no open question",
+                    }
+                ]
+            }
+        ),
+    )
+
+
+@app.exception_handler(IdempotencyKeyReused)
+def handle_idempotency_key_reused(ex: IdempotencyKeyReused):
+    return Response(
+        status_code=422,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps(
+            {
+                "errors": [
+                    {
+                        "field": "Idempotency-Key",
+                        "message": "Key already used for a different request",
+                    }
+                ]
+            }
+        ),
+    )
+
+
+@app.exception_handler(IdempotencyKeyInProgress)
+def handle_idempotency_key_in_progress(ex: IdempotencyKeyInProgress):
+    return Response(
+        status_code=409,
+        content_type=content_types.APPLICATION_JSON,
+        body=json.dumps(
+            {
+                "errors": [
+                    {
+                        "field": "Idempotency-Key",
+                        "message": "A request with this key is still in progress",
+                    }
+                ]
+            }
+        ),
+    )
+
+
 @app.exception_handler(QuestionsLimitReached)
 def handle_questions_limit_reached(ex: QuestionsLimitReached):
     game_id = ex.game.game_id
@@ -205,16 +391,27 @@ def handle_questions_limit_reached(ex: QuestionsLimitReached):
 
 
 def get_player(event) -> Player:
-    domain = urllib.parse.urlparse(event.request_context.authorizer.jwt_claim["iss"])
-    token = event.get_header_value("Authorization").split(" ")[-1]
-
-    users = Users(domain.netloc)
-    user = users.userinfo(token)
-
-    return Player(hashlib.md5(user["email"].encode("utf-8")).hexdigest())
+    return identity.resolve(event)
 
 
 @logger.inject_lambda_context(correlation_id_path=correlation_paths.API_GATEWAY_HTTP)
 @tracer.capture_lambda_handler
+@metrics.log_metrics
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
+    if "prefetch" in event:
+        return handle_prefetch(event["prefetch"])
+
     return app.resolve(event, context)
+
+
+def handle_prefetch(request: dict) -> dict:
+    question = prefetch_question(
+        gateway,
+        service,
+        request["player_id"],
+        request["game_id"],
+        prefetch_min_answered,
+        single_flight,
+    )
+
+    return {"prefetched": question is not None}
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 import secrets
-from typing import List, Set, TYPE_CHECKING
+from typing import Iterable, List, Optional, Set, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .game_service.base import GameService
@@ -9,6 +9,35 @@ if TYPE_CHECKING:
 from .question import Question
 
 
+def normalize_keywords(keywords: Iterable[str]) -> str:
+    """Topic key shared by every keyword set that differs only in case/spacing."""
+    return ",".join(sorted(set(" ".join(k.lower().split()) for k in keywords)))
+
+
+@dataclass
+class GameProgress:
+    asked: int = 0
+    answered: int = 0
+    correct: int = 0
+
+    def __add__(self, other: "GameProgress") -> "GameProgress":
+        return GameProgress(
+            asked=self.asked + other.asked,
+            answered=self.answered + other.answered,
+            correct=self.correct + other.correct,
+        )
+
+    @staticmethod
+    def of(questions: List[Question]):
+        answered = [question for question in questions if question.is_answered]
+
+        return GameProgress(
+            asked=len(questions),
+            answered=len(answered),
+            correct=sum(question.answered_correctly for question in answered),
+        )
+
+
 @dataclass
 class Game:
     game_id: str
@@ -17,29 +46,90 @@ class Game:
 
     creation_time: datetime = field(default_factory=datetime.utcnow)
     questions: List[Question] = field(default_factory=list)
+    # counters stored alongside the game, used when questions are not loaded
+    summary: Optional[GameProgress] = None
+    # next question, generated ahead of time while the player was answering
+    pending_question: Optional[Question] = None
+
+    @property
+    def progress(self) -> GameProgress:
+        if self.questions or self.summary is None:
+            return GameProgress.of(self.questions)
+        else:
+            return self.summary
+
+    @property
+    def topic(self) -> str:
+        return normalize_keywords(self.keywords)
+
+    def attach_questions(self, questions: List[Question]):
+        """Set the stored questions, keeping a trailing pending one aside."""
+        questions = list(questions)
+
+        if questions and questions[-1].pending:
+            self.pending_question = questions.pop()
+
+        self.questions = questions
 
     @property
     def is_latest_answered(self):
         return self.questions[-1].is_answered
 
+    @property
+    def open_question(self) -> Question:
+        """The question shown to the player and not answered yet."""
+        if not self.questions or self.is_latest_answered:
+            raise NoOpenQuestion(self)
+
+        return self.questions[-1]
+
+    @property
+    def needs_generation(self) -> bool:
+        """Whether quizzing the game would generate a new question."""
+        return (
+            self.pending_question is None
+            and (not self.questions or self.is_latest_answered)
+            and len(self.questions) < self.questions_limit
+        )
+
     def quiz(self, service: "GameService") -> Question:
         if len(self.questions) == 0 or self.is_latest_answered:
             if len(self.questions) == self.questions_limit:
                 raise QuestionsLimitReached(self)
 
-            question = service.generate_question(self)
+            if self.pending_question is not None:
+                question = self.pending_question
+                question.reveal()
+                self.pending_question = None
+            else:
+                question = service.generate_question(self)
+
             self.questions.append(question)
 
             return question
         else:
             return self.questions[-1]
 
+    def can_prefetch(self, min_answered: int = 1) -> bool:
+        """Whether generating the next question ahead of time is worthwhile.
+
+        Only games where the player has answered the current question, has
+        shown some engagement and still has questions left qualify. Summaries
+        qualify on their counters, a pending question being left unchecked.
+        """
+        progress = self.progress
+
+        return (
+            self.pending_question is None
+            and progress.asked > 0
+            and progress.answered == progress.asked
+            and progress.asked < self.questions_limit
+            and progress.answered >= min_answered
+        )
+
     @property
     def questions_answered(self):
-        if not self.questions or self.questions[-1].is_answered:
-            return len(self.questions)
-        else:
-            return len(self.questions) - 1
+        return self.progress.answered
 
     def to_dict(self):
         return {
@@ -77,6 +167,11 @@ class QuestionsLimitReached(Exception):
         self.game = game
 
 
+class NoOpenQuestion(Exception):
+    def __init__(self, game: Game):
+        self.game = game
+
+
 @dataclass
 class FieldError:
     field: str
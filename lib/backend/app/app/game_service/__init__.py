@@ -1,5 +1,21 @@
-from .openai import OpenAIService
+from .dedup import DedupGameService, DuplicateFilter
+from .lazy import LazyGameService
+from .pool import PooledGameService
 
 __all__ = [
+    "DedupGameService",
+    "DuplicateFilter",
+    "LazyGameService",
     "OpenAIService",
+    "PooledGameService",
 ]
+
+
+def __getattr__(name: str):
+    # OpenAIService pulls in langchain and openai, imported on first use only
+    if name == "OpenAIService":
+        from .openai import OpenAIService
+
+        return OpenAIService
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
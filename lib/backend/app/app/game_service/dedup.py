@@ -0,0 +1,119 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from aws_lambda_powertools import Logger
+
+from .base import BaseGameService
+from ..cache import LRUCache
+from ..game import Game
+from ..question import Question
+from ..similarity import LSHIndex, MinHash, Signature
+
+
+logger = Logger()
+
+
+@dataclass
+class DuplicateFilter:
+    """Near-duplicate detection of question prompts, per game and per topic.
+
+    Signatures are memoized per prompt and topic indexes are kept in bounded
+    caches, both living across warm invocations.
+    """
+
+    minhash: MinHash = field(default_factory=MinHash)
+    threshold: float = 0.6
+    check_topic: bool = False
+
+    signatures: LRUCache = field(default_factory=lambda: LRUCache(maxsize=4096))
+    topics: LRUCache = field(default_factory=lambda: LRUCache(maxsize=64))
+
+    def signature(self, prompt: str) -> Signature:
+        signature = self.signatures.get(prompt)
+
+        if signature is None:
+            signature = self.minhash.signature(prompt)
+            self.signatures.put(prompt, signature)
+
+        return signature
+
+    def _index(self, prompts: Iterable[str]) -> LSHIndex:
+        index = LSHIndex(threshold=self.threshold)
+
+        for prompt in prompts:
+            index.add(prompt, self.signature(prompt))
+
+        return index
+
+    def _topic_index(self, topic: str) -> LSHIndex:
+        index = self.topics.get(topic)
+
+        if index is None:
+            index = LSHIndex(threshold=self.threshold)
+            self.topics.put(topic, index)
+
+        return index
+
+    def find_duplicate(self, game: Game, prompt: str) -> Optional[str]:
+        """A prompt the game, or its topic, already has that is close to ``prompt``."""
+        signature = self.signature(prompt)
+        seen = [question.prompt for question in game.questions]
+
+        if game.pending_question is not None:
+            seen.append(game.pending_question.prompt)
+
+        indexes = [self._index(seen)]
+        if self.check_topic:
+            indexes.append(self._topic_index(game.topic))
+
+        for index in indexes:
+            matches = index.query(signature)
+
+            if matches:
+                return matches[0][0]
+
+        return None
+
+    def accept(self, game: Game, prompt: str):
+        if self.check_topic:
+            self._topic_index(game.topic).add(prompt, self.signature(prompt))
+
+
+@dataclass
+class DedupGameService(BaseGameService):
+    """Reject generated questions that are near-duplicates and generate again.
+
+    After ``max_attempts`` duplicates in a row the last question is accepted
+    anyway, rather than failing the player's request.
+    """
+
+    service: BaseGameService
+    duplicates: DuplicateFilter = field(default_factory=DuplicateFilter)
+    max_attempts: int = 3
+
+    counters: Counter = field(init=False, default_factory=Counter)
+
+    def generate_question(self, game: Game) -> Question:
+        for attempt in range(self.max_attempts):
+            question = self.service.generate_question(game)
+            duplicate = self.duplicates.find_duplicate(game, question.prompt)
+
+            if duplicate is None:
+                self.counters["accepted"] += 1
+                break
+
+            self.counters["rejected"] += 1
+            logger.info(
+                "Rejected near-duplicate question",
+                extra={
+                    "attempt": attempt + 1,
+                    "prompt": question.prompt,
+                    "duplicate_of": duplicate,
+                },
+            )
+        else:
+            logger.warning("Accepting near-duplicate question after retries")
+
+        self.duplicates.accept(game, question.prompt)
+        return question
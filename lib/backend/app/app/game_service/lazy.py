@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .base import BaseGameService
+from ..game import Game
+from ..question import Question
+
+
+@dataclass
+class LazyGameService(BaseGameService):
+    """Build the actual service on first use.
+
+    Fetching secrets and importing the LLM stack is then only paid by the
+    requests that generate questions, not by every cold start.
+    """
+
+    factory: Callable[[], BaseGameService]
+
+    _service: Optional[BaseGameService] = field(init=False, default=None, repr=False)
+
+    @property
+    def service(self) -> BaseGameService:
+        if self._service is None:
+            self._service = self.factory()
+
+        return self._service
+
+    def generate_question(self, game: Game) -> Question:
+        return self.service.generate_question(game)
@@ -1,6 +1,9 @@
+from .budget import BudgetedQuizMemory, GameQuizMemory
 from .quiz import QuizMemory
 
 
 __all__ = [
+    "BudgetedQuizMemory",
+    "GameQuizMemory",
     "QuizMemory",
 ]
@@ -0,0 +1,198 @@
+from collections import Counter
+import json
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+from aws_lambda_powertools import Logger
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.schema import AIMessage
+from pydantic import Field
+
+from ..tokens import count_tokens
+from ...game import Game
+from ...similarity import MinHash
+
+
+logger = Logger()
+
+STOPWORDS = frozenset(
+    "about after also among been before being between both does during each "
+    "from have into known many most much only other over same some such than "
+    "that their them then there these they this those through under until "
+    "were what when where which while whom whose with would your".split()
+)
+
+
+def parse_prompt(content: str) -> str:
+    """The question prompt of a stored LLM reply, or None if it has none."""
+    try:
+        return json.loads(content[content.index("{") : content.rindex("}") + 1])[
+            "prompt"
+        ]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def fingerprint(prompts: List[str], max_terms: int = 12) -> str:
+    """Compact summary of prompts as their most frequent terms."""
+    terms = Counter(
+        word
+        for prompt in prompts
+        for word in set(re.findall(r"\w+", prompt.lower()))
+        if len(word) > 3 and word not in STOPWORDS and not word.isdigit()
+    )
+
+    return ", ".join(term for term, _ in terms.most_common(max_terms))
+
+
+def select_prompts(
+    prompts: List[str],
+    budget: int,
+    recent: int = 5,
+    count: Callable[[str], int] = count_tokens,
+    candidates: int = 50,
+    minhash: MinHash = MinHash(),
+) -> Tuple[List[str], List[str]]:
+    """Split prompts in the ones to quote verbatim and the ones to summarize.
+
+    The ``recent`` latest prompts come first, then, among the ``candidates``
+    before those, the ones least similar to the prompts already kept, for as
+    long as they fit within ``budget`` tokens. Kept prompts are returned in
+    their original order.
+    """
+    kept, spent = [], 0
+
+    def keep(index: int) -> bool:
+        nonlocal spent
+        cost = count(prompts[index]) + 2
+
+        if spent + cost > budget:
+            return False
+
+        kept.append(index)
+        spent += cost
+        return True
+
+    indexes = list(range(len(prompts)))
+
+    for index in reversed(indexes[-recent:] if recent else []):
+        if not keep(index):
+            break
+
+    older = [index for index in indexes[-recent - candidates :] if index not in kept]
+    signatures = dict(
+        (index, minhash.signature(prompts[index])) for index in older + kept
+    )
+    # highest similarity of every candidate to the kept prompts
+    closest = dict(
+        (
+            i,
+            max(
+                (MinHash.similarity(signatures[i], signatures[k]) for k in kept),
+                default=0.0,
+            ),
+        )
+        for i in older
+    )
+
+    while closest:
+        # the most dissimilar candidate covers the most ground per token
+        index = min(closest, key=closest.get)
+        del closest[index]
+
+        if keep(index):
+            for i in closest:
+                closest[i] = max(
+                    closest[i], MinHash.similarity(signatures[i], signatures[index])
+                )
+
+    kept = set(kept)
+
+    return (
+        [prompt for i, prompt in enumerate(prompts) if i in kept],
+        [prompt for i, prompt in enumerate(prompts) if i not in kept],
+    )
+
+
+class BudgetedQuizMemory(BaseChatMemory):
+    """Questions asked so far, within a fixed token budget.
+
+    Recent and dissimilar prompts are quoted verbatim, all others are
+    compressed into a fingerprint of their most frequent terms, so the prompt
+    size stays constant however long the game runs.
+    """
+
+    memory_key: str = "questions"
+    input_key: str = "input"
+    budget: int = 400
+    recent: int = 5
+    max_terms: int = 12
+    count: Callable[[str], int] = Field(default=count_tokens, exclude=True)
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def prompts(self) -> List[str]:
+        prompts = (
+            parse_prompt(message.content)
+            for message in self.chat_memory.messages
+            if isinstance(message, AIMessage)
+        )
+
+        return [prompt for prompt in prompts if prompt]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        prompts = self.prompts()
+        kept, dropped = select_prompts(prompts, self.budget, self.recent, self.count)
+        lines = [f"- {prompt}" for prompt in kept]
+
+        if dropped:
+            lines.append(
+                f"- {len(dropped)} earlier questions on: "
+                + fingerprint(dropped, self.max_terms)
+            )
+
+        questions = "\n".join(lines)
+        logger.info(
+            "Loaded quiz memory",
+            extra={
+                "questions": len(prompts),
+                "quoted": len(kept),
+                "memory_tokens": self.count(questions),
+            },
+        )
+
+        return {self.memory_key: questions}
+
+
+class GameQuizMemory(BudgetedQuizMemory):
+    """Budgeted quiz memory over the prompts of an already loaded game.
+
+    Nothing is read from or written to a chat history: the game's questions
+    are stored by the gateway anyway. Generated prompts are appended, so the
+    memory keeps up with the game when it is reused.
+    """
+
+    questions: List[str] = Field(default_factory=list)
+
+    @classmethod
+    def from_game(cls, game: Game, **kwargs) -> "GameQuizMemory":
+        questions = [question.prompt for question in game.questions]
+
+        if game.pending_question is not None:
+            questions.append(game.pending_question.prompt)
+
+        return cls(questions=questions, **kwargs)
+
+    def prompts(self) -> List[str]:
+        return self.questions
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        prompt = parse_prompt(next(iter(outputs.values()), ""))
+
+        if prompt:
+            self.questions.append(prompt)
+
+    def clear(self):
+        self.questions = []
@@ -1,12 +1,11 @@
+from collections import Counter
 from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Union
 
+from aws_lambda_powertools import Logger
 from langchain.chains import LLMChain
 from langchain.chat_models import ChatOpenAI
 from langchain.chat_models.base import BaseChatModel
-from langchain.memory import (
-    CombinedMemory,
-    ConversationBufferMemory,
-)
 from langchain.memory.chat_message_histories import DynamoDBChatMessageHistory
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts import (
@@ -16,26 +15,56 @@ from langchain.prompts import (
 from langchain.schema import BaseMemory
 
 from .base import BaseGameService
-from .memory import QuizMemory
+from .memory import BudgetedQuizMemory, GameQuizMemory
 from .models import QuestionModel
+from .tokens import PromptTokenLogger
+from ..cache import LRUCache
 from ..game import Game
+from ..gateway.history import DynamoChatHistory
 from ..question import Question
 
 
+logger = Logger()
+
+
+@dataclass
+class ChainState:
+    chain: LLMChain
+    # questions of the game the chain memory reflects
+    questions: int
+
+
+def count_questions(game: Game) -> int:
+    return len(game.questions) + (game.pending_question is not None)
+
+
 @dataclass
 class OpenAIService(BaseGameService):
-    api_key: str
-    session_table: str
+    # a key, or a callable looked up before every generation to follow rotation
+    api_key: Union[str, Callable[[], str]]
+    # opt-in: keep the questions asked per game in a chat history table too,
+    # either one item per message or, legacy, one item per game
+    history_table: Optional[str] = None
+    history_window: int = 40
+    session_table: Optional[str] = None
+    # tokens spent on the questions asked so far, whatever the game length
+    memory_budget: int = 400
+    recent_questions: int = 5
+    # chains and their memory, reused across warm invocations per game
+    chains: LRUCache = field(default_factory=lambda: LRUCache(maxsize=64))
 
     llm: BaseChatModel = field(init=False)
     parser: PydanticOutputParser = field(init=False)
     prompt: ChatPromptTemplate = field(init=False)
+    counters: Counter = field(init=False, default_factory=Counter)
 
     def __post_init__(self):
         parser = PydanticOutputParser(pydantic_object=QuestionModel)
 
+        api_key = self.current_api_key()
+
         with open("resources/langchain/prompts/system.txt") as f:
-            llm = ChatOpenAI(temperature=0.9, openai_api_key=self.api_key)
+            llm = ChatOpenAI(temperature=0.9, openai_api_key=api_key)
             system_prompt = SystemMessagePromptTemplate.from_template(f.read())
 
             prompt = ChatPromptTemplate(
@@ -52,34 +81,89 @@ class OpenAIService(BaseGameService):
             self.parser = parser
             self.prompt = prompt
 
-    def get_memory(self, game_id: str) -> BaseMemory:
-        message_history = DynamoDBChatMessageHistory(
-            table_name=self.session_table,
-            session_id=game_id,
-        )
+    def get_memory(self, game: Game) -> BaseMemory:
+        if self.history_table is not None:
+            message_history = DynamoChatHistory(
+                session_id=game.game_id,
+                history_table=self.history_table,
+                window=self.history_window,
+            )
+        elif self.session_table is not None:
+            message_history = DynamoDBChatMessageHistory(
+                table_name=self.session_table,
+                session_id=game.game_id,
+            )
+        else:
+            return GameQuizMemory.from_game(
+                game,
+                budget=self.memory_budget,
+                recent=self.recent_questions,
+            )
 
-        chat_memory = ConversationBufferMemory(
-            memory_key="chat_history",
+        return BudgetedQuizMemory(
             chat_memory=message_history,
-            return_messages=True,
-            input_key="input",
+            budget=self.memory_budget,
+            recent=self.recent_questions,
+        )
+
+    def current_api_key(self) -> str:
+        return self.api_key() if callable(self.api_key) else self.api_key
+
+    def get_chain(self, game: Game) -> ChainState:
+        """The cached chain of the game, unless the game changed since."""
+        if isinstance(self.llm, ChatOpenAI):
+            # read per generation, so cached chains follow key rotation
+            self.llm.openai_api_key = self.current_api_key()
+
+        state = self.chains.get(game.game_id)
+
+        if state is not None and state.questions == count_questions(game):
+            self.counters["chain_hit"] += 1
+            return state
+
+        self.counters["chain_stale" if state is not None else "chain_miss"] += 1
+        state = ChainState(
+            chain=LLMChain(
+                llm=self.llm,
+                prompt=self.prompt,
+                memory=self.get_memory(game),
+            ),
+            questions=count_questions(game),
         )
+        self.chains.put(game.game_id, state)
 
-        quiz_memory = QuizMemory(input_key="chat_history")
+        return state
 
-        return CombinedMemory(memories=[chat_memory, quiz_memory])
+    def chain_stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.counters["chain_hit"],
+            "misses": self.counters["chain_miss"],
+            "stale": self.counters["chain_stale"],
+            "evictions": self.chains.stats.evictions,
+            "size": len(self.chains),
+        }
 
     def generate_question(self, game: Game) -> Question:
-        chain = LLMChain(
-            llm=self.llm,
-            prompt=self.prompt,
-            memory=self.get_memory(game.game_id),
-        )
+        state = self.get_chain(game)
 
-        output = chain.run(
-            input="Generate a new question",
-            keywords=", ".join(game.keywords),
-        )
+        try:
+            output = state.chain.run(
+                callbacks=[PromptTokenLogger(game_id=game.game_id)],
+                input="Generate a new question",
+                keywords=", ".join(game.keywords),
+            )
+            question = self.parse_question(output)
+        except Exception:
+            self.chains.pop(game.game_id)
+            raise
+
+        # the memory saved the question, which the game is about to ask
+        state.questions += 1
+        logger.info("Generated question", extra={"chain_cache": self.chain_stats()})
+
+        return question
+
+    def parse_question(self, output: str) -> Question:
         question_data = self.parser.parse(output)
 
         question = Question.create(
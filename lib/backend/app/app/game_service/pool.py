@@ -0,0 +1,76 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Optional
+import zlib
+
+from aws_lambda_powertools import Logger
+
+from .base import BaseGameService
+from .dedup import DuplicateFilter
+from ..game import Game
+from ..gateway.pool import BaseQuestionPool
+from ..question import Question
+
+
+logger = Logger()
+
+
+@dataclass
+class PooledGameService(BaseGameService):
+    """Serve questions from the pre-generated pool, calling the LLM on a miss.
+
+    Each game walks the topic's pool from its own offset, derived from the
+    game id, so games on a popular topic do not all start on the same question.
+    """
+
+    pool: BaseQuestionPool
+    fallback: BaseGameService
+    # pool entries to try before giving up, e.g. when the game already has them
+    max_candidates: int = 5
+    duplicates: Optional[DuplicateFilter] = None
+
+    counters: Counter = field(init=False, default_factory=Counter)
+
+    def generate_question(self, game: Game) -> Question:
+        question = self._from_pool(game)
+
+        if question is not None:
+            self.counters["pool_hit"] += 1
+            return question
+
+        self.counters["pool_miss"] += 1
+        return self.fallback.generate_question(game)
+
+    def _from_pool(self, game: Game) -> Optional[Question]:
+        topic = game.topic
+        size = self.pool.size(topic)
+
+        if size == 0:
+            return None
+
+        offset = zlib.crc32(game.game_id.encode("utf-8"))
+        asked = set(question.prompt for question in game.questions)
+
+        for attempt in range(min(size, self.max_candidates)):
+            index = (offset + len(game.questions) + attempt) % size
+            question = self.pool.get_question(topic, index)
+
+            if question is None or question.prompt in asked:
+                continue
+
+            if (
+                self.duplicates is None
+                or self.duplicates.find_duplicate(game, question.prompt) is None
+            ):
+                logger.debug(
+                    "Serving pooled question", extra={"topic": topic, "index": index}
+                )
+
+                return Question.create(
+                    prompt=question.prompt,
+                    options=question.options,
+                    clarification=question.clarification,
+                    solution=question.solution,
+                )
+
+        return None
@@ -0,0 +1,55 @@
+from functools import lru_cache
+import math
+import re
+from typing import Any, Dict, List
+
+from aws_lambda_powertools import Logger
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.schema import BaseMessage
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+
+logger = Logger()
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    return tiktoken.encoding_for_model(model)
+
+
+def count_tokens(text: str, model: str = "gpt-3.5-turbo") -> int:
+    """Number of tokens the model sees for the text, counted locally.
+
+    Uses tiktoken when installed, otherwise an estimate of about one token
+    per four characters of every word or punctuation mark.
+    """
+    if tiktoken is not None:
+        return len(_encoding(model).encode(text))
+
+    return sum(math.ceil(len(piece) / 4) for piece in re.findall(r"\w+|[^\w\s]", text))
+
+
+class PromptTokenLogger(BaseCallbackHandler):
+    """Log the size of every chat prompt sent to the LLM."""
+
+    def __init__(self, model: str = "gpt-3.5-turbo", **extra):
+        self.model = model
+        self.extra = extra
+        self.counts: List[int] = []
+
+    def on_chat_model_start(
+        self,
+        serialized: Dict[str, Any],
+        messages: List[List[BaseMessage]],
+        **kwargs: Any,
+    ):
+        for prompt in messages:
+            tokens = sum(count_tokens(m.content, self.model) for m in prompt)
+            self.counts.append(tokens)
+            logger.info(
+                "Prompt token count", extra={"prompt_tokens": tokens, **self.extra}
+            )
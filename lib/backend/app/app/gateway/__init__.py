@@ -1,8 +1,22 @@
-from .base import NoSuchGame, NoSuchQuestion
+from .base import NoSuchGame, NoSuchQuestion, View
 from .dynamo import DynamoGateway
+from .idempotency import DynamoIdempotencyStore, MemoryIdempotencyStore
+from .lease import DynamoLeaseStore, MemoryLeaseStore
+from .memory import MemoryGateway
+from .pool import DynamoQuestionPool, MemoryQuestionPool
+from .single import SingleItemGateway
 
 __all__ = [
     "DynamoGateway",
+    "DynamoIdempotencyStore",
+    "DynamoLeaseStore",
+    "DynamoQuestionPool",
+    "MemoryGateway",
+    "MemoryIdempotencyStore",
+    "MemoryLeaseStore",
+    "MemoryQuestionPool",
     "NoSuchGame",
     "NoSuchQuestion",
+    "SingleItemGateway",
+    "View",
 ]
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List
+from enum import Enum
+from typing import List, Tuple
 
-from ..game import Game
-from ..question import Question
+import boto3
+
+from ..game import Game, NoOpenQuestion
+from ..question import Question, QuestionFeedback
 
 
 class NoSuchGame(Exception):
@@ -16,11 +19,44 @@ class NoSuchQuestion(Exception):
         self.question_index = question_index
 
 
+class DynamoClientMixin:
+    """A DynamoDB client from the ``client`` field, created on first use.
+
+    Keeps creating the client off the cold start of the import; tests pass a
+    client of their own.
+    """
+
+    @property
+    def _client(self):
+        if self.client is None:
+            self.client = boto3.client("dynamodb")
+
+        return self.client
+
+
+class View(Enum):
+    """How much of a game a read loads.
+
+    ``SUMMARY`` reads the game item alone, relying on its counters. The other
+    views load the questions with a subset of their fields, the rest left as
+    None: ``PROMPTS`` reads what generating the next question needs,
+    ``RESULTS`` adds the options to show questions and their outcome and
+    ``FULL`` reads everything. Only games read in full may be stored again
+    with :meth:`BaseGateway.store_game`.
+    """
+
+    SUMMARY = "summary"
+    PROMPTS = "prompts"
+    RESULTS = "results"
+    FULL = "full"
+
+
 class BaseGateway(ABC):
     @abstractmethod
     def list_player_games(
         self,
         player_id: str,
+        view: View = View.FULL,
     ) -> List[Game]:
         raise NotImplementedError
 
@@ -29,28 +65,55 @@ class BaseGateway(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def update_game(self, player_id: str, game: Game):
+    def flush(self, player_id: str, game: Game) -> bool:
         raise NotImplementedError
 
+    def update_game(self, player_id: str, game: Game):
+        self.flush(player_id, game)
+
+    def answer_question(
+        self,
+        player_id: str,
+        game_id: str,
+        choice: int,
+    ) -> Tuple[Game, QuestionFeedback]:
+        """Answer the open question of a game, without generating any.
+
+        Raises :class:`NoOpenQuestion` if the latest question was already
+        answered, including by a concurrent request. Returns the game, whose
+        questions may not be loaded, and the feedback on the answer.
+        """
+        game = self.get_game(player_id, game_id)
+        feedback = game.open_question.answer(choice)
+
+        if not self.flush(player_id, game):
+            raise NoOpenQuestion(game)
+
+        return game, feedback
+
     @abstractmethod
     def get_game(
         self,
         player_id: str,
         game_id: str,
+        view: View = View.FULL,
     ) -> Game:
         raise NotImplementedError
 
     @abstractmethod
     def list_game_questions(
         self,
+        player_id: str,
         game_id: str,
         limit: int,
+        view: View = View.FULL,
     ) -> List[Question]:
         raise NotImplementedError
 
     @abstractmethod
     def count_game_questions(
         self,
+        player_id: str,
         game_id: str,
     ) -> int:
         raise NotImplementedError
@@ -58,23 +121,37 @@ class BaseGateway(ABC):
     @abstractmethod
     def get_game_question(
         self,
+        player_id: str,
         game_id: str,
         question_id: int,
+        view: View = View.FULL,
     ) -> Question:
         raise NotImplementedError
 
     @abstractmethod
     def store_game_question(
         self,
+        player_id: str,
         game_id: str,
         question_id: int,
         question: Question,
     ):
         raise NotImplementedError
 
+    @abstractmethod
+    def store_pending_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ) -> bool:
+        raise NotImplementedError
+
     @abstractmethod
     def update_game_question(
         self,
+        player_id: str,
         game_id: str,
         question_id: int,
         question: Question,
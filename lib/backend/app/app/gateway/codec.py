@@ -0,0 +1,307 @@
+"""Direct mapping of games and questions to DynamoDB attribute values.
+
+The generic ``serialize``/``deserialize`` helpers dispatch on the Python type
+of every value; the schema of game and question items is known up front, so
+each attribute is read and written with its type instead.
+
+The options and clarification of a question, the bulk of its item, are
+stored compressed in ``OptionsZ`` and ``ClarificationZ`` when that saves
+space, and only decompressed when first read.
+"""
+import dataclasses
+from datetime import datetime, timezone
+import json
+from typing import Any, Dict, List, Optional
+import zlib
+
+from .base import View
+from ..game import Game, GameProgress
+from ..question import Question
+
+
+Item = Dict[str, Dict[str, Any]]
+
+# preset dictionary of words common in questions, so that even short texts
+# compress; blobs carry its version and can only be read with the same one
+TEXT_DICTIONARY = (
+    " approximately around million thousand hundred percent kilometers meters "
+    "population country capital city river mountain ocean island continent "
+    "century year decade ancient medieval modern history historical empire "
+    "king queen emperor president government war battle treaty revolution "
+    "invented discovered founded published released written composed painted "
+    "known famous first largest smallest highest longest oldest only most "
+    "which was were is are has had have been by for from with that this the "
+    "of and in to on at as it its their his her also after before during "
+    '"]["'
+).encode("utf-8")
+TEXT_DICTIONARY_VERSION = b"\x01"
+# texts shorter than this rarely shrink enough to be worth compressing
+COMPRESS_MIN_SIZE = 48
+
+
+def compress_text(text: str) -> bytes:
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15, zdict=TEXT_DICTIONARY)
+    data = compressor.compress(text.encode("utf-8")) + compressor.flush()
+
+    return TEXT_DICTIONARY_VERSION + data
+
+
+def decompress_text(data: bytes) -> str:
+    if data[:1] != TEXT_DICTIONARY_VERSION:
+        raise ValueError(f"Unknown text compression {data[:1]!r}")
+
+    decompressor = zlib.decompressobj(-15, zdict=TEXT_DICTIONARY)
+
+    return (decompressor.decompress(data[1:]) + decompressor.flush()).decode("utf-8")
+
+
+def _compressed(text: str) -> Optional[bytes]:
+    """The compressed text, if it is large enough and compression pays off."""
+    encoded = text.encode("utf-8")
+
+    if len(encoded) < COMPRESS_MIN_SIZE:
+        return None
+
+    data = compress_text(text)
+
+    return data if len(data) < len(encoded) else None
+
+
+class LazyQuestion(Question):
+    """Question read with compressed attributes, decompressed on first access."""
+
+    def __init__(self, compressed: Dict[str, bytes], **kwargs):
+        self._compressed = compressed
+        super().__init__(**kwargs)
+
+    @property
+    def options(self) -> List[str]:
+        if "options" in self._compressed:
+            self._options = json.loads(decompress_text(self._compressed.pop("options")))
+
+        return self._options
+
+    @options.setter
+    def options(self, value: List[str]):
+        if value is not None:
+            self._compressed.pop("options", None)
+
+        self._options = value
+
+    @property
+    def clarification(self) -> str:
+        if "clarification" in self._compressed:
+            self._clarification = decompress_text(self._compressed.pop("clarification"))
+
+        return self._clarification
+
+    @clarification.setter
+    def clarification(self, value: str):
+        if value is not None:
+            self._compressed.pop("clarification", None)
+
+        self._clarification = value
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+
+        return _compared(self) == _compared(other)
+
+
+def _compared(question: Question) -> tuple:
+    return tuple(
+        getattr(question, f.name) for f in dataclasses.fields(Question) if f.compare
+    )
+
+
+# attributes of a game item, without questions stored on it
+GAME_ATTRIBUTES = (
+    "PlayerId, GameId, Keywords, QuestionsLimit, CreationTime, "
+    "QuestionsAsked, QuestionsAnswered, QuestionsCorrect"
+)
+
+# attributes of a question item read by each partial view, key and owner included
+QUESTION_ATTRIBUTES = {
+    View.PROMPTS: "GameId, QuestionId, PlayerId, Prompt, Solution, Choice, Pending",
+    View.RESULTS: "GameId, QuestionId, PlayerId, Prompt, Options, OptionsZ, "
+    "Solution, Choice, Pending",
+}
+
+
+def question_projection(view: View) -> Dict[str, str]:
+    """Request parameters reading only the question attributes of ``view``."""
+    if view in QUESTION_ATTRIBUTES:
+        return {"ProjectionExpression": QUESTION_ATTRIBUTES[view]}
+
+    return {}
+
+
+def game_key(player_id: str, game_id: str) -> Item:
+    return {"PlayerId": {"S": player_id}, "GameId": {"S": game_id}}
+
+
+def question_key(game_id: str, question_id: int) -> Item:
+    return {"GameId": {"S": game_id}, "QuestionId": {"N": str(question_id)}}
+
+
+def encode_game(player_id: str, game: Game) -> Item:
+    progress = game.progress
+
+    return {
+        "PlayerId": {"S": player_id},
+        "GameId": {"S": game.game_id},
+        # sorted, so identical games encode to identical items
+        "Keywords": {"SS": sorted(game.keywords)},
+        "QuestionsLimit": {"N": str(game.questions_limit)},
+        "CreationTime": {"N": str(int(game.creation_time.timestamp()))},
+        "QuestionsAsked": {"N": str(progress.asked)},
+        "QuestionsAnswered": {"N": str(progress.answered)},
+        "QuestionsCorrect": {"N": str(progress.correct)},
+    }
+
+
+def decode_game(item: Item) -> Game:
+    if "QuestionsAsked" in item:
+        summary = GameProgress(
+            asked=int(item["QuestionsAsked"]["N"]),
+            answered=int(item["QuestionsAnswered"]["N"]),
+            correct=int(item["QuestionsCorrect"]["N"]),
+        )
+    else:
+        summary = None
+
+    return Game(
+        game_id=item["GameId"]["S"],
+        keywords=set(item["Keywords"]["SS"]),
+        questions_limit=int(item["QuestionsLimit"]["N"]),
+        creation_time=datetime.fromtimestamp(
+            int(item["CreationTime"]["N"]),
+            tz=timezone.utc,
+        ),
+        summary=summary,
+    )
+
+
+def encode_question_attributes(question: Question, compress: bool = False) -> Item:
+    """The attributes of a question, without the key of the table it goes in.
+
+    With ``compress``, large options and clarifications are stored compressed.
+    """
+    item = {
+        "Prompt": {"S": question.prompt},
+        "Solution": {"N": str(question.solution)},
+    }
+
+    options = compress and _compressed(json.dumps(question.options))
+    if options:
+        item["OptionsZ"] = {"B": options}
+    else:
+        item["Options"] = {"L": [{"S": option} for option in question.options]}
+
+    clarification = compress and _compressed(question.clarification)
+    if clarification:
+        item["ClarificationZ"] = {"B": clarification}
+    else:
+        item["Clarification"] = {"S": question.clarification}
+
+    if question.is_answered:
+        item["Choice"] = {"N": str(question.choice)}
+
+    if question.pending:
+        item["Pending"] = {"BOOL": True}
+
+    return item
+
+
+def encode_question(
+    game_id: str,
+    question_id: int,
+    question: Question,
+    compress: bool = False,
+    player_id: Optional[str] = None,
+) -> Item:
+    """Question item of a game, owned by ``player_id`` if given."""
+    item = question_key(game_id, question_id)
+
+    if player_id is not None:
+        item["PlayerId"] = {"S": player_id}
+
+    return {**item, **encode_question_attributes(question, compress)}
+
+
+def decode_question(item: Item) -> Question:
+    """Question of a game or pool item, whatever the key of its table.
+
+    Attributes left out of a projected read decode as None.
+    """
+    solution = item.get("Solution")
+    choice = item.get("Choice")
+    pending = item.get("Pending")
+    fields = dict(
+        prompt=item["Prompt"]["S"],
+        options=None,
+        clarification=None,
+        solution=int(solution["N"]) if solution else None,
+        choice=int(choice["N"]) if choice else None,
+        pending=pending["BOOL"] if pending else False,
+    )
+    compressed = {}
+
+    if "OptionsZ" in item:
+        compressed["options"] = item["OptionsZ"]["B"]
+    elif "Options" in item:
+        fields["options"] = [option["S"] for option in item["Options"]["L"]]
+
+    if "ClarificationZ" in item:
+        compressed["clarification"] = item["ClarificationZ"]["B"]
+    elif "Clarification" in item:
+        fields["clarification"] = item["Clarification"]["S"]
+
+    if not compressed:
+        return Question(**fields)
+
+    return LazyQuestion(compressed, **fields)
+
+
+def encode_question_list(questions: List[Question], compress: bool = False) -> Item:
+    """A game's questions as a single attribute of its item.
+
+    Either a list of maps, ``Questions``, or zlib-compressed compact JSON in
+    the binary ``QuestionsZ``.
+    """
+    if not compress:
+        return {
+            "Questions": {
+                "L": [{"M": encode_question_attributes(q)} for q in questions]
+            }
+        }
+
+    data = json.dumps(
+        [
+            [q.prompt, q.options, q.solution, q.clarification, q.choice, q.pending]
+            for q in questions
+        ],
+        separators=(",", ":"),
+    )
+
+    return {"QuestionsZ": {"B": zlib.compress(data.encode("utf-8"))}}
+
+
+def decode_question_list(item: Item) -> List[Question]:
+    if "QuestionsZ" in item:
+        return [
+            Question(
+                prompt=prompt,
+                options=options,
+                solution=solution,
+                clarification=clarification,
+                choice=choice,
+                pending=pending,
+            )
+            for prompt, options, solution, clarification, choice, pending in (
+                json.loads(zlib.decompress(item["QuestionsZ"]["B"]))
+            )
+        ]
+
+    return [decode_question(q["M"]) for q in item.get("Questions", {}).get("L", [])]
@@ -1,149 +1,460 @@
-from dataclasses import dataclass
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
 import itertools
-from typing import Any, Dict, Iterator, List
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-import boto3
+from aws_lambda_powertools import Logger
 from boto3.dynamodb.types import (
     TypeDeserializer,
     TypeSerializer,
 )
 
-from .base import BaseGateway, NoSuchGame, NoSuchQuestion
-from ..game import Game
-from ..question import Question
+from .base import BaseGateway, DynamoClientMixin, NoSuchGame, NoSuchQuestion, View
+from .codec import (
+    decode_game,
+    decode_question,
+    encode_game,
+    encode_question,
+    GAME_ATTRIBUTES,
+    game_key,
+    Item,
+    question_key,
+    question_projection,
+)
+from ..game import Game, GameProgress, NoOpenQuestion
+from ..question import Question, QuestionFeedback
+
+
+logger = Logger()
+
+
+_deserializer = TypeDeserializer()
+_serializer = TypeSerializer()
 
 
 def deserialize(record: Dict[str, Any]) -> Dict[str, Any]:
-    deserializer = TypeDeserializer()
-    return dict((k, deserializer.deserialize(v)) for k, v in record.items())
+    return dict((k, _deserializer.deserialize(v)) for k, v in record.items())
 
 
 def serialize(record: Dict[str, Any]) -> Dict[str, Any]:
-    serializer = TypeSerializer()
-    return dict((k, serializer.serialize(v)) for k, v in record.items())
+    return dict((k, _serializer.serialize(v)) for k, v in record.items())
 
 
-@dataclass
-class DynamoGateway(BaseGateway):
-    game_table: str
-    question_table: str
+# BatchGetItem accepts at most 100 keys and BatchWriteItem 25 requests per call
+BATCH_GET_SIZE = 100
+BATCH_WRITE_SIZE = 25
+
+
+def chunked(iterable, size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def backoff(attempt: int, base: float = 0.05, cap: float = 2.0):
+    time.sleep(min(cap, base * 2**attempt))
+
+
+def batch_write(
+    client, request_items: Dict[str, List[Dict[str, Any]]], max_attempts: int = 5
+):
+    """Send a BatchWriteItem request, retrying its unprocessed items.
+
+    Retries back off exponentially; unprocessed items left after
+    ``max_attempts`` calls raise a RuntimeError.
+    """
+    for attempt in range(max_attempts):
+        response = client.batch_write_item(RequestItems=request_items)
+
+        request_items = response.get("UnprocessedItems")
+        if not request_items:
+            return
+
+        logger.warning(
+            "Retrying unprocessed BatchWriteItem requests",
+            extra={
+                "attempt": attempt + 1,
+                "unprocessed": sum(len(r) for r in request_items.values()),
+            },
+        )
+        backoff(attempt)
+
+    raise RuntimeError(
+        f"Unprocessed items remain after {max_attempts} BatchWriteItem attempts"
+    )
+
+
+def batch_put(
+    client,
+    items: List[Tuple[str, Item]],
+    max_workers: int = 4,
+    max_attempts: int = 5,
+):
+    """Put ``(table, item)`` pairs in bounded-parallel BatchWriteItem calls.
+
+    Items are given as attribute values.
+    """
+    batches = []
 
-    def __post_init__(self, client=boto3.client("dynamodb")):
-        self._client = client
+    for chunk in chunked(items, BATCH_WRITE_SIZE):
+        request_items = {}
+
+        for table, item in chunk:
+            request_items.setdefault(table, []).append({"PutRequest": {"Item": item}})
+
+        batches.append(request_items)
+
+    write = partial(batch_write, client, max_attempts=max_attempts)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(write, batches))
+
+
+@dataclass
+class DynamoGateway(DynamoClientMixin, BaseGateway):
+    client: Any = None
+    game_table: str = field(default_factory=lambda: os.getenv("GAME_TABLE"))
+    question_table: str = field(default_factory=lambda: os.getenv("QUESTION_TABLE"))
+    max_workers: int = 4
+    max_attempts: int = 5
+    # store large options and clarifications compressed
+    compress_text: bool = True
+
+    def _load_questions(self, games: List[Game], view: View):
+        """Attach the questions ``view`` asks for to freshly decoded games.
+
+        Games stored before the counters existed need their questions for a
+        summary too, but only what :class:`GameProgress` counts.
+        """
+        if view is View.SUMMARY:
+            games = [game for game in games if game.summary is None]
+            view = View.PROMPTS
+
+        if games:
+            questions = self.batch_list_game_questions(games, view=view)
+
+            for game in games:
+                game.attach_questions(questions[game.game_id])
 
     def list_player_games(
         self,
         player_id: str,
+        view: View = View.FULL,
     ) -> Iterator[Game]:
+        """Stream the player's games, most recent first.
+
+        Questions are fetched per index page with batched reads rather than one
+        query per game, reading only the attributes of ``view``.
+        """
         paginator = self._client.get_paginator("query")
 
+        # the question counters are not projected into the index, so they are
+        # fetched from the table in the same query
         for page in paginator.paginate(
             TableName=self.game_table,
             IndexName="creation-time-index",
-            Select="ALL_PROJECTED_ATTRIBUTES",
+            ProjectionExpression=GAME_ATTRIBUTES,
             KeyConditionExpression="PlayerId = :player_id",
             ExpressionAttributeValues={
                 ":player_id": {"S": player_id},
             },
             ScanIndexForward=False,
         ):
-            for item in page.get("Items", []):
-                game_data = deserialize(item)
-                game_questions = list(
-                    self.list_game_questions(
-                        game_data["GameId"], int(game_data["QuestionsLimit"])
-                    )
-                )
+            games = [decode_game(item) for item in page.get("Items", [])]
+            self._load_questions(games, view)
 
-                yield Game(
-                    game_id=game_data["GameId"],
-                    keywords=set(game_data["Keywords"]),
-                    questions_limit=int(game_data["QuestionsLimit"]),
-                    questions=game_questions,
-                    creation_time=datetime.fromtimestamp(
-                        int(game_data["CreationTime"]),
-                        tz=timezone.utc,
-                    ),
-                )
+            yield from games
+
+    def batch_list_game_questions(
+        self,
+        games: List[Game],
+        include_pending: bool = False,
+        view: View = View.FULL,
+    ) -> Dict[str, List[Question]]:
+        """Load the questions of several games with bounded-parallel BatchGetItem.
+
+        Games with counters only request the questions they have asked, plus
+        the slot of a pending one with ``include_pending``; older games request
+        every key up to their questions limit. Keys that were never stored
+        simply come back empty.
+        """
+
+        def last_question_id(game: Game) -> int:
+            if game.summary is None:
+                return game.questions_limit
+
+            return min(game.summary.asked + include_pending, game.questions_limit)
+
+        keys = [
+            question_key(game.game_id, question_id)
+            for game in games
+            for question_id in range(1, last_question_id(game) + 1)
+        ]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            batches = executor.map(
+                lambda chunk: self._batch_get_questions(chunk, view),
+                chunked(keys, BATCH_GET_SIZE),
+            )
+            items = list(itertools.chain.from_iterable(batches))
+
+        found = dict((game.game_id, {}) for game in games)
+        for item in items:
+            found[item["GameId"]["S"]][int(item["QuestionId"]["N"])] = item
+
+        return dict(
+            (
+                game_id,
+                [
+                    self._decode_question(game_questions[question_id])
+                    for question_id in sorted(game_questions)
+                ],
+            )
+            for game_id, game_questions in found.items()
+        )
+
+    def _batch_get_questions(
+        self,
+        keys: List[Dict[str, Any]],
+        view: View = View.FULL,
+    ) -> List[Dict[str, Any]]:
+        items = []
+        request = {self.question_table: {"Keys": keys, **question_projection(view)}}
+
+        for attempt in range(self.max_attempts):
+            response = self._client.batch_get_item(RequestItems=request)
+            items.extend(response.get("Responses", {}).get(self.question_table, []))
+
+            request = response.get("UnprocessedKeys")
+            if not request:
+                return items
+
+            backoff(attempt)
+
+        raise RuntimeError(
+            f"Unprocessed keys remain after {self.max_attempts} BatchGetItem attempts"
+        )
 
     def store_game(self, player_id: str, game: Game):
-        response = self._client.put_item(
-            TableName=self.game_table,
-            Item=serialize(
+        """Store a game and all of its questions with batched writes.
+
+        The game item and its questions share BatchWriteItem calls of up to 25
+        requests; the counters and question sequence on the game item already
+        account for the questions, so no transaction is needed.
+        """
+        requests = [
+            (
+                self.game_table,
                 {
-                    "PlayerId": player_id,
-                    "GameId": game.game_id,
-                    "Keywords": game.keywords,
-                    "QuestionsLimit": game.questions_limit,
-                    "CreationTime": int(game.creation_time.timestamp()),
-                }
-            ),
+                    **encode_game(player_id, game),
+                    "NextQuestionId": {"N": str(len(game.questions) + 1)},
+                },
+            )
+        ]
+
+        for index, question in enumerate(game.questions):
+            requests.append(
+                (
+                    self.question_table,
+                    encode_question(
+                        game.game_id,
+                        index + 1,
+                        question,
+                        self.compress_text,
+                        player_id,
+                    ),
+                )
+            )
+
+        self.batch_put(requests)
+        game.summary = GameProgress.of(game.questions)
+
+        for question in game.questions:
+            question.mark_clean()
+
+        logger.info(
+            "Stored game",
+            extra={"game_id": game.game_id, "questions": len(game.questions)},
         )
 
-        # TODO: handle response
-        print(response)
+    def batch_put(self, items: List[Tuple[str, Item]]):
+        """Put ``(table, item)`` pairs in bounded-parallel BatchWriteItem calls."""
+        batch_put(self._client, items, self.max_workers, self.max_attempts)
 
-        for index, question in enumerate(game.questions):
-            self.store_game_question(game.game_id, index + 1, question)
+    def flush(self, player_id: str, game: Game) -> bool:
+        """Write the questions added or answered since the game was loaded.
 
-    def update_game(self, player_id: str, game: Game):
-        checkpoint = self.count_game_questions(game.game_id)
+        All changes and the matching counter update go out in a single
+        TransactWriteItems call, or none at all when nothing changed. New
+        questions take their ids from the game's question sequence. Returns
+        False, leaving the changes pending, if a concurrent write got there
+        first or the questions limit would be exceeded.
+        """
+        items = []
+        progress = GameProgress()
+        changed = []
+        new_ids = []
 
-        if checkpoint > 0:
-            # update the current question
-            self.update_game_question(
-                game.game_id, checkpoint, game.questions[checkpoint - 1]
+        for index, question in enumerate(game.questions):
+            if not question.is_stored:
+                items.append(
+                    self._put_question(player_id, game.game_id, index + 1, question)
+                )
+                progress += GameProgress.of([question])
+                new_ids.append(index + 1)
+            elif question.is_dirty:
+                items.append(self._update_question(game.game_id, index + 1, question))
+
+                if "pending" in question.changes:
+                    progress.asked += 1
+
+                if "choice" in question.changes:
+                    progress.answered += 1
+                    progress.correct += int(question.answered_correctly)
+            else:
+                continue
+
+            changed.append(question)
+
+        if not changed:
+            return True
+
+        items.append(
+            self._count_questions(
+                player_id,
+                game.game_id,
+                progress,
+                range(new_ids[0], new_ids[-1] + 1) if new_ids else None,
+                # games without counters have all their questions loaded
+                game.progress if game.summary is None else None,
             )
+        )
+
+        if not self._transact(items):
+            logger.warning(
+                "Concurrent update of game, changes not written",
+                extra={"game_id": game.game_id},
+            )
+            return False
+
+        for question in changed:
+            question.mark_clean()
 
-        # store the new questions
-        for index, question in itertools.dropwhile(
-            lambda x: x[0] + 1 <= checkpoint, enumerate(game.questions)
+        return True
+
+    def answer_question(
+        self,
+        player_id: str,
+        game_id: str,
+        choice: int,
+    ) -> Tuple[Game, QuestionFeedback]:
+        """Answer the open question, found through the counters of the game.
+
+        Only the game item and the open question are read. The choice and the
+        counters are written in one transaction, conditional on the question
+        still being unanswered. The game comes back as a summary.
+        """
+        game = self.get_game(player_id, game_id, View.SUMMARY)
+        progress = game.progress
+
+        if progress.answered == progress.asked:
+            raise NoOpenQuestion(game)
+
+        # the game was read with the player's key, its questions are theirs
+        question = self._decode_question(
+            self._get_question_item(game_id, progress.asked)
+        )
+        feedback = question.answer(choice)
+        answered = GameProgress(answered=1, correct=int(feedback.result))
+
+        if not self._transact(
+            [
+                self._update_question(game_id, progress.asked, question),
+                self._count_questions(
+                    player_id,
+                    game_id,
+                    answered,
+                    # games without counters had their questions loaded
+                    totals=progress + answered if game.summary is None else None,
+                ),
+            ]
         ):
-            self.store_game_question(game.game_id, index + 1, question)
+            raise NoOpenQuestion(game)
 
-        # TODO: handle response
+        question.mark_clean()
+        game.attach_questions([])
+        game.summary = progress + answered
+
+        return game, feedback
+
+    def store_pending_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ) -> bool:
+        """Store a question generated ahead of time, unless the slot is taken.
+
+        Pending questions are left out of the counters until revealed, but do
+        take their id from the question sequence. Returns False if the player
+        asked for a question first.
+        """
+        stored = self._transact(
+            [
+                self._put_question(player_id, game_id, question_id, question),
+                self._count_questions(
+                    player_id,
+                    game_id,
+                    GameProgress(),
+                    range(question_id, question_id + 1),
+                ),
+            ]
+        )
+
+        if stored:
+            question.mark_clean()
+
+        return stored
 
     def get_game(
         self,
         player_id: str,
         game_id: str,
+        view: View = View.FULL,
     ) -> Game:
         response = self._client.get_item(
             TableName=self.game_table,
-            Key=serialize(
-                {
-                    "PlayerId": player_id,
-                    "GameId": game_id,
-                }
-            ),
+            Key=game_key(player_id, game_id),
         )
 
         if "Item" in response:
-            game_data = deserialize(response["Item"])
-            game_questions = list(
-                self.list_game_questions(
-                    game_data["GameId"], int(game_data["QuestionsLimit"])
+            game = decode_game(response["Item"])
+
+            if view is View.SUMMARY and game.summary is None:
+                view = View.PROMPTS
+
+            if view is not View.SUMMARY:
+                game.attach_questions(
+                    self.list_game_questions(
+                        player_id, game.game_id, game.questions_limit, view
+                    )
                 )
-            )
 
-            return Game(
-                game_id=game_data["GameId"],
-                keywords=game_data["Keywords"],
-                questions=game_questions,
-                questions_limit=int(game_data["QuestionsLimit"]),
-                creation_time=datetime.fromtimestamp(
-                    int(game_data["CreationTime"]),
-                    tz=timezone.utc,
-                ),
-            )
+            return game
         else:
             raise NoSuchGame(game_id)
 
     def list_game_questions(
         self,
+        player_id: str,
         game_id: str,
         limit: int,
+        view: View = View.FULL,
     ) -> List[Question]:
         paginator = self._client.get_paginator("query")
 
@@ -155,24 +466,31 @@ class DynamoGateway(BaseGateway):
             },
             ScanIndexForward=True,
             Limit=limit,
+            **question_projection(view),
         ):
             for item in page.get("Items", []):
-                question_data = deserialize(item)
-
-                choice = question_data.get("Choice")
-
-                yield Question(
-                    prompt=question_data["Prompt"],
-                    options=question_data["Options"],
-                    solution=int(question_data["Solution"]),
-                    choice=int(choice) if choice else choice,
-                    clarification=question_data["Clarification"],
-                )
+                yield self._decode_question(item)
 
     def count_game_questions(
         self,
+        player_id: str,
         game_id: str,
     ) -> int:
+        """Questions stored for a game, pending one included.
+
+        Read from the question sequence on the game item; only games stored
+        before it existed fall back to counting their question items.
+        """
+        response = self._client.get_item(
+            TableName=self.game_table,
+            Key=game_key(player_id, game_id),
+            ProjectionExpression="NextQuestionId",
+        )
+        sequence = response.get("Item", {}).get("NextQuestionId")
+
+        if sequence is not None:
+            return int(sequence["N"]) - 1
+
         paginator = self._client.get_paginator("query")
         count = 0
 
@@ -190,79 +508,244 @@ class DynamoGateway(BaseGateway):
 
     def get_game_question(
         self,
+        player_id: str,
         game_id: str,
         question_id: int,
+        view: View = View.FULL,
     ) -> Question:
+        """Read a single question of one of the player's games.
+
+        Questions carry the id of their player, so ownership is checked on the
+        item itself; questions stored before that fall back to reading the
+        key of the game.
+        """
+        item = self._get_question_item(game_id, question_id, view)
+
+        if not self._owns(player_id, game_id, item):
+            raise NoSuchQuestion(game_id, question_id)
+
+        return self._decode_question(item)
+
+    def _get_question_item(
+        self,
+        game_id: str,
+        question_id: int,
+        view: View = View.FULL,
+    ) -> Item:
         response = self._client.get_item(
             TableName=self.question_table,
-            Key=serialize(
-                {
-                    "GameId": game_id,
-                    "QuestionId": question_id,
-                }
-            ),
+            Key=question_key(game_id, question_id),
+            **question_projection(view),
         )
 
-        if "Item" in response:
-            question_data = deserialize(response["Item"])
+        if "Item" not in response:
+            raise NoSuchQuestion(game_id, question_id)
 
-            choice = question_data.get("Choice")
+        return response["Item"]
 
-            return Question(
-                prompt=question_data["Prompt"],
-                options=question_data["Options"],
-                solution=int(question_data["Solution"]),
-                choice=int(choice) if choice else choice,
-                clarification=question_data["Clarification"],
-            )
-        else:
-            raise NoSuchQuestion(game_id, question_id)
+    def _owns(self, player_id: str, game_id: str, item: Item) -> bool:
+        if "PlayerId" in item:
+            return item["PlayerId"]["S"] == player_id
 
-    def store_game_question(
+        response = self._client.get_item(
+            TableName=self.game_table,
+            Key=game_key(player_id, game_id),
+            ProjectionExpression="GameId",
+        )
+
+        return "Item" in response
+
+    @staticmethod
+    def _decode_question(item: Item) -> Question:
+        question = decode_question(item)
+        question.mark_clean()
+
+        return question
+
+    def _put_question(
         self,
+        player_id: str,
         game_id: str,
         question_id: int,
         question: Question,
-    ):
-        question_data = {
-            "GameId": game_id,
-            "QuestionId": question_id,
-            "Prompt": question.prompt,
-            "Options": question.options,
-            "Solution": question.solution,
-            "Clarification": question.clarification,
+    ) -> Dict[str, Any]:
+        """Transaction item storing a new question."""
+        return {
+            "Put": {
+                "TableName": self.question_table,
+                "Item": encode_question(
+                    game_id, question_id, question, self.compress_text, player_id
+                ),
+                "ConditionExpression": "attribute_not_exists(QuestionId)",
+            }
         }
 
-        if question.is_answered:
-            question_data["Choice"] = question.choice
+    def _update_question(
+        self,
+        game_id: str,
+        question_id: int,
+        question: Question,
+        changes: Optional[Set[str]] = None,
+    ) -> Dict[str, Any]:
+        """Transaction item writing the changes made to a stored question.
+
+        The conditions keep the counters exact when a question that was
+        already answered or revealed is written again.
+        """
+        changes = question.changes if changes is None else changes
+        updates = []
+        conditions = []
+        values = {}
+
+        if "choice" in changes:
+            updates.append("SET Choice = :choice")
+            conditions.append("attribute_not_exists(Choice)")
+            values[":choice"] = question.choice
+
+        if "pending" in changes:
+            updates.append("REMOVE Pending")
+            conditions.append("attribute_exists(Pending)")
+
+        update = {
+            "TableName": self.question_table,
+            "Key": question_key(game_id, question_id),
+            "UpdateExpression": " ".join(updates),
+            "ConditionExpression": " AND ".join(conditions),
+        }
 
-        response = self._client.put_item(
-            TableName=self.question_table,
-            Item=serialize(question_data),
-        )
+        if values:
+            update["ExpressionAttributeValues"] = serialize(values)
+
+        return {"Update": update}
+
+    def _count_questions(
+        self,
+        player_id: str,
+        game_id: str,
+        progress: GameProgress,
+        allocate: Optional[range] = None,
+        totals: Optional[GameProgress] = None,
+    ) -> Dict[str, Any]:
+        """Transaction item adding ``progress`` to the game counters.
+
+        Games stored before the counters existed get ``totals`` instead, the
+        counts of all their questions, written only if no other request
+        started the counters meanwhile. Without totals such games are left
+        without counters, rather than getting partial ones.
+
+        With ``allocate``, the question ids in that range are taken from the
+        ``NextQuestionId`` sequence of the game, atomically incremented. The
+        write only goes through if the sequence is still at the first of them
+        and the last is within the questions limit. Games stored before the
+        sequence existed start it at the first id.
+        """
+        adds, sets, conditions, values = [], [], [], {}
+
+        if totals is not None:
+            sets.append(
+                "QuestionsAsked = :asked, QuestionsAnswered = :answered, "
+                "QuestionsCorrect = :correct"
+            )
+            conditions.append("attribute_not_exists(QuestionsAsked)")
+            progress = totals
+        elif progress != GameProgress():
+            adds.append(
+                "QuestionsAsked :asked, "
+                "QuestionsAnswered :answered, QuestionsCorrect :correct"
+            )
+
+        if adds or sets:
+            values[":asked"] = progress.asked
+            values[":answered"] = progress.answered
+            values[":correct"] = progress.correct
+
+        if allocate:
+            sets.append(
+                "NextQuestionId = if_not_exists(NextQuestionId, :next) + :allocated"
+            )
+            conditions.append(
+                "(NextQuestionId = :next OR attribute_not_exists(NextQuestionId)) "
+                "AND :last <= QuestionsLimit"
+            )
+            values[":next"] = allocate.start
+            values[":allocated"] = len(allocate)
+            values[":last"] = allocate[-1]
+
+        expressions = []
+
+        if adds:
+            expressions.append("ADD " + ", ".join(adds))
+
+        if sets:
+            expressions.append("SET " + ", ".join(sets))
+
+        update = {
+            "TableName": self.game_table,
+            "Key": game_key(player_id, game_id),
+            "UpdateExpression": " ".join(expressions),
+            "ExpressionAttributeValues": serialize(values),
+        }
+
+        if conditions:
+            update["ConditionExpression"] = " AND ".join(conditions)
+
+        return {"Update": update}
+
+    def _transact(self, items: List[Dict[str, Any]]) -> bool:
+        """Run a write transaction, returning False if a condition failed."""
+        try:
+            self._client.transact_write_items(TransactItems=items)
+        except self._client.exceptions.TransactionCanceledException as e:
+            reasons = e.response.get("CancellationReasons", [])
+
+            if any(
+                reason.get("Code") == "ConditionalCheckFailed" for reason in reasons
+            ):
+                return False
+
+            raise
 
-        # TODO: handle response
-        print(response)
+        return True
+
+    def store_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ):
+        self._transact(
+            [
+                self._put_question(player_id, game_id, question_id, question),
+                self._count_questions(
+                    player_id,
+                    game_id,
+                    GameProgress.of([question]),
+                    range(question_id, question_id + 1),
+                ),
+            ]
+        )
 
     def update_game_question(
         self,
+        player_id: str,
         game_id: str,
         question_id: int,
         question: Question,
     ):
         if question.is_answered:
-            self._client.update_item(
-                TableName=self.question_table,
-                Key=serialize(
-                    {
-                        "GameId": game_id,
-                        "QuestionId": question_id,
-                    }
-                ),
-                UpdateExpression="SET Choice = :choice",
-                ExpressionAttributeValues=serialize(
-                    {
-                        ":choice": question.choice,
-                    }
-                ),
+            self._transact(
+                [
+                    self._update_question(
+                        game_id, question_id, question, changes={"choice"}
+                    ),
+                    self._count_questions(
+                        player_id,
+                        game_id,
+                        GameProgress(
+                            answered=1,
+                            correct=int(question.answered_correctly),
+                        ),
+                    ),
+                ]
             )
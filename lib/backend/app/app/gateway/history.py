@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+import os
+from typing import Any, List, Optional
+
+from langchain.schema import BaseChatMessageHistory, BaseMessage, messages_from_dict
+
+from .base import DynamoClientMixin
+from .dynamo import (
+    backoff,
+    BATCH_WRITE_SIZE,
+    batch_write,
+    chunked,
+    deserialize,
+    serialize,
+)
+
+
+@dataclass
+class DynamoChatHistory(DynamoClientMixin, BaseChatMessageHistory):
+    """Chat history with one item per message, keyed on ``(SessionId, Seq)``.
+
+    Only the last ``window`` messages are read, with a reverse query, and a
+    message is appended with a single conditional put, so neither depends on
+    the length of the session nor runs into the item size limit.
+    """
+
+    session_id: str
+    history_table: str = field(default_factory=lambda: os.getenv("HISTORY_TABLE"))
+    window: int = 40
+    client: Any = None
+    max_attempts: int = 5
+
+    _messages: Optional[List[BaseMessage]] = field(init=False, default=None, repr=False)
+    _last_seq: int = field(init=False, default=0, repr=False)
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        if self._messages is None:
+            self._load()
+
+        return self._messages
+
+    def _load(self):
+        response = self._client.query(
+            TableName=self.history_table,
+            KeyConditionExpression="SessionId = :session_id",
+            ExpressionAttributeValues=serialize({":session_id": self.session_id}),
+            ScanIndexForward=False,
+            Limit=self.window,
+        )
+        items = [deserialize(item) for item in reversed(response["Items"])]
+
+        self._last_seq = int(items[-1]["Seq"]) if items else 0
+        self._messages = messages_from_dict(
+            [
+                {"type": item["Type"], "data": {"content": item["Content"]}}
+                for item in items
+            ]
+        )
+
+    def add_message(self, message: BaseMessage):
+        if self._messages is None:
+            self._load()
+
+        for attempt in range(self.max_attempts):
+            seq = self._last_seq + 1
+
+            try:
+                self._client.put_item(
+                    TableName=self.history_table,
+                    Item=serialize(
+                        {
+                            "SessionId": self.session_id,
+                            "Seq": seq,
+                            "Type": message.type,
+                            "Content": message.content,
+                        }
+                    ),
+                    ConditionExpression="attribute_not_exists(Seq)",
+                )
+            except self._client.exceptions.ConditionalCheckFailedException:
+                # another writer appended to the session in the meantime
+                backoff(attempt)
+                self._load()
+                continue
+
+            self._last_seq = seq
+            self._messages = (self._messages + [message])[-self.window :]
+            return
+
+        raise RuntimeError(f"Could not append to chat history {self.session_id}")
+
+    def clear(self):
+        paginator = self._client.get_paginator("query")
+        pages = paginator.paginate(
+            TableName=self.history_table,
+            KeyConditionExpression="SessionId = :session_id",
+            ExpressionAttributeValues=serialize({":session_id": self.session_id}),
+            ProjectionExpression="SessionId, Seq",
+        )
+        keys = (item for page in pages for item in page["Items"])
+
+        for chunk in chunked(keys, BATCH_WRITE_SIZE):
+            batch_write(
+                self._client,
+                {
+                    self.history_table: [
+                        {"DeleteRequest": {"Key": key}} for key in chunk
+                    ]
+                },
+                self.max_attempts,
+            )
+
+        self._messages = []
+        self._last_seq = 0
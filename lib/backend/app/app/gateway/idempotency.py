@@ -0,0 +1,157 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .base import DynamoClientMixin
+
+
+@dataclass
+class StoredResponse:
+    # digest of the request the response was given to
+    fingerprint: str
+    # None while the request is still being handled
+    body: Optional[str] = None
+
+
+class BaseIdempotencyStore(ABC):
+    """Responses kept per idempotency key, for a limited time."""
+
+    @abstractmethod
+    def claim(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        """Claim ``key`` for ``ttl`` seconds to handle the request.
+
+        Returns None if claimed, otherwise what is stored under the key: the
+        response, or a response without body if another request is handling
+        it.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(self, key: str, response: StoredResponse, ttl: float):
+        """Store the response to a claimed key for ``ttl`` seconds."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, key: str):
+        """Give up a claim without response, so the request can be retried."""
+        raise NotImplementedError
+
+
+@dataclass
+class MemoryIdempotencyStore(BaseIdempotencyStore):
+    clock: Callable[[], float] = time.time
+
+    responses: Dict[str, Tuple[StoredResponse, float]] = field(
+        init=False, default_factory=dict
+    )
+    _lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock, repr=False
+    )
+
+    def claim(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        now = self.clock()
+
+        with self._lock:
+            stored, expires_at = self.responses.get(key, (None, 0))
+
+            if stored is not None and expires_at > now:
+                return stored
+
+            self.responses[key] = (StoredResponse(fingerprint), now + ttl)
+            return None
+
+    def complete(self, key: str, response: StoredResponse, ttl: float):
+        with self._lock:
+            self.responses[key] = (response, self.clock() + ttl)
+
+    def release(self, key: str):
+        with self._lock:
+            stored, _ = self.responses.get(key, (None, 0))
+
+            if stored is not None and stored.body is None:
+                del self.responses[key]
+
+
+@dataclass
+class DynamoIdempotencyStore(DynamoClientMixin, BaseIdempotencyStore):
+    """Responses as items of a table keyed on ``IdempotencyKey``.
+
+    A stored key is read first, so a repeat costs a single read. Otherwise
+    the key is claimed with a conditional put of an item without
+    ``ResponseBody``, which only succeeds if there is no item or it expired.
+    ``ExpiresAt`` doubles as the table's TTL attribute; DynamoDB deletes
+    expired items lazily, so reads and claims check it as well.
+    """
+
+    client: Any = None
+    idempotency_table: str = field(
+        default_factory=lambda: os.getenv("IDEMPOTENCY_TABLE")
+    )
+    clock: Callable[[], float] = time.time
+
+    def _recall(self, key: str) -> Optional[StoredResponse]:
+        item = self._client.get_item(
+            TableName=self.idempotency_table,
+            Key={"IdempotencyKey": {"S": key}},
+            ProjectionExpression="Fingerprint, ResponseBody, ExpiresAt",
+            ConsistentRead=True,
+        ).get("Item")
+
+        if item is None or int(item["ExpiresAt"]["N"]) < self.clock():
+            return None
+
+        return StoredResponse(
+            fingerprint=item["Fingerprint"]["S"],
+            body=item.get("ResponseBody", {}).get("S"),
+        )
+
+    def claim(self, key: str, fingerprint: str, ttl: float) -> Optional[StoredResponse]:
+        # repeats, the common case for a stored key, cost this read alone
+        stored = self._recall(key)
+
+        if stored is not None:
+            return stored
+
+        now = self.clock()
+
+        try:
+            self._client.put_item(
+                TableName=self.idempotency_table,
+                Item={
+                    "IdempotencyKey": {"S": key},
+                    "Fingerprint": {"S": fingerprint},
+                    "ExpiresAt": {"N": str(int(now + ttl))},
+                },
+                ConditionExpression="attribute_not_exists(IdempotencyKey) "
+                "OR ExpiresAt < :now",
+                ExpressionAttributeValues={":now": {"N": str(int(now))}},
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            # claimed by a concurrent request since the read
+            return self._recall(key) or StoredResponse(fingerprint)
+
+        return None
+
+    def complete(self, key: str, response: StoredResponse, ttl: float):
+        self._client.put_item(
+            TableName=self.idempotency_table,
+            Item={
+                "IdempotencyKey": {"S": key},
+                "Fingerprint": {"S": response.fingerprint},
+                "ResponseBody": {"S": response.body},
+                "ExpiresAt": {"N": str(int(self.clock() + ttl))},
+            },
+        )
+
+    def release(self, key: str):
+        try:
+            self._client.delete_item(
+                TableName=self.idempotency_table,
+                Key={"IdempotencyKey": {"S": key}},
+                ConditionExpression="attribute_not_exists(ResponseBody)",
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            pass
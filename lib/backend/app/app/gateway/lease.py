@@ -0,0 +1,95 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from .base import DynamoClientMixin
+
+
+class BaseLeaseStore(ABC):
+    """Exclusive, expiring leases on arbitrary keys."""
+
+    @abstractmethod
+    def acquire(self, key: str, holder: str, ttl: float) -> bool:
+        """Take the lease for ``ttl`` seconds, unless someone else holds it."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def release(self, key: str, holder: str):
+        """Give the lease up, if ``holder`` still holds it."""
+        raise NotImplementedError
+
+
+@dataclass
+class MemoryLeaseStore(BaseLeaseStore):
+    clock: Callable[[], float] = time.time
+
+    leases: Dict[str, Tuple[str, float]] = field(init=False, default_factory=dict)
+    _lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock, repr=False
+    )
+
+    def acquire(self, key: str, holder: str, ttl: float) -> bool:
+        now = self.clock()
+
+        with self._lock:
+            lease = self.leases.get(key)
+
+            if lease is not None and lease[1] > now:
+                return False
+
+            self.leases[key] = (holder, now + ttl)
+            return True
+
+    def release(self, key: str, holder: str):
+        with self._lock:
+            if self.leases.get(key, (None,))[0] == holder:
+                del self.leases[key]
+
+
+@dataclass
+class DynamoLeaseStore(DynamoClientMixin, BaseLeaseStore):
+    """Leases as items of a table keyed on ``LeaseKey``.
+
+    A lease is taken with a conditional put that only succeeds if there is no
+    lease or it has expired. ``ExpiresAt`` doubles as the table's TTL
+    attribute, cleaning up leases that were never released.
+    """
+
+    client: Any = None
+    lease_table: str = field(default_factory=lambda: os.getenv("LEASE_TABLE"))
+    clock: Callable[[], float] = time.time
+
+    def acquire(self, key: str, holder: str, ttl: float) -> bool:
+        now = self.clock()
+
+        try:
+            self._client.put_item(
+                TableName=self.lease_table,
+                Item={
+                    "LeaseKey": {"S": key},
+                    "Holder": {"S": holder},
+                    "ExpiresAt": {"N": str(int(now + ttl))},
+                },
+                ConditionExpression="attribute_not_exists(LeaseKey) "
+                "OR ExpiresAt < :now",
+                ExpressionAttributeValues={":now": {"N": str(int(now))}},
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            return False
+
+        return True
+
+    def release(self, key: str, holder: str):
+        try:
+            self._client.delete_item(
+                TableName=self.lease_table,
+                Key={"LeaseKey": {"S": key}},
+                ConditionExpression="Holder = :holder",
+                ExpressionAttributeValues={":holder": {"S": holder}},
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            # expired and taken over, the new holder keeps it
+            pass
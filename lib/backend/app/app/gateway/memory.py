@@ -0,0 +1,252 @@
+from collections import Counter
+import dataclasses
+from dataclasses import dataclass, field
+import threading
+from typing import Dict, Iterator, List, Tuple
+
+from .base import BaseGateway, NoSuchGame, NoSuchQuestion, View
+from ..game import Game, GameProgress
+from ..question import Question
+
+
+# question fields a partial view leaves out, as the DynamoDB projections do
+HIDDEN_FIELDS = {
+    View.PROMPTS: {"options": None, "clarification": None},
+    View.RESULTS: {"clarification": None},
+}
+
+
+@dataclass
+class MemoryGateway(BaseGateway):
+    """Games kept in process, for local runs, tests and benchmarks.
+
+    Reads hand out copies shaped like those of :class:`DynamoGateway`, partial
+    views included, and writes follow its conditions: a flush that would
+    overwrite a question stored since the game was loaded returns False.
+    ``calls`` counts the gateway methods invoked.
+    """
+
+    games: Dict[Tuple[str, str], Game] = field(default_factory=dict)
+
+    calls: Counter = field(init=False, default_factory=Counter)
+    _lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def _stored(self, player_id: str, game_id: str) -> Game:
+        try:
+            return self.games[(player_id, game_id)]
+        except KeyError:
+            raise NoSuchGame(game_id)
+
+    @staticmethod
+    def _copy_question(question: Question, view: View = View.FULL) -> Question:
+        copy = dataclasses.replace(
+            question, changes=set(), **HIDDEN_FIELDS.get(view, {})
+        )
+        copy.mark_clean()
+
+        return copy
+
+    def _copy_game(self, stored: Game, view: View) -> Game:
+        game = Game(
+            game_id=stored.game_id,
+            keywords=set(stored.keywords),
+            questions_limit=stored.questions_limit,
+            creation_time=stored.creation_time,
+            summary=GameProgress.of([q for q in stored.questions if not q.pending]),
+        )
+
+        if view is not View.SUMMARY:
+            game.attach_questions(
+                [self._copy_question(q, view) for q in stored.questions]
+            )
+
+        return game
+
+    def list_player_games(
+        self,
+        player_id: str,
+        view: View = View.FULL,
+    ) -> Iterator[Game]:
+        self.calls["list_player_games"] += 1
+
+        with self._lock:
+            games = [
+                self._copy_game(game, view)
+                for (player, _), game in self.games.items()
+                if player == player_id
+            ]
+
+        return iter(sorted(games, key=lambda game: game.creation_time, reverse=True))
+
+    def store_game(self, player_id: str, game: Game):
+        self.calls["store_game"] += 1
+        questions = list(game.questions)
+
+        if game.pending_question is not None:
+            questions.append(game.pending_question)
+
+        with self._lock:
+            self.games[(player_id, game.game_id)] = Game(
+                game_id=game.game_id,
+                keywords=set(game.keywords),
+                questions_limit=game.questions_limit,
+                creation_time=game.creation_time,
+                questions=[self._copy_question(q) for q in questions],
+            )
+
+        for question in questions:
+            question.mark_clean()
+
+    def flush(self, player_id: str, game: Game) -> bool:
+        self.calls["flush"] += 1
+        changed = [
+            (index, question)
+            for index, question in enumerate(game.questions)
+            if not question.is_stored or question.is_dirty
+        ]
+
+        if not changed:
+            return True
+
+        with self._lock:
+            stored_game = self._stored(player_id, game.game_id)
+            stored = stored_game.questions
+            next_index = len(stored)
+
+            for index, question in changed:
+                if not question.is_stored:
+                    conflict = (
+                        index != next_index or index >= stored_game.questions_limit
+                    )
+                    next_index += 1
+                elif "choice" in question.changes:
+                    conflict = stored[index].is_answered
+                else:
+                    conflict = (
+                        "pending" in question.changes and not stored[index].pending
+                    )
+
+                if conflict:
+                    return False
+
+            for index, question in changed:
+                if question.is_stored:
+                    stored[index] = dataclasses.replace(
+                        stored[index], choice=question.choice, pending=question.pending
+                    )
+                else:
+                    stored.append(self._copy_question(question))
+
+        for _, question in changed:
+            question.mark_clean()
+
+        return True
+
+    def get_game(
+        self,
+        player_id: str,
+        game_id: str,
+        view: View = View.FULL,
+    ) -> Game:
+        self.calls["get_game"] += 1
+
+        with self._lock:
+            return self._copy_game(self._stored(player_id, game_id), view)
+
+    def list_game_questions(
+        self,
+        player_id: str,
+        game_id: str,
+        limit: int,
+        view: View = View.FULL,
+    ) -> List[Question]:
+        self.calls["list_game_questions"] += 1
+
+        with self._lock:
+            questions = self._stored(player_id, game_id).questions[:limit]
+
+            return [self._copy_question(q, view) for q in questions]
+
+    def count_game_questions(
+        self,
+        player_id: str,
+        game_id: str,
+    ) -> int:
+        self.calls["count_game_questions"] += 1
+
+        with self._lock:
+            return len(self._stored(player_id, game_id).questions)
+
+    def get_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        view: View = View.FULL,
+    ) -> Question:
+        self.calls["get_game_question"] += 1
+
+        with self._lock:
+            questions = self._stored(player_id, game_id).questions
+
+            if not 1 <= question_id <= len(questions):
+                raise NoSuchQuestion(game_id, question_id)
+
+            return self._copy_question(questions[question_id - 1], view)
+
+    def store_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ):
+        self.calls["store_game_question"] += 1
+
+        with self._lock:
+            questions = self._stored(player_id, game_id).questions
+
+            if len(questions) == question_id - 1:
+                questions.append(self._copy_question(question))
+
+    def store_pending_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ) -> bool:
+        self.calls["store_pending_question"] += 1
+
+        with self._lock:
+            game = self._stored(player_id, game_id)
+
+            if len(game.questions) != question_id - 1:
+                return False
+
+            if question_id > game.questions_limit:
+                return False
+
+            questions = game.questions
+
+            questions.append(self._copy_question(question))
+
+        question.mark_clean()
+        return True
+
+    def update_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ):
+        self.calls["update_game_question"] += 1
+
+        with self._lock:
+            questions = self._stored(player_id, game_id).questions
+
+            if question.is_answered and not questions[question_id - 1].is_answered:
+                questions[question_id - 1] = dataclasses.replace(
+                    questions[question_id - 1], choice=question.choice
+                )
@@ -0,0 +1,130 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import os
+from typing import Any, Dict, List, Optional
+
+
+from .base import DynamoClientMixin
+from .codec import decode_question, encode_question_attributes
+from .dynamo import batch_put, deserialize, serialize
+from ..question import Question
+
+
+class BaseQuestionPool(ABC):
+    """Store of pre-generated questions, grouped by normalized topic."""
+
+    @abstractmethod
+    def size(self, topic: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_question(self, topic: str, index: int) -> Optional[Question]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_questions(self, topic: str, questions: List[Question]) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_questions(self, topic: str) -> List[Question]:
+        """Every question of the topic's pool, prompts at least."""
+        raise NotImplementedError
+
+
+@dataclass
+class MemoryQuestionPool(BaseQuestionPool):
+    pools: Dict[str, List[Question]] = field(default_factory=dict)
+
+    def size(self, topic: str) -> int:
+        return len(self.pools.get(topic, []))
+
+    def get_question(self, topic: str, index: int) -> Optional[Question]:
+        pool = self.pools.get(topic, [])
+        return pool[index] if index < len(pool) else None
+
+    def add_questions(self, topic: str, questions: List[Question]) -> int:
+        pool = self.pools.setdefault(topic, [])
+        pool.extend(questions)
+
+        return len(pool)
+
+    def list_questions(self, topic: str) -> List[Question]:
+        return list(self.pools.get(topic, []))
+
+
+@dataclass
+class DynamoQuestionPool(DynamoClientMixin, BaseQuestionPool):
+    """Pool table keyed on ``(Topic, QuestionId)``.
+
+    Item ``QuestionId = 0`` of every topic holds the pool size, which is also
+    used to allocate ids for new questions.
+    """
+
+    client: Any = None
+    pool_table: str = field(default_factory=lambda: os.getenv("POOL_TABLE"))
+    compress_text: bool = True
+
+    def size(self, topic: str) -> int:
+        response = self._client.get_item(
+            TableName=self.pool_table,
+            Key=serialize({"Topic": topic, "QuestionId": 0}),
+        )
+
+        return int(deserialize(response.get("Item", {})).get("Size", 0))
+
+    def get_question(self, topic: str, index: int) -> Optional[Question]:
+        response = self._client.get_item(
+            TableName=self.pool_table,
+            Key=serialize({"Topic": topic, "QuestionId": index + 1}),
+        )
+
+        # the size is bumped before the questions land, they may still be missing
+        if "Item" not in response:
+            return None
+
+        return decode_question(response["Item"])
+
+    def add_questions(self, topic: str, questions: List[Question]) -> int:
+        response = self._client.update_item(
+            TableName=self.pool_table,
+            Key=serialize({"Topic": topic, "QuestionId": 0}),
+            # Size is a reserved word
+            UpdateExpression="ADD #size :count",
+            ExpressionAttributeNames={"#size": "Size"},
+            ExpressionAttributeValues=serialize({":count": len(questions)}),
+            ReturnValues="UPDATED_NEW",
+        )
+        size = int(deserialize(response["Attributes"])["Size"])
+        start = size - len(questions)
+
+        batch_put(
+            self._client,
+            [
+                (
+                    self.pool_table,
+                    {
+                        "Topic": {"S": topic},
+                        "QuestionId": {"N": str(start + index + 1)},
+                        **encode_question_attributes(question, self.compress_text),
+                    },
+                )
+                for index, question in enumerate(questions)
+            ],
+        )
+
+        return size
+
+    def list_questions(self, topic: str) -> List[Question]:
+        """The prompts of the topic's questions, enough to avoid repeating them."""
+        paginator = self._client.get_paginator("query")
+        questions = []
+
+        for page in paginator.paginate(
+            TableName=self.pool_table,
+            KeyConditionExpression="Topic = :topic AND QuestionId > :size_id",
+            ExpressionAttributeValues=serialize({":topic": topic, ":size_id": 0}),
+            ProjectionExpression="Prompt",
+        ):
+            questions.extend(decode_question(item) for item in page.get("Items", []))
+
+        return questions
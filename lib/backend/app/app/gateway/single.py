@@ -0,0 +1,298 @@
+from dataclasses import dataclass, field
+import os
+from typing import Any, Dict, Iterator, List
+
+from aws_lambda_powertools import Logger
+
+from .base import BaseGateway, DynamoClientMixin, NoSuchGame, NoSuchQuestion, View
+from .codec import (
+    decode_game,
+    decode_question_list,
+    encode_game,
+    encode_question_list,
+    GAME_ATTRIBUTES,
+    game_key,
+    Item,
+)
+from ..game import Game
+from ..question import Question
+
+
+logger = Logger()
+
+
+@dataclass
+class SingleItemGateway(DynamoClientMixin, BaseGateway):
+    """Games stored as one item each, their questions in a list attribute.
+
+    Reading a game is a single GetItem and writing its changes a single
+    conditional UpdateItem. With ``compress`` the questions are stored as
+    zlib-compressed JSON in a binary attribute; either layout is read back.
+    Games hold a few dozen questions at most, well within the item size limit.
+
+    ``QuestionCount`` on the item counts the stored questions, pending one
+    included, and guards writes against concurrent updates. Since a flush
+    rewrites the whole list, a view only decides whether questions are read;
+    those that are come in full.
+    """
+
+    client: Any = None
+    game_table: str = field(default_factory=lambda: os.getenv("GAME_TABLE"))
+    compress: bool = False
+
+    def _decode(self, item: Item, view: View = View.FULL) -> Game:
+        game = decode_game(item)
+
+        if view is not View.SUMMARY:
+            questions = decode_question_list(item)
+
+            for question in questions:
+                question.mark_clean()
+
+            game.attach_questions(questions)
+
+        return game
+
+    @staticmethod
+    def _projection(view: View) -> Dict[str, str]:
+        if view is View.SUMMARY:
+            return {"ProjectionExpression": GAME_ATTRIBUTES}
+
+        return {}
+
+    def list_player_games(
+        self,
+        player_id: str,
+        view: View = View.FULL,
+    ) -> Iterator[Game]:
+        paginator = self._client.get_paginator("query")
+        projection = self._projection(view)
+
+        if view is not View.SUMMARY:
+            # the index only projects the keywords and questions limit; asking
+            # for all attributes has DynamoDB fetch the questions from the table
+            projection = {"Select": "ALL_ATTRIBUTES"}
+
+        for page in paginator.paginate(
+            TableName=self.game_table,
+            IndexName="creation-time-index",
+            KeyConditionExpression="PlayerId = :player_id",
+            ExpressionAttributeValues={
+                ":player_id": {"S": player_id},
+            },
+            ScanIndexForward=False,
+            **projection,
+        ):
+            for item in page.get("Items", []):
+                yield self._decode(item, view)
+
+    def get_game(
+        self,
+        player_id: str,
+        game_id: str,
+        view: View = View.FULL,
+    ) -> Game:
+        projection = self._projection(view)
+        response = self._client.get_item(
+            TableName=self.game_table,
+            Key=game_key(player_id, game_id),
+            **projection,
+        )
+
+        if "Item" not in response:
+            raise NoSuchGame(game_id)
+
+        return self._decode(response["Item"], view)
+
+    @staticmethod
+    def _stored_questions(game: Game) -> List[Question]:
+        if game.pending_question is None:
+            return list(game.questions)
+
+        return game.questions + [game.pending_question]
+
+    def _put_game(self, player_id: str, game: Game, **conditions):
+        questions = self._stored_questions(game)
+
+        self._client.put_item(
+            TableName=self.game_table,
+            Item={
+                **encode_game(player_id, game),
+                **encode_question_list(questions, self.compress),
+                "QuestionCount": {"N": str(len(questions))},
+            },
+            **conditions,
+        )
+
+        for question in questions:
+            question.mark_clean()
+
+    def store_game(self, player_id: str, game: Game):
+        self._put_game(player_id, game)
+
+    def import_game(self, player_id: str, game: Game) -> bool:
+        """Store a game read from another layout, unless already in this one.
+
+        Returns False, leaving the stored game as is, if the item already has
+        ``QuestionCount``: it was migrated or written by the API since.
+        """
+        try:
+            self._put_game(
+                player_id,
+                game,
+                ConditionExpression="attribute_not_exists(QuestionCount)",
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            return False
+
+        return True
+
+    def flush(self, player_id: str, game: Game) -> bool:
+        """Write the game's questions and counters in one conditional update.
+
+        The write only goes through if the stored game still has the questions
+        and answers it had when loaded, and keeps within its questions limit;
+        returns False otherwise.
+        """
+        questions = self._stored_questions(game)
+
+        if all(q.is_stored and not q.is_dirty for q in questions):
+            return True
+
+        loaded = [q for q in questions if q.is_stored]
+        loaded_answered = sum(
+            q.is_answered and "choice" not in q.changes for q in loaded
+        )
+        progress = game.progress
+        encoded = encode_question_list(questions, self.compress)
+        (attribute,) = encoded
+        stale_attribute = "Questions" if self.compress else "QuestionsZ"
+
+        try:
+            self._client.update_item(
+                TableName=self.game_table,
+                Key=game_key(player_id, game.game_id),
+                UpdateExpression=f"SET {attribute} = :questions, "
+                "QuestionCount = :count, QuestionsAsked = :asked, "
+                "QuestionsAnswered = :answered, QuestionsCorrect = :correct "
+                f"REMOVE {stale_attribute}",
+                ConditionExpression="(QuestionCount = :loaded "
+                "OR (attribute_not_exists(QuestionCount) AND :loaded = :zero)) "
+                "AND QuestionsAnswered = :loaded_answered "
+                "AND :count <= QuestionsLimit",
+                ExpressionAttributeValues={
+                    ":questions": encoded[attribute],
+                    ":count": {"N": str(len(questions))},
+                    ":asked": {"N": str(progress.asked)},
+                    ":answered": {"N": str(progress.answered)},
+                    ":correct": {"N": str(progress.correct)},
+                    ":loaded": {"N": str(len(loaded))},
+                    ":loaded_answered": {"N": str(loaded_answered)},
+                    ":zero": {"N": "0"},
+                },
+            )
+        except self._client.exceptions.ConditionalCheckFailedException:
+            logger.warning(
+                "Concurrent update of game, changes not written",
+                extra={"game_id": game.game_id},
+            )
+            return False
+
+        for question in questions:
+            question.mark_clean()
+
+        return True
+
+    def store_pending_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ) -> bool:
+        game = self.get_game(player_id, game_id)
+
+        if len(self._stored_questions(game)) != question_id - 1:
+            return False
+
+        game.pending_question = question
+
+        return self.flush(player_id, game)
+
+    def list_game_questions(
+        self,
+        player_id: str,
+        game_id: str,
+        limit: int,
+        view: View = View.FULL,
+    ) -> List[Question]:
+        return self._stored_questions(self.get_game(player_id, game_id))[:limit]
+
+    def count_game_questions(
+        self,
+        player_id: str,
+        game_id: str,
+    ) -> int:
+        response = self._client.get_item(
+            TableName=self.game_table,
+            Key=game_key(player_id, game_id),
+            ProjectionExpression="QuestionCount",
+        )
+
+        return int(response.get("Item", {}).get("QuestionCount", {"N": "0"})["N"])
+
+    def get_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        view: View = View.FULL,
+    ) -> Question:
+        """Read a single question, projecting only that list element."""
+        if question_id < 1:
+            raise NoSuchQuestion(game_id, question_id)
+
+        response = self._client.get_item(
+            TableName=self.game_table,
+            Key=game_key(player_id, game_id),
+            ProjectionExpression=f"Questions[{question_id - 1}], QuestionsZ",
+        )
+        questions = decode_question_list(response.get("Item", {}))
+
+        if "QuestionsZ" in response.get("Item", {}):
+            questions = questions[question_id - 1 : question_id]
+
+        if not questions:
+            raise NoSuchQuestion(game_id, question_id)
+
+        questions[0].mark_clean()
+        return questions[0]
+
+    def store_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ):
+        game = self.get_game(player_id, game_id)
+
+        if len(game.questions) == question_id - 1:
+            game.questions.append(question)
+            self.flush(player_id, game)
+
+    def update_game_question(
+        self,
+        player_id: str,
+        game_id: str,
+        question_id: int,
+        question: Question,
+    ):
+        game = self.get_game(player_id, game_id)
+
+        if question_id <= len(game.questions) and question.is_answered:
+            stored = game.questions[question_id - 1]
+
+            if not stored.is_answered:
+                stored.answer(question.choice)
+                self.flush(player_id, game)
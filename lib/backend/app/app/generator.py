@@ -0,0 +1,148 @@
+"""Offline generation of question pools.
+
+Usage::
+
+    python -m app.generator --keywords history,Napoleon --keywords movies --count 50
+
+Questions are generated through :class:`BaseGameService` instances, one per
+worker thread, validated and stored per normalized keyword set, to be served
+by :class:`app.game_service.pool.PooledGameService`.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from aws_lambda_powertools import Logger
+
+from .game import Game, normalize_keywords
+from .game_service.base import BaseGameService
+from .game_service.dedup import DuplicateFilter
+from .gateway.pool import BaseQuestionPool
+from .question import InvalidQuestion, Question
+
+
+logger = Logger()
+
+
+def validate(question: Question) -> Optional[Question]:
+    try:
+        return Question.create(
+            prompt=question.prompt,
+            options=question.options,
+            clarification=question.clarification,
+            solution=question.solution,
+        )
+    except InvalidQuestion:
+        return None
+
+
+@dataclass
+class PoolGenerator:
+    # services keep per-game chains and memory, so each worker gets its own
+    service_factory: Callable[[], BaseGameService]
+    pool: BaseQuestionPool
+    concurrency: int = 4
+    # generation attempts allowed per requested question, covering rejected ones
+    max_attempts_factor: int = 2
+    duplicates: DuplicateFilter = field(default_factory=DuplicateFilter)
+
+    def generate(self, keywords: Set[str], count: int) -> List[Question]:
+        """Generate up to ``count`` new, distinct questions for a keyword set.
+
+        Every generation sees the questions already in the pool and those
+        accepted so far, so services that avoid repeating a game's questions
+        avoid repeating the pool's as well. Invalid questions and
+        near-duplicates of pooled or accepted ones are dropped.
+        """
+        topic = normalize_keywords(keywords)
+        existing = self.pool.list_questions(topic)
+        limit = len(existing) + count
+        game = Game(
+            game_id=f"pool:{topic}",
+            keywords=set(topic.split(",")),
+            questions_limit=limit,
+            questions=list(existing),
+        )
+        lock = threading.Lock()
+        services = threading.local()
+
+        def generate_one(_):
+            with lock:
+                if len(game.questions) >= limit:
+                    return
+                snapshot = Game(
+                    game_id=game.game_id,
+                    keywords=game.keywords,
+                    questions_limit=limit,
+                    questions=list(game.questions),
+                )
+
+            if not hasattr(services, "service"):
+                services.service = self.service_factory()
+
+            try:
+                question = validate(services.service.generate_question(snapshot))
+            except Exception:
+                logger.exception("Question generation failed", extra={"topic": topic})
+                return
+
+            with lock:
+                if question is None or len(game.questions) >= limit:
+                    return
+                if self.duplicates.find_duplicate(game, question.prompt) is None:
+                    game.questions.append(question)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(generate_one, range(count * self.max_attempts_factor)))
+
+        added = game.questions[len(existing) :]
+
+        if added:
+            size = self.pool.add_questions(topic, added)
+            logger.info(
+                "Extended question pool",
+                extra={"topic": topic, "added": len(added), "size": size},
+            )
+
+        return added
+
+    def run(self, keyword_sets: Iterable[Set[str]], count: int) -> Dict[str, int]:
+        return dict(
+            (normalize_keywords(keywords), len(self.generate(keywords, count)))
+            for keywords in keyword_sets
+        )
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--keywords",
+        action="append",
+        required=True,
+        help="comma separated keyword set, may be repeated",
+    )
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    from .game_service import OpenAIService
+    from .gateway.pool import DynamoQuestionPool
+
+    generator = PoolGenerator(
+        service_factory=partial(OpenAIService, api_key=os.environ["OPENAI_API_KEY"]),
+        pool=DynamoQuestionPool(),
+        concurrency=args.concurrency,
+    )
+
+    for topic, added in generator.run(
+        [set(keywords.split(",")) for keywords in args.keywords], args.count
+    ).items():
+        print(f"{topic}: {added} questions added")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from collections import Counter
+from dataclasses import dataclass, field
+import hashlib
+import json
+from typing import Any, Callable, Dict
+
+from aws_lambda_powertools import Logger
+
+from .gateway.idempotency import BaseIdempotencyStore, StoredResponse
+
+
+logger = Logger()
+
+
+class IdempotencyKeyReused(Exception):
+    def __init__(self, key: str):
+        self.key = key
+
+
+class IdempotencyKeyInProgress(Exception):
+    def __init__(self, key: str):
+        self.key = key
+
+
+@dataclass
+class Idempotency:
+    """Answer requests repeated with the same idempotency key only once.
+
+    A request claims its key before it is handled, and its response is
+    stored for ``window`` seconds; repeats within it get the stored response
+    back without being handled again. Repeats arriving while the first
+    request is still handled are turned away rather than handled alongside
+    it. Claims of requests that fail, or die, are given up, the latter after
+    ``claim_ttl`` seconds, so they can be retried. A key repeated with a
+    different request is rejected.
+    """
+
+    store: BaseIdempotencyStore
+    window: float = 24 * 60 * 60
+    # longer than a request can take
+    claim_ttl: float = 60
+
+    counters: Counter = field(init=False, default_factory=Counter)
+
+    def handle(
+        self,
+        key: str,
+        request: str,
+        handler: Callable[[], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        fingerprint = hashlib.sha256(request.encode()).hexdigest()
+        stored = self.store.claim(key, fingerprint, self.claim_ttl)
+
+        if stored is None:
+            try:
+                body = json.dumps(handler())
+            except BaseException:
+                self.store.release(key)
+                raise
+
+            self.counters["handled"] += 1
+            self.store.complete(key, StoredResponse(fingerprint, body), self.window)
+
+            return json.loads(body)
+
+        if stored.fingerprint != fingerprint:
+            raise IdempotencyKeyReused(key)
+
+        if stored.body is None:
+            self.counters["in_progress"] += 1
+            raise IdempotencyKeyInProgress(key)
+
+        logger.info("Replaying stored response", extra={"key": key})
+        self.counters["replayed"] += 1
+
+        return json.loads(stored.body)
@@ -0,0 +1,88 @@
+from collections import Counter
+from dataclasses import dataclass, field
+import time
+from typing import Any, Callable, Dict, Optional, Sequence
+import urllib
+
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.metrics import MetricUnit
+
+from .cache import LRUCache
+from .player import Player
+
+
+def fetch_userinfo(domain: str, token: str) -> Dict[str, Any]:
+    # only needed for tokens without an email claim, kept off the cold start
+    from auth0.authentication import Users
+
+    return Users(domain).userinfo(token)
+
+
+@dataclass
+class IdentityResolver:
+    """Resolve the calling player without a round trip to Auth0 where possible.
+
+    The API Gateway JWT authorizer has already verified the token, so an email
+    claim in it is trusted as is. Tokens without one fall back to the Auth0
+    /userinfo endpoint, whose answers are cached per token until the token
+    expires or the cache TTL runs out, whichever comes first.
+
+    Every resolution counts towards its path, ``claims``, ``cache_hit`` or
+    ``cache_miss``, also emitted as an ``identity_<path>`` metric when given
+    ``metrics``; cache misses are the calls made to Auth0.
+    """
+
+    email_claims: Sequence[str] = ("email",)
+    cache: LRUCache = field(default_factory=lambda: LRUCache(maxsize=1024, ttl=15 * 60))
+    userinfo: Callable[[str, str], Dict[str, Any]] = fetch_userinfo
+    metrics: Optional[Metrics] = None
+
+    counters: Counter = field(init=False, default_factory=Counter)
+
+    def resolve(self, event) -> Player:
+        claims = event.request_context.authorizer.jwt_claim
+
+        email = self._claimed_email(claims)
+        if email is not None:
+            return self._count("claims", Player.from_email(email))
+
+        token = event.get_header_value("Authorization").split(" ")[-1]
+
+        player = self.cache.get(token)
+        if player is not None:
+            return self._count("cache_hit", player)
+
+        domain = urllib.parse.urlparse(claims["iss"])
+        user = self.userinfo(domain.netloc, token)
+        player = Player.from_email(user["email"])
+
+        self.cache.put(token, player, ttl=self._token_ttl(claims))
+        return self._count("cache_miss", player)
+
+    def _claimed_email(self, claims: Dict[str, Any]) -> Optional[str]:
+        for claim in self.email_claims:
+            if claims.get(claim):
+                return claims[claim]
+
+        return None
+
+    def _token_ttl(self, claims: Dict[str, Any]) -> Optional[float]:
+        if "exp" not in claims:
+            return None
+
+        remaining = float(claims["exp"]) - time.time()
+
+        if self.cache.ttl is not None:
+            remaining = min(remaining, self.cache.ttl)
+
+        return max(remaining, 0)
+
+    def _count(self, path: str, player: Player) -> Player:
+        self.counters[path] += 1
+
+        if self.metrics is not None:
+            self.metrics.add_metric(
+                name=f"identity_{path}", unit=MetricUnit.Count, value=1
+            )
+
+        return player
@@ -0,0 +1,82 @@
+"""Copy games from the two-table layout to the single-item layout.
+
+Usage::
+
+    python -m app.migrate --source-game-table Games \\
+        --source-question-table Questions --target-game-table Games --compress
+
+The target may be the source game table itself: game items keep their key
+and gain their questions, so the migration can run in place before the
+deployment switches ``GAME_LAYOUT`` to ``single``. Games already in the
+single-item layout are skipped, so running it again never overwrites games
+the API wrote since. Games are copied as read, so migrate while the API is
+idle: changes made through the old layout after a game was copied are lost.
+"""
+import argparse
+from typing import Optional
+
+from aws_lambda_powertools import Logger
+
+from .gateway import DynamoGateway, SingleItemGateway
+from .gateway.codec import decode_game
+
+
+logger = Logger()
+
+
+def migrate(
+    source: DynamoGateway,
+    target: SingleItemGateway,
+    dry_run: bool = False,
+) -> int:
+    """Copy the games of the source to the target, returning their number.
+
+    Games the target already has in its layout are left alone.
+    """
+    paginator = source._client.get_paginator("scan")
+    migrated = 0
+
+    for page in paginator.paginate(TableName=source.game_table):
+        # in place, games already migrated come along in the scan
+        items = [item for item in page.get("Items", []) if "QuestionCount" not in item]
+        games = [decode_game(item) for item in items]
+
+        if not games:
+            continue
+
+        questions = source.batch_list_game_questions(games, include_pending=True)
+
+        for item, game in zip(items, games):
+            game.attach_questions(questions[game.game_id])
+
+            if dry_run or target.import_game(item["PlayerId"]["S"], game):
+                migrated += 1
+
+        logger.info("Migrated games", extra={"games": migrated, "dry_run": dry_run})
+
+    return migrated
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--source-game-table", required=True)
+    parser.add_argument("--source-question-table", required=True)
+    parser.add_argument("--target-game-table", required=True)
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    migrated = migrate(
+        DynamoGateway(
+            game_table=args.source_game_table,
+            question_table=args.source_question_table,
+        ),
+        SingleItemGateway(game_table=args.target_game_table, compress=args.compress),
+        dry_run=args.dry_run,
+    )
+
+    print(f"{migrated} games {'found' if args.dry_run else 'migrated'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,11 @@
 from dataclasses import dataclass
+import hashlib
 
 
 @dataclass
 class Player:
     player_id: str
+
+    @staticmethod
+    def from_email(email: str):
+        return Player(hashlib.md5(email.encode("utf-8")).hexdigest())
@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+import json
+from typing import Any, Optional
+
+from aws_lambda_powertools import Logger
+import boto3
+
+from .game import Game
+from .game_service.base import BaseGameService
+from .gateway.base import BaseGateway, View
+from .question import Question
+from .single_flight import SingleFlight
+
+
+logger = Logger()
+
+
+def prefetch_question(
+    gateway: BaseGateway,
+    service: BaseGameService,
+    player_id: str,
+    game_id: str,
+    min_answered: int = 1,
+    single_flight: Optional[SingleFlight] = None,
+) -> Optional[Question]:
+    """Generate the next question of a game and store it as pending.
+
+    The game is reloaded first, so a prefetch that arrives after the player
+    already asked, or once the questions limit is reached, costs no tokens.
+    With ``single_flight`` the prefetch holds the game's generation lease:
+    it is skipped if an ask is already generating, and an ask arriving while
+    it generates waits for the prefetched question instead of generating its
+    own. Otherwise, or if the lease expired, the conditional write decides
+    and the losing question is dropped.
+    """
+    game = gateway.get_game(player_id, game_id, View.PROMPTS)
+
+    if not game.can_prefetch(min_answered):
+        logger.info("Skipping question prefetch", extra={"game_id": game_id})
+        return None
+
+    if single_flight is None:
+        return _prefetch(gateway, service, player_id, game)
+
+    with single_flight.generation(
+        gateway, player_id, game, View.PROMPTS, wait=False
+    ) as game:
+        if game is None or not game.can_prefetch(min_answered):
+            logger.info(
+                "Question generated by another request", extra={"game_id": game_id}
+            )
+            return None
+
+        return _prefetch(gateway, service, player_id, game)
+
+
+def _prefetch(
+    gateway: BaseGateway,
+    service: BaseGameService,
+    player_id: str,
+    game: Game,
+) -> Optional[Question]:
+    question = service.generate_question(game)
+    question.pending = True
+
+    if not gateway.store_pending_question(
+        player_id, game.game_id, len(game.questions) + 1, question
+    ):
+        logger.info(
+            "Player asked before prefetch completed", extra={"game_id": game.game_id}
+        )
+        return None
+
+    return question
+
+
+class BasePrefetcher(ABC):
+    @abstractmethod
+    def schedule(self, player_id: str, game_id: str):
+        raise NotImplementedError
+
+
+@dataclass
+class InlinePrefetcher(BasePrefetcher):
+    """Prefetch within the calling request, for local runs and tests."""
+
+    gateway: BaseGateway
+    service: BaseGameService
+    min_answered: int = 1
+    single_flight: Optional[SingleFlight] = None
+
+    def schedule(self, player_id: str, game_id: str):
+        prefetch_question(
+            self.gateway,
+            self.service,
+            player_id,
+            game_id,
+            self.min_answered,
+            self.single_flight,
+        )
+
+
+@dataclass
+class LambdaPrefetcher(BasePrefetcher):
+    """Prefetch in an asynchronous invocation of the given function.
+
+    The answer request returns right away; the function receives a
+    ``{"prefetch": {...}}`` event which ``lambda_handler`` routes to
+    :func:`prefetch_question`.
+    """
+
+    function_name: str
+    client: Any = None
+
+    def schedule(self, player_id: str, game_id: str):
+        if self.client is None:
+            self.client = boto3.client("lambda")
+
+        self.client.invoke(
+            FunctionName=self.function_name,
+            InvocationType="Event",
+            Payload=json.dumps(
+                {
+                    "prefetch": {
+                        "player_id": player_id,
+                        "game_id": game_id,
+                    }
+                }
+            ),
+        )
@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Any, Dict, List
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Set
 
 
 class InvalidQuestion(Exception):
@@ -28,6 +28,20 @@ class Question:
     clarification: str
     solution: int
     choice: int = None
+    # generated ahead of time and not yet shown to the player
+    pending: bool = False
+
+    # persistence state, maintained by the gateway to only write what changed
+    is_stored: bool = field(default=False, compare=False, repr=False)
+    changes: Set[str] = field(default_factory=set, compare=False, repr=False)
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.changes)
+
+    def mark_clean(self):
+        self.is_stored = True
+        self.changes.clear()
 
     def pose(self) -> Dict[str, Any]:
         return {
@@ -61,6 +75,7 @@ class Question:
             raise InvalidAnswer
 
         self.choice = choice
+        self.changes.add("choice")
 
         return QuestionFeedback(
             result=self.answered_correctly,
@@ -68,6 +83,11 @@ class Question:
             clarification=self.clarification,
         )
 
+    def reveal(self):
+        if self.pending:
+            self.pending = False
+            self.changes.add("pending")
+
     @staticmethod
     def create(prompt: str, options: List[int], clarification: str, solution: int):
         if solution < 1 or solution > len(options):
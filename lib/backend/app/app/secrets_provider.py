@@ -0,0 +1,78 @@
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any, Callable, Dict, Set, Tuple
+
+from aws_lambda_powertools import Logger
+import boto3
+
+
+logger = Logger()
+
+
+def spawn_thread(target: Callable[[], Any]):
+    threading.Thread(target=target, daemon=True).start()
+
+
+@dataclass
+class SecretsProvider:
+    """Secrets Manager values, cached in memory and refreshed in the background.
+
+    Only the first lookup of a secret waits on Secrets Manager. Once a value
+    is older than ``ttl`` seconds it is still returned right away, while a
+    single background refresh fetches the current one, so rotated secrets
+    are picked up without a redeploy or a request paying for the call.
+    Failed refreshes are logged and retried on a later lookup.
+    """
+
+    client: Any = None
+    ttl: float = 300
+    clock: Callable[[], float] = time.monotonic
+    spawn: Callable[[Callable[[], Any]], Any] = spawn_thread
+
+    _values: Dict[str, Tuple[str, float]] = field(
+        init=False, default_factory=dict, repr=False
+    )
+    _refreshing: Set[str] = field(init=False, default_factory=set, repr=False)
+    _lock: threading.Lock = field(
+        init=False, default_factory=threading.Lock, repr=False
+    )
+
+    def _fetch(self, secret_id: str) -> str:
+        if self.client is None:
+            self.client = boto3.client("secretsmanager")
+
+        value = self.client.get_secret_value(SecretId=secret_id)["SecretString"]
+
+        with self._lock:
+            self._values[secret_id] = (value, self.clock())
+
+        return value
+
+    def _refresh(self, secret_id: str):
+        try:
+            self._fetch(secret_id)
+        except Exception:
+            logger.exception("Secret refresh failed", extra={"secret_id": secret_id})
+        finally:
+            with self._lock:
+                self._refreshing.discard(secret_id)
+
+    def get(self, secret_id: str) -> str:
+        with self._lock:
+            entry = self._values.get(secret_id)
+
+            if entry is not None:
+                value, fetched_at = entry
+                stale = self.clock() - fetched_at >= self.ttl
+
+                if stale and secret_id not in self._refreshing:
+                    self._refreshing.add(secret_id)
+                else:
+                    return value
+
+        if entry is None:
+            return self._fetch(secret_id)
+
+        self.spawn(lambda: self._refresh(secret_id))
+        return value
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+import random
+import re
+from typing import Dict, Hashable, List, Set, Tuple
+import zlib
+
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+Signature = Tuple[int, ...]
+
+
+def shingles(text: str, size: int = 5) -> Set[bytes]:
+    """Character shingles of the text, ignoring case and punctuation."""
+    normalized = " ".join(re.findall(r"\w+", text.lower()))
+
+    if len(normalized) <= size:
+        return {normalized.encode("utf-8")}
+
+    return set(
+        normalized[i : i + size].encode("utf-8")
+        for i in range(len(normalized) - size + 1)
+    )
+
+
+@dataclass(frozen=True)
+class MinHash:
+    """MinHash signatures estimating the Jaccard similarity of shingle sets."""
+
+    num_perm: int = 64
+    shingle_size: int = 5
+    seed: int = 1
+
+    def __post_init__(self):
+        rng = random.Random(self.seed)
+        object.__setattr__(
+            self,
+            "_permutations",
+            [
+                (rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME))
+                for _ in range(self.num_perm)
+            ],
+        )
+
+    def signature(self, text: str) -> Signature:
+        hashes = [zlib.crc32(s) for s in shingles(text, self.shingle_size)]
+
+        return tuple(
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+
+    @staticmethod
+    def similarity(left: Signature, right: Signature) -> float:
+        return sum(x == y for x, y in zip(left, right)) / len(left)
+
+
+@dataclass
+class LSHIndex:
+    """Locality sensitive hashing over MinHash signatures.
+
+    Signatures are split in ``bands`` of ``rows`` values; items sharing any
+    band are candidates, confirmed by their estimated similarity. With the
+    defaults, pairs above ~0.5 similarity almost always become candidates.
+    """
+
+    bands: int = 16
+    rows: int = 4
+    threshold: float = 0.6
+
+    _buckets: List[Dict[Signature, Set[Hashable]]] = field(
+        init=False, default_factory=list, repr=False
+    )
+    _signatures: Dict[Hashable, Signature] = field(
+        init=False, default_factory=dict, repr=False
+    )
+
+    def __post_init__(self):
+        self._buckets = [defaultdict(set) for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _bands(self, signature: Signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows : (band + 1) * self.rows]
+
+    def add(self, key: Hashable, signature: Signature):
+        self._signatures[key] = signature
+
+        for band, values in self._bands(signature):
+            self._buckets[band][values].add(key)
+
+    def query(self, signature: Signature) -> List[Tuple[Hashable, float]]:
+        """Stored items similar to the signature, most similar first."""
+        candidates = set()
+
+        for band, values in self._bands(signature):
+            candidates.update(self._buckets[band].get(values, ()))
+
+        matches = [
+            (key, MinHash.similarity(signature, self._signatures[key]))
+            for key in candidates
+        ]
+
+        return sorted(
+            [(key, score) for key, score in matches if score >= self.threshold],
+            key=lambda match: -match[1],
+        )
@@ -0,0 +1,103 @@
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import secrets
+import time
+from typing import Callable, Iterator, Optional
+
+from aws_lambda_powertools import Logger
+
+from .game import Game
+from .gateway.base import BaseGateway, View
+from .gateway.lease import BaseLeaseStore
+
+
+logger = Logger()
+
+
+@dataclass
+class SingleFlight:
+    """Let one request at a time generate the next question of a game.
+
+    The request holding the game's generation lease generates and stores the
+    question. Concurrent requests for the same game, such as a double tap or
+    a retry after a timeout, wait until it is stored and serve it rather than
+    paying for a generation of their own. While waiting they only poll the
+    number of stored questions, loading the game once that changes.
+
+    Leases expire after ``ttl`` seconds, so a request that dies holding one
+    holds up the others at most that long. It stays below the 30 second
+    integration timeout of the HTTP API, so a waiting client does not give up
+    on a game blocked by a dead request.
+    """
+
+    leases: BaseLeaseStore
+    ttl: float = 25
+    poll_interval: float = 0.25
+    sleep: Callable[[float], None] = time.sleep
+    clock: Callable[[], float] = time.monotonic
+
+    counters: Counter = field(init=False, default_factory=Counter)
+
+    @contextmanager
+    def generation(
+        self,
+        gateway: BaseGateway,
+        player_id: str,
+        game: Game,
+        view: View = View.FULL,
+        wait: bool = True,
+    ) -> Iterator[Optional[Game]]:
+        """Hold the game's generation lease while its next question is stored.
+
+        Yields the game to quiz, reloaded with ``view`` if another request
+        stored its next question in the meantime. Games that have a question
+        to serve go through without a lease. Without ``wait``, None is yielded
+        if another request holds the lease, leaving the generation to it.
+        """
+        if not game.needs_generation:
+            yield game
+            return
+
+        key = f"{player_id}#{game.game_id}"
+        holder = secrets.token_hex(8)
+        deadline = self.clock() + self.ttl
+        loaded = len(game.questions)
+
+        while not self.leases.acquire(key, holder, self.ttl):
+            if not wait:
+                self.counters["skipped"] += 1
+                yield None
+                return
+
+            if self.clock() >= deadline:
+                logger.warning(
+                    "Generation lease not released, generating anyway",
+                    extra={"game_id": game.game_id},
+                )
+                self.counters["expired"] += 1
+                yield game
+                return
+
+            self.sleep(self.poll_interval)
+            stored = gateway.count_game_questions(player_id, game.game_id)
+
+            if stored != loaded:
+                game = gateway.get_game(player_id, game.game_id, view)
+                loaded = stored
+
+                if not game.needs_generation:
+                    self.counters["reused"] += 1
+                    yield game
+                    return
+
+        try:
+            # the previous holder may have stored a question before this
+            # request acquired the lease, but after it loaded the game
+            if gateway.count_game_questions(player_id, game.game_id) != loaded:
+                game = gateway.get_game(player_id, game.game_id, view)
+
+            self.counters["generated" if game.needs_generation else "reused"] += 1
+            yield game
+        finally:
+            self.leases.release(key, holder)
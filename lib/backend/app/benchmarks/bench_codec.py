@@ -0,0 +1,89 @@
+"""Cost of decoding and encoding question items, generic helpers vs codec.
+
+Usage::
+
+    python -m benchmarks.bench_codec --questions 1000
+
+The generic path is the one the gateway used before the codec: boto3's type
+(de)serializer over plain records, then :class:`Question` built by hand.
+"""
+import argparse
+import timeit
+
+from app.gateway.codec import decode_question, encode_question
+from app.gateway.dynamo import deserialize, serialize
+from app.question import Question
+
+
+def question_record(game_id: str, question_id: int, question: Question):
+    record = {
+        "GameId": game_id,
+        "QuestionId": question_id,
+        "Prompt": question.prompt,
+        "Options": question.options,
+        "Solution": question.solution,
+        "Clarification": question.clarification,
+    }
+
+    if question.is_answered:
+        record["Choice"] = question.choice
+
+    return record
+
+
+def generic_decode_question(item) -> Question:
+    question_data = deserialize(item)
+    choice = question_data.get("Choice")
+
+    return Question(
+        prompt=question_data["Prompt"],
+        options=question_data["Options"],
+        solution=int(question_data["Solution"]),
+        choice=int(choice) if choice else choice,
+        clarification=question_data["Clarification"],
+        pending=question_data.get("Pending", False),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--questions", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    questions = []
+    for index in range(args.questions):
+        question = Question.create(
+            prompt=f"In which year did event number {index} take place?",
+            options=[str(1800 + index % 100 + offset) for offset in range(4)],
+            clarification="Some clarification of a couple of sentences. " * 4,
+            solution=1 + index % 4,
+        )
+        if index % 2:
+            question.answer(1)
+        questions.append(question)
+
+    items = [encode_question("game", i + 1, q) for i, q in enumerate(questions)]
+    assert [generic_decode_question(item) for item in items] == [
+        decode_question(item) for item in items
+    ]
+
+    cases = {
+        "decode generic": lambda: [generic_decode_question(item) for item in items],
+        "decode codec": lambda: [decode_question(item) for item in items],
+        "encode generic": lambda: [
+            serialize(question_record("game", i + 1, q))
+            for i, q in enumerate(questions)
+        ],
+        "encode codec": lambda: [
+            encode_question("game", i + 1, q) for i, q in enumerate(questions)
+        ],
+    }
+
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        print(f"{name:>15}: {best * 1e3:7.2f} ms per {args.questions} questions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+"""Latency, gateway calls and memory of every API route, end to end.
+
+Usage::
+
+    python -m benchmarks.bench_routes --games 1 20 200 --questions 0 7 14
+
+Synthetic API Gateway HTTP API events go through ``app.lambda_handler``, with
+the games kept in a :class:`MemoryGateway` and questions generated by a fake
+service sleeping ``--latency-ms``. Every route is measured for each player
+history size (``--games``) and game size (``--questions``, answered questions
+per game); the state a request needs is seeded before the clock starts.
+
+Gateway calls stand in for DynamoDB round trips; memory is the peak traced by
+``tracemalloc`` over a request, in a separate pass so tracing does not skew
+the latencies. ``--output`` writes the results as JSON, to diff against a
+baseline.
+"""
+import argparse
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+import itertools
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+os.environ.setdefault("POWERTOOLS_TRACE_DISABLED", "true")
+os.environ.setdefault("POWERTOOLS_LOG_LEVEL", "WARNING")
+
+import app.app as api  # noqa: E402
+from app.game import Game  # noqa: E402
+from app.game_service.base import BaseGameService  # noqa: E402
+from app.gateway import MemoryGateway  # noqa: E402
+from app.player import Player  # noqa: E402
+from app.question import Question  # noqa: E402
+
+
+EMAIL = "bench@example.com"
+PLAYER_ID = Player.from_email(EMAIL).player_id
+QUESTIONS_LIMIT = 15
+
+CONTEXT = SimpleNamespace(
+    function_name="bench",
+    memory_limit_in_mb=128,
+    invoked_function_arn="arn:aws:lambda:eu-west-1:123456789012:function:bench",
+    aws_request_id="bench",
+)
+
+
+def make_question(index: int) -> Question:
+    return Question.create(
+        prompt=f"In which year did event number {index} take place?",
+        options=[str(1800 + index % 100 + offset) for offset in range(4)],
+        clarification="Some clarification of a couple of sentences. " * 4,
+        solution=1 + index % 4,
+    )
+
+
+class SlowGameService(BaseGameService):
+    """Questions made up on the spot, after the latency of an LLM call."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.generated = itertools.count(1)
+
+    def generate_question(self, game: Game) -> Question:
+        time.sleep(self.latency)
+
+        return make_question(next(self.generated))
+
+
+def event(method: str, path: str, body: Optional[Dict[str, Any]] = None):
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"content-type": "application/json"},
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "bench",
+            "authorizer": {"jwt": {"claims": {"email": EMAIL}, "scopes": []}},
+            "domainName": "bench.example.com",
+            "domainPrefix": "bench",
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "bench",
+            },
+            "requestId": "bench",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "01/Jan/2024:00:00:00 +0000",
+            "timeEpoch": 1704067200000,
+        },
+        "body": json.dumps(body) if body is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+game_ids = itertools.count(1)
+
+
+def seed_game(
+    gateway: MemoryGateway,
+    answered: int,
+    open_question: bool = False,
+    age: int = 0,
+) -> Game:
+    game_id = next(game_ids)
+    game = Game(
+        game_id=f"game-{game_id}",
+        keywords={"history", "Napoleon"},
+        questions_limit=QUESTIONS_LIMIT,
+        creation_time=datetime(2024, 1, 1) - timedelta(minutes=age),
+        questions=[
+            make_question(game_id * QUESTIONS_LIMIT + index)
+            for index in range(answered + open_question)
+        ],
+    )
+
+    for question in game.questions[:answered]:
+        question.answer(1)
+
+    gateway.store_game(PLAYER_ID, game)
+    return game
+
+
+def invoke(payload: Dict[str, Any]) -> bool:
+    """Run a request through the handler, returning whether it failed."""
+    try:
+        return api.lambda_handler(payload, CONTEXT)["statusCode"] >= 400
+    except Exception:
+        return True
+
+
+@dataclass
+class Route:
+    name: str
+    method: str
+    path: str
+    body: Optional[Dict[str, Any]] = None
+    # the open question the request works on, if any
+    open_question: bool = False
+
+
+ROUTES = [
+    Route("list games", "GET", "/games"),
+    Route("start game", "POST", "/games", body={"keywords": ["history"]}),
+    Route("get game", "GET", "/games/{game}"),
+    Route("list questions", "GET", "/games/{game}/questions"),
+    Route("get question", "GET", "/games/{game}/questions/1", open_question=True),
+    Route("ask", "POST", "/games/{game}/questions/ask"),
+    Route("ask again", "POST", "/games/{game}/questions/ask", open_question=True),
+    Route(
+        "answer",
+        "POST",
+        "/games/{game}/questions/answer",
+        body={"choice": 1},
+        open_question=True,
+    ),
+]
+
+
+@dataclass
+class Result:
+    route: str
+    games: int
+    questions: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    calls: Dict[str, float]
+    peak_kib: float
+    errors: int
+
+
+def measure(
+    route: Route,
+    games: int,
+    questions: int,
+    iterations: int,
+    alloc_iterations: int,
+    latency: float,
+) -> Result:
+    gateway = MemoryGateway()
+    service = SlowGameService(latency)
+    api.gateway, api.service, api.prefetcher = gateway, service, None
+    # keep metrics out of the output and the latencies
+    api.identity.metrics = None
+
+    # the player's other games, making up the history
+    for age in range(1, games):
+        seed_game(gateway, questions, age=age)
+
+    history = set(gateway.games)
+
+    def sample(traced: bool) -> Tuple[float, bool, Counter]:
+        """Latency, or peak memory when traced, of a request on a fresh game."""
+        game = seed_game(gateway, questions, route.open_question)
+        payload = event(route.method, route.path.format(game=game.game_id), route.body)
+        gateway.calls.clear()
+
+        if traced:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            failed = invoke(payload)
+            value = tracemalloc.get_traced_memory()[1] - baseline
+        else:
+            start = time.perf_counter()
+            failed = invoke(payload)
+            value = time.perf_counter() - start
+
+        # drop the request's game and any game it started
+        for key in set(gateway.games) - history:
+            del gateway.games[key]
+
+        return value, failed, Counter(gateway.calls)
+
+    timings, calls, errors = [], Counter(), 0
+    for _ in range(iterations):
+        elapsed, failed, request_calls = sample(traced=False)
+        timings.append(elapsed)
+        calls.update(request_calls)
+        errors += failed
+
+    tracemalloc.start()
+    try:
+        peaks = [sample(traced=True)[0] for _ in range(alloc_iterations)]
+    finally:
+        tracemalloc.stop()
+
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+
+    return Result(
+        route=route.name,
+        games=games,
+        questions=questions,
+        p50_ms=cuts[49] * 1e3,
+        p95_ms=cuts[94] * 1e3,
+        p99_ms=cuts[98] * 1e3,
+        calls=dict((name, count / iterations) for name, count in calls.items()),
+        peak_kib=max(peaks, default=0) / 1024,
+        errors=errors,
+    )
+
+
+def report(results: List[Result]):
+    print(
+        f"{'route':<15} {'games':>5} {'qs':>3} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'p99 ms':>8} {'peak KiB':>9} {'errors':>6}  gateway calls per request"
+    )
+
+    for r in results:
+        calls = ", ".join(
+            f"{name} {count:g}" for name, count in sorted(r.calls.items())
+        )
+        print(
+            f"{r.route:<15} {r.games:>5} {r.questions:>3} {r.p50_ms:>8.2f} "
+            f"{r.p95_ms:>8.2f} {r.p99_ms:>8.2f} {r.peak_kib:>9.1f} {r.errors:>6}  "
+            f"{calls}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--games", type=int, nargs="+", default=[1, 20, 200])
+    parser.add_argument("--questions", type=int, nargs="+", default=[0, 7, 14])
+    parser.add_argument("--routes", nargs="+", default=[r.name for r in ROUTES])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--alloc-iterations", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=10)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = [
+        measure(
+            route,
+            games,
+            questions,
+            args.iterations,
+            args.alloc_iterations,
+            args.latency_ms / 1e3,
+        )
+        for route in ROUTES
+        if route.name in args.routes
+        for games in args.games
+        for questions in args.questions
+    ]
+
+    report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
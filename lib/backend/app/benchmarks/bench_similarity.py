@@ -0,0 +1,81 @@
+"""Insert and query cost of the near-duplicate question index.
+
+Usage::
+
+    python -m benchmarks.bench_similarity --sizes 10000 100000 1000000
+
+MinHash signatures are computed for a sample of synthetic prompts to time
+hashing on its own; the index itself is filled with signatures derived from
+random perturbations of those, so large sizes do not spend minutes hashing.
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+from app.similarity import LSHIndex, MinHash
+
+
+WORDS = (
+    "which what when where who year battle king queen empire river city war "
+    "treaty painter novel planet moon element composer symphony century army "
+    "revolution island mountain bridge invention language capital dynasty"
+).split()
+
+
+def synthetic_prompt(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))) + "?"
+
+
+def perturbed(rng: random.Random, signature, changes: int = 32):
+    signature = list(signature)
+
+    for index in rng.sample(range(len(signature)), changes):
+        signature[index] = rng.getrandbits(32)
+
+    return tuple(signature)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=1_000)
+    parser.add_argument("--sample", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    minhash = MinHash()
+    prompts = [synthetic_prompt(rng) for _ in range(args.sample)]
+
+    start = time.perf_counter()
+    base = [minhash.signature(prompt) for prompt in prompts]
+    elapsed = time.perf_counter() - start
+    print(f"signature: {1e6 * elapsed / len(prompts):.1f} us/prompt")
+
+    for size in args.sizes:
+        signatures = [perturbed(rng, rng.choice(base)) for _ in range(size)]
+        queries = [perturbed(rng, rng.choice(base)) for _ in range(args.queries)]
+        index = LSHIndex()
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        for key, signature in enumerate(signatures):
+            index.add(key, signature)
+        insert = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for signature in queries:
+            index.query(signature)
+        query = time.perf_counter() - start
+
+        print(
+            f"size {size:>9,}: insert {1e6 * insert / size:7.1f} us/item, "
+            f"query {1e3 * query / len(queries):8.2f} ms/query, "
+            f"index {peak / 2**20:8.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Cold start import budget of the Lambda handler.
+
+Usage::
+
+    python benchmarks/importtime.py --budget-ms 800
+
+Imports ``app`` in a fresh interpreter with ``python -X importtime``, reports
+the slowest top-level imports and fails when the cumulative import time is
+over budget, or when a module that should only load on first use, such as
+the LLM stack, is imported eagerly.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+
+LAZY_MODULES = ("auth0", "langchain", "openai", "tiktoken")
+
+
+def importtime(module: str) -> List[Tuple[int, int, str]]:
+    """``(self_us, cumulative_us, name)`` of every import, in import order."""
+    env = dict(
+        os.environ, AWS_DEFAULT_REGION=os.getenv("AWS_DEFAULT_REGION", "eu-west-1")
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    imports = []
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        imports.append((int(self_us), int(cumulative_us), name.rstrip()))
+
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--budget-ms", type=float, default=800)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # the first run also compiles bytecode, keep the best of the others
+    importtime(args.module)
+    runs = [importtime(args.module) for _ in range(args.runs)]
+    imports = min(
+        runs, key=lambda run: next(c for _, c, n in run if n.strip() == args.module)
+    )
+
+    packages: Dict[str, int] = {}
+    for self_us, _, name in imports:
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    print(f"{'self [ms]':>10}  package")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[
+        : args.top
+    ]:
+        print(f"{self_us / 1000:10.1f}  {package}")
+
+    elapsed_ms = next(c for _, c, n in imports if n.strip() == args.module) / 1000
+    eager = sorted(
+        set(
+            name.strip()
+            for _, _, name in imports
+            if name.strip().split(".")[0] in LAZY_MODULES
+        )
+    )
+    print(f"\nimport {args.module}: {elapsed_ms:.1f} ms, budget {args.budget_ms} ms")
+
+    if eager:
+        print(f"eagerly imported: {', '.join(eager)}")
+        sys.exit(1)
+
+    if elapsed_ms > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
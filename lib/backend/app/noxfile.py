@@ -2,13 +2,13 @@ import nox
 from nox_poetry import session
 
 
-nox.options.sessions = "lint", "tests"
+nox.options.sessions = "lint", "tests", "importtime"
 
 
 @session(python=["3.10"])
 def tests(session):
     #session.install(".", "pytest", poetry_groups=["dev"])
-    session.install("pytest", "pytest-cov", "coverage[toml]", "pytest-env", "boto3", ".")
+    session.install("pytest", "pytest-cov", "coverage[toml]", "pytest-env", "boto3", "moto[dynamodb]", ".")
     session.run("pytest", "--cov")
 
 
@@ -19,7 +19,19 @@ def lint(session):
     session.run("flake8", "app", "tests")
 
 
+@session(python=["3.10"])
+def importtime(session):
+    session.install(".")
+    session.run("python", "benchmarks/importtime.py", "--budget-ms", "800")
+
+
 @session(python=["3.10"])
 def black(session):
     session.install("black")
     session.run("black", "app", "tests")
+
+
+@session(python=["3.10"])
+def benchmarks(session):
+    session.install(".")
+    session.run("python", "-m", "benchmarks.bench_routes", *session.posargs)
@@ -0,0 +1,39 @@
+import json
+from typing import Any, List, Optional
+
+from langchain.callbacks.manager import CallbackManagerForLLMRun
+from langchain.chat_models.base import SimpleChatModel
+from langchain.schema import BaseMessage
+
+
+OUTPUT = (
+    "```json\n"
+    + json.dumps(
+        {
+            "prompt": 'Who said "I came, I saw"?',
+            "options": ["Caesar", "Napoléon", "Cicero"],
+            "solution": 1,
+            "clarification": "Veni, vidi, vici {sic}",
+        }
+    )
+    + "\n```"
+)
+
+
+class FakeChatModel(SimpleChatModel):
+    """Chat model replying with a fixed text."""
+
+    output: str
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _call(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        return self.output
@@ -0,0 +1,57 @@
+from app.game import Game
+from app.game_service import DedupGameService, DuplicateFilter
+from app.game_service.base import BaseGameService
+from app.question import Question
+
+
+class ScriptedGameService(BaseGameService):
+    def __init__(self, prompts):
+        self.prompts = list(prompts)
+        self.calls = 0
+
+    def generate_question(self, game: Game) -> Question:
+        self.calls += 1
+        return Question.create(self.prompts.pop(0), ["yes", "no"], "", 1)
+
+
+class TestDedupGameService:
+    def test_regenerate_duplicate(self):
+        inner = ScriptedGameService(
+            [
+                "In which year did Napoleon crown himself emperor?",
+                "In what year did Napoleon crown himself emperor?",
+                "Where was Napoleon exiled in 1814?",
+            ]
+        )
+        service = DedupGameService(inner)
+        game = Game.create(keywords=["Napoleon"], questions_limit=3)
+
+        game.quiz(service).answer(1)
+        question = game.quiz(service)
+
+        assert question.prompt == "Where was Napoleon exiled in 1814?"
+        assert inner.calls == 3
+        assert service.counters["rejected"] == 1
+
+    def test_accept_after_max_attempts(self):
+        prompt = "In which year did Napoleon crown himself emperor?"
+        inner = ScriptedGameService([prompt] * 3)
+        service = DedupGameService(inner, max_attempts=2)
+        game = Game.create(keywords=["Napoleon"], questions_limit=3)
+
+        game.quiz(service).answer(1)
+        question = game.quiz(service)
+
+        assert question.prompt == prompt
+        assert inner.calls == 3
+
+    def test_topic_duplicates(self):
+        duplicates = DuplicateFilter(check_topic=True)
+        game1 = Game.create(keywords=["Napoleon"], questions_limit=3)
+        game2 = Game.create(keywords=["napoleon"], questions_limit=3)
+
+        duplicates.accept(game1, "In which year did Napoleon crown himself emperor?")
+
+        assert duplicates.find_duplicate(
+            game2, "In what year did Napoleon crown himself emperor?"
+        )
@@ -0,0 +1,120 @@
+import hashlib
+import json
+
+from langchain.chains import LLMChain
+from langchain.memory import ChatMessageHistory
+from langchain.prompts import ChatPromptTemplate, SystemMessagePromptTemplate
+from tests.game_service.fakes import FakeChatModel, OUTPUT
+
+from app.game import Game
+from app.game_service.memory import BudgetedQuizMemory, GameQuizMemory
+from app.game_service.memory.budget import fingerprint, parse_prompt, select_prompts
+from app.game_service.tokens import count_tokens, PromptTokenLogger
+from app.question import Question
+
+
+def make_prompt(i: int) -> str:
+    words = hashlib.sha1(str(i).encode()).hexdigest()
+    return f"Question {words[:8]} about {words[8:16]} and {words[16:24]}?"
+
+
+def make_history(count: int) -> ChatMessageHistory:
+    history = ChatMessageHistory()
+
+    for i in range(count):
+        history.add_user_message("Generate a new question")
+        history.add_ai_message(json.dumps({"prompt": make_prompt(i)}))
+
+    return history
+
+
+class TestSelectPrompts:
+    def test_all_fit(self):
+        prompts = [make_prompt(i) for i in range(3)]
+
+        assert select_prompts(prompts, budget=1000) == (prompts, [])
+
+    def test_recent_first(self):
+        prompts = [make_prompt(i) for i in range(20)]
+        budget = sum(count_tokens(prompt) + 2 for prompt in prompts[-4:])
+
+        kept, dropped = select_prompts(prompts, budget=budget, recent=4)
+
+        assert kept == prompts[-4:]
+        assert dropped == prompts[:-4]
+
+    def test_dissimilar_before_similar(self):
+        prompts = [
+            "In which year did Napoleon crown himself emperor of France?",
+            "How many moons does the planet Jupiter have?",
+            "In what year did Napoleon crown himself emperor of France?",
+        ]
+        budget = count_tokens(prompts[1]) + count_tokens(prompts[2]) + 4
+
+        kept, dropped = select_prompts(prompts, budget=budget + 1, recent=1)
+
+        assert kept == prompts[1:]
+        assert dropped == prompts[:1]
+
+
+class TestBudgetedQuizMemory:
+    def test_parse_prompt(self):
+        assert parse_prompt(OUTPUT) == 'Who said "I came, I saw"?'
+        assert parse_prompt("not a question") is None
+
+    def test_fingerprint(self):
+        assert fingerprint(
+            ["Where was Napoleon exiled?", "When did Napoleon die?"], max_terms=2
+        ) == ("napoleon, exiled")
+
+    def test_constant_size(self):
+        sizes = []
+
+        for count in [50, 200, 800]:
+            memory = BudgetedQuizMemory(chat_memory=make_history(count), budget=200)
+            questions = memory.load_memory_variables({})["questions"]
+            sizes.append(count_tokens(questions))
+
+            assert f"{count - len(questions.splitlines()) + 1} earlier" in questions
+
+        assert max(sizes) <= 200 + 40
+        assert max(sizes) - min(sizes) < 20
+
+    def test_save_context(self):
+        memory = BudgetedQuizMemory(chat_memory=make_history(0))
+
+        memory.save_context({"input": "Generate a new question"}, {"text": OUTPUT})
+
+        assert memory.load_memory_variables({}) == {
+            "questions": '- Who said "I came, I saw"?'
+        }
+
+
+class TestPromptTokenLogger:
+    def test_counts(self):
+        prompt = ChatPromptTemplate(
+            messages=[SystemMessagePromptTemplate.from_template("{input}")],
+            input_variables=["input"],
+        )
+        tokens = PromptTokenLogger(game_id="1")
+        chain = LLMChain(llm=FakeChatModel(output=OUTPUT), prompt=prompt)
+
+        chain.run(callbacks=[tokens], input="Generate a new question")
+
+        assert tokens.counts == [count_tokens("Generate a new question")]
+
+
+class TestGameQuizMemory:
+    def test_from_game(self):
+        game = Game.create(keywords=["history"], questions_limit=3)
+        game.questions.append(Question.create(make_prompt(1), ["a", "b"], "", 1))
+        game.pending_question = Question.create(make_prompt(2), ["a", "b"], "", 1)
+
+        memory = GameQuizMemory.from_game(game)
+        memory.save_context({"input": "Generate a new question"}, {"text": OUTPUT})
+
+        assert memory.load_memory_variables({}) == {
+            "questions": f"- {make_prompt(1)}\n- {make_prompt(2)}\n"
+            '- Who said "I came, I saw"?'
+        }
+        assert memory.chat_memory.messages == []
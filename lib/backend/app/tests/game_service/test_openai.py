@@ -0,0 +1,64 @@
+from tests.game_service.fakes import FakeChatModel, OUTPUT
+
+from app.cache import LRUCache
+from app.game import Game
+from app.game_service import OpenAIService
+
+
+def make_service(**kwargs) -> OpenAIService:
+    service = OpenAIService(api_key="dummy", **kwargs)
+    service.llm = FakeChatModel(output=OUTPUT)
+
+    return service
+
+
+class TestChainCache:
+    def test_reuse_chain(self):
+        service = make_service()
+        game = Game.create(keywords=["history"], questions_limit=5)
+
+        game.quiz(service).answer(1)
+        chain = service.get_chain(game).chain
+        game.quiz(service).answer(1)
+
+        assert service.get_chain(game).chain is chain
+        assert chain.memory.questions == [q.prompt for q in game.questions]
+        assert service.chain_stats() == {
+            "hits": 3,
+            "misses": 1,
+            "stale": 0,
+            "evictions": 0,
+            "size": 1,
+        }
+
+    def test_stale_chain(self):
+        service = make_service()
+        game = Game.create(keywords=["history"], questions_limit=5)
+
+        game.quiz(service).answer(1)
+        # the game was played elsewhere in the meantime
+        game.questions.append(game.questions[0])
+        game.quiz(service)
+
+        assert service.chain_stats()["stale"] == 1
+        assert len(service.get_chain(game).chain.memory.questions) == 3
+
+    def test_evictions(self):
+        service = make_service(chains=LRUCache(maxsize=1))
+
+        for keywords in ["history", "movies"]:
+            Game.create(keywords=[keywords], questions_limit=5).quiz(service)
+
+        assert service.chain_stats()["evictions"] == 1
+
+
+class TestApiKey:
+    def test_rotated_key(self):
+        keys = ["key1"]
+        service = OpenAIService(api_key=lambda: keys[-1])
+        game = Game.create(keywords=["history"], questions_limit=5)
+
+        keys.append("key2")
+        chain = service.get_chain(game).chain
+
+        assert chain.llm.openai_api_key == "key2"
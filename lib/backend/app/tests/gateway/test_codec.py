@@ -0,0 +1,116 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.game import Game, GameProgress
+from app.gateway.codec import (
+    decode_game,
+    decode_question,
+    decode_question_list,
+    encode_game,
+    encode_question,
+    encode_question_list,
+)
+from app.gateway.dynamo import deserialize, serialize
+from app.question import Question
+
+
+class TestCodec:
+    def test_game(self):
+        game = Game(
+            game_id="1",
+            keywords={"history", "Napoleon"},
+            questions_limit=15,
+            creation_time=datetime.fromtimestamp(1687468904, tz=timezone.utc),
+            questions=[Question.create("What?", ["this", "that"], "", 1)],
+        )
+        game.questions[0].answer(1)
+
+        item = encode_game("player1", game)
+        decoded = decode_game(item)
+
+        assert deserialize(item)["QuestionsLimit"] == 15
+        assert item["Keywords"] == {"SS": ["Napoleon", "history"]}
+        assert decoded.summary == GameProgress(asked=1, answered=1, correct=1)
+        assert (decoded.game_id, decoded.keywords, decoded.creation_time) == (
+            game.game_id,
+            game.keywords,
+            game.creation_time,
+        )
+
+    def test_question(self):
+        question = Question.create("What?", ["this", "that"], "Because", 2)
+        question.pending = True
+
+        item = encode_question("1", 3, question)
+
+        assert item == serialize(
+            {
+                "GameId": "1",
+                "QuestionId": 3,
+                "Prompt": "What?",
+                "Options": ["this", "that"],
+                "Solution": 2,
+                "Clarification": "Because",
+                "Pending": True,
+            }
+        )
+        assert decode_question(item) == question
+
+        question.pending = False
+        question.answer(1)
+
+        assert decode_question(encode_question("1", 3, question)) == question
+
+    def test_projected_question(self):
+        options = ["the river Seine", "the river Thames", "the river Danube"]
+        question = Question.create("Which river?", options, "It flows" * 20, 2)
+        item = encode_question("1", 3, question, compress=True)
+        projected = dict((k, item[k]) for k in ["Prompt", "OptionsZ", "Solution"])
+
+        decoded = decode_question(projected)
+
+        assert decoded.options == options
+        assert decoded.clarification is None
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_question_list(self, compress):
+        questions = [
+            Question.create("What?", ["this", "that"], "Because", 2),
+            Question.create("Which?", ["one", "other"], "", 1),
+        ]
+        questions[0].answer(2)
+        questions[1].pending = True
+
+        item = encode_question_list(questions, compress)
+
+        assert list(item) == ["QuestionsZ" if compress else "Questions"]
+        assert decode_question_list(item) == questions
+
+    def test_compressed_question(self):
+        question = Question.create(
+            "In which year did Napoleon crown himself emperor?",
+            ["1799", "1804", "1812", "1815"],
+            "Napoleon crowned himself emperor of the French in Notre-Dame "
+            "cathedral on 2 December 1804, with the pope in attendance.",
+            2,
+        )
+
+        item = encode_question("1", 3, question, compress=True)
+        decoded = decode_question(item)
+
+        assert "ClarificationZ" in item and "Clarification" not in item
+        # options this short do not shrink
+        assert "Options" in item
+        assert len(item["ClarificationZ"]["B"]) < len(question.clarification)
+        assert "clarification" in decoded._compressed
+        assert decoded == question
+        assert decoded.clarification == question.clarification
+        assert decoded._compressed == {}
+
+    def test_short_text_uncompressed(self):
+        question = Question.create("What?", ["this", "that"], "Because", 2)
+
+        assert encode_question("1", 3, question, compress=True) == encode_question(
+            "1", 3, question
+        )
@@ -1,16 +1,33 @@
 from datetime import datetime, timezone
 
 import boto3
-from botocore.stub import Stubber
+from botocore.stub import ANY, Stubber
 import pytest
 
-from app.game import Game
+from app.game import Game, GameProgress, NoOpenQuestion
 from app.game_service.base import BaseGameService
-from app.gateway import DynamoGateway, NoSuchGame, NoSuchQuestion
+from app.gateway import DynamoGateway, NoSuchGame, NoSuchQuestion, View
+from app.gateway.codec import GAME_ATTRIBUTES
 from app.player import Player
 from app.question import Question
 
 
+ANSWER_QUESTION_1 = {
+    "Update": {
+        "TableName": "DummyQuestionTable",
+        "Key": {
+            "GameId": {"S": "1"},
+            "QuestionId": {"N": "1"},
+        },
+        "UpdateExpression": "SET Choice = :choice",
+        "ConditionExpression": "attribute_not_exists(Choice)",
+        "ExpressionAttributeValues": {
+            ":choice": {"N": "1"},
+        },
+    }
+}
+
+
 class TestDynamoGateway:
     @pytest.fixture
     def example_game(self):
@@ -19,6 +36,7 @@ class TestDynamoGateway:
             keywords=set(["history", "Napoleon"]),
             questions_limit=15,
             creation_time=datetime.fromtimestamp(1687468904, tz=timezone.utc),
+            summary=GameProgress(),
         )
 
         return game
@@ -78,7 +96,7 @@ class TestDynamoGateway:
             expected_params={
                 "TableName": "DummyGameTable",
                 "IndexName": "creation-time-index",
-                "Select": "ALL_PROJECTED_ATTRIBUTES",
+                "ProjectionExpression": GAME_ATTRIBUTES,
                 "KeyConditionExpression": "PlayerId = :player_id",
                 "ExpressionAttributeValues": {
                     ":player_id": {"S": "player1"},
@@ -88,85 +106,107 @@ class TestDynamoGateway:
         )
 
         stubber.add_response(
-            "query",
+            "batch_get_item",
             {
-                "Items": [
-                    {
-                        "GameId": {"S": "1"},
-                        "QuestionId": {"N": "1"},
-                        "Prompt": {"S": "What is this?"},
-                        "Options": {
-                            "L": [
-                                {"S": "this"},
-                                {"S": "that"},
-                            ]
+                "Responses": {
+                    "DummyQuestionTable": [
+                        {
+                            "GameId": {"S": "1"},
+                            "QuestionId": {"N": "2"},
+                            "Prompt": {"S": "What is that?"},
+                            "Options": {
+                                "L": [
+                                    {"S": "this"},
+                                    {"S": "that"},
+                                ]
+                            },
+                            "Solution": {"N": "1"},
+                            "Clarification": {"S": "It's that"},
                         },
-                        "Solution": {"N": "1"},
-                        "Clarification": {"S": "It's this"},
-                    },
-                    {
-                        "GameId": {"S": "1"},
-                        "QuestionId": {"N": "1"},
-                        "Prompt": {"S": "What is that?"},
-                        "Options": {
-                            "L": [
-                                {"S": "this"},
-                                {"S": "that"},
-                            ]
+                        {
+                            "GameId": {"S": "1"},
+                            "QuestionId": {"N": "1"},
+                            "Prompt": {"S": "What is this?"},
+                            "Options": {
+                                "L": [
+                                    {"S": "this"},
+                                    {"S": "that"},
+                                ]
+                            },
+                            "Solution": {"N": "1"},
+                            "Clarification": {"S": "It's this"},
                         },
-                        "Solution": {"N": "1"},
-                        "Clarification": {"S": "It's that"},
-                    },
-                ],
-            },
-            expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
-                "ExpressionAttributeValues": {
-                    ":game_id": {"S": "1"},
+                    ],
                 },
-                "ScanIndexForward": True,
-                "Limit": 15,
             },
-        )
-
-        stubber.add_response(
-            "query",
-            {},
             expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
-                "ExpressionAttributeValues": {
-                    ":game_id": {"S": "2"},
+                "RequestItems": {
+                    "DummyQuestionTable": {
+                        "Keys": [
+                            {
+                                "GameId": {"S": game_id},
+                                "QuestionId": {"N": str(question_id)},
+                            }
+                            for game_id in ["1", "2", "3"]
+                            for question_id in range(1, 16)
+                        ],
+                    },
                 },
-                "ScanIndexForward": True,
-                "Limit": 15,
             },
         )
 
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            player = Player("player1")
+            games = list(gateway.list_player_games(player.player_id))
+
+            assert len(games) == 3
+            assert len(games[0].questions) == 2
+            assert games[0].questions[0].prompt == "What is this?"
+            assert len(games[1].questions) == 0
+            stubber.assert_no_pending_responses()
+
+    def test_list_player_games_without_questions(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
         stubber.add_response(
             "query",
-            {},
+            {
+                "Items": [
+                    {
+                        "PlayerId": {"S": "player1"},
+                        "GameId": {"S": "1"},
+                        "Keywords": {"SS": ["movies"]},
+                        "CreationTime": {"N": "1687468904"},
+                        "QuestionsLimit": {"N": "15"},
+                        "QuestionsAsked": {"N": "3"},
+                        "QuestionsAnswered": {"N": "2"},
+                        "QuestionsCorrect": {"N": "1"},
+                    },
+                ],
+            },
             expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
+                "TableName": "DummyGameTable",
+                "IndexName": "creation-time-index",
+                "ProjectionExpression": GAME_ATTRIBUTES,
+                "KeyConditionExpression": "PlayerId = :player_id",
                 "ExpressionAttributeValues": {
-                    ":game_id": {"S": "3"},
+                    ":player_id": {"S": "player1"},
                 },
-                "ScanIndexForward": True,
-                "Limit": 15,
+                "ScanIndexForward": False,
             },
         )
 
         with stubber:
             gateway = DynamoGateway(client)
 
-            player = Player("player1")
-            games = list(gateway.list_player_games(player.player_id))
+            games = list(gateway.list_player_games("player1", View.SUMMARY))
 
-            assert len(games) == 3
-            assert len(games[0].questions) == 2
-            assert len(games[1].questions) == 0
+            assert len(games) == 1
+            assert games[0].questions == []
+            assert games[0].to_dict()["questions_count"] == 2
             stubber.assert_no_pending_responses()
 
     def test_get_game(self):
@@ -248,6 +288,7 @@ class TestDynamoGateway:
             game = gateway.get_game(player.player_id, "1")
 
             assert len(game.questions) == 2
+            assert all(question.is_stored for question in game.questions)
             stubber.assert_no_pending_responses()
 
     def test_get_game_nonexistent(self):
@@ -275,28 +316,100 @@ class TestDynamoGateway:
 
             stubber.assert_no_pending_responses()
 
-    def test_store_game(self, example_game):
+    def test_get_game_prompts(self):
         client = boto3.client("dynamodb")
         stubber = Stubber(client)
 
         stubber.add_response(
-            "put_item",
-            {},
-            expected_params={
-                "TableName": "DummyGameTable",
+            "get_item",
+            {
                 "Item": {
                     "PlayerId": {"S": "player1"},
                     "GameId": {"S": "1"},
-                    "Keywords": {
-                        "SS": [
-                            "history",
-                            "Napoleon",
-                        ]
-                    },
+                    "Keywords": {"SS": ["movies"]},
                     "CreationTime": {"N": "1687468904"},
                     "QuestionsLimit": {"N": "15"},
                 },
             },
+            expected_params={
+                "TableName": "DummyGameTable",
+                "Key": {
+                    "PlayerId": {"S": "player1"},
+                    "GameId": {"S": "1"},
+                },
+            },
+        )
+
+        stubber.add_response(
+            "query",
+            {
+                "Items": [
+                    {
+                        "GameId": {"S": "1"},
+                        "QuestionId": {"N": "1"},
+                        "Prompt": {"S": "What is this?"},
+                        "Solution": {"N": "1"},
+                        "Choice": {"N": "1"},
+                    },
+                ],
+            },
+            expected_params={
+                "TableName": "DummyQuestionTable",
+                "KeyConditionExpression": "GameId = :game_id",
+                "ExpressionAttributeValues": {
+                    ":game_id": {"S": "1"},
+                },
+                "Limit": 15,
+                "ScanIndexForward": True,
+                "ProjectionExpression": "GameId, QuestionId, PlayerId, Prompt, "
+                "Solution, Choice, Pending",
+            },
+        )
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            # a game without counters loads its prompts, even for a summary
+            game = gateway.get_game("player1", "1", View.SUMMARY)
+
+            assert game.questions[0].prompt == "What is this?"
+            assert game.questions[0].options is None
+            assert game.to_dict()["questions_count"] == 1
+            stubber.assert_no_pending_responses()
+
+    def test_store_game(self, example_game):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "batch_write_item",
+            {},
+            expected_params={
+                "RequestItems": {
+                    "DummyGameTable": [
+                        {
+                            "PutRequest": {
+                                "Item": {
+                                    "PlayerId": {"S": "player1"},
+                                    "GameId": {"S": "1"},
+                                    "Keywords": {
+                                        "SS": [
+                                            "Napoleon",
+                                            "history",
+                                        ]
+                                    },
+                                    "CreationTime": {"N": "1687468904"},
+                                    "QuestionsLimit": {"N": "15"},
+                                    "QuestionsAsked": {"N": "0"},
+                                    "QuestionsAnswered": {"N": "0"},
+                                    "QuestionsCorrect": {"N": "0"},
+                                    "NextQuestionId": {"N": "1"},
+                                },
+                            },
+                        },
+                    ],
+                },
+            },
         )
 
         with stubber:
@@ -316,66 +429,126 @@ class TestDynamoGateway:
         stubber = Stubber(client)
 
         stubber.add_response(
-            "put_item",
+            "batch_write_item",
             {},
             expected_params={
-                "TableName": "DummyGameTable",
-                "Item": {
-                    "PlayerId": {"S": "player1"},
-                    "GameId": {"S": "1"},
-                    "Keywords": {
-                        "SS": [
-                            "history",
-                            "Napoleon",
-                        ]
-                    },
-                    "CreationTime": {"N": "1687468904"},
-                    "QuestionsLimit": {"N": "15"},
+                "RequestItems": {
+                    "DummyGameTable": [
+                        {
+                            "PutRequest": {
+                                "Item": {
+                                    "PlayerId": {"S": "player1"},
+                                    "GameId": {"S": "1"},
+                                    "Keywords": {
+                                        "SS": [
+                                            "Napoleon",
+                                            "history",
+                                        ]
+                                    },
+                                    "CreationTime": {"N": "1687468904"},
+                                    "QuestionsLimit": {"N": "15"},
+                                    "QuestionsAsked": {"N": "2"},
+                                    "QuestionsAnswered": {"N": "1"},
+                                    "QuestionsCorrect": {"N": "1"},
+                                    "NextQuestionId": {"N": "3"},
+                                },
+                            },
+                        },
+                    ],
+                    "DummyQuestionTable": [
+                        {
+                            "PutRequest": {
+                                "Item": {
+                                    "GameId": {"S": "1"},
+                                    "QuestionId": {"N": "1"},
+                                    "PlayerId": {"S": "player1"},
+                                    "Prompt": {"S": ""},
+                                    "Options": {
+                                        "L": [
+                                            {"S": ""},
+                                            {"S": ""},
+                                        ]
+                                    },
+                                    "Solution": {"N": "1"},
+                                    "Choice": {"N": "1"},
+                                    "Clarification": {"S": ""},
+                                },
+                            },
+                        },
+                        {
+                            "PutRequest": {
+                                "Item": {
+                                    "GameId": {"S": "1"},
+                                    "QuestionId": {"N": "2"},
+                                    "PlayerId": {"S": "player1"},
+                                    "Prompt": {"S": ""},
+                                    "Options": {
+                                        "L": [
+                                            {"S": ""},
+                                            {"S": ""},
+                                        ]
+                                    },
+                                    "Solution": {"N": "1"},
+                                    "Clarification": {"S": ""},
+                                },
+                            },
+                        },
+                    ],
                 },
             },
         )
 
-        stubber.add_response(
-            "put_item",
-            {},
-            expected_params={
-                "TableName": "DummyQuestionTable",
-                "Item": {
-                    "GameId": {"S": "1"},
-                    "QuestionId": {"N": "1"},
-                    "Prompt": {"S": ""},
-                    "Options": {
-                        "L": [
-                            {"S": ""},
-                            {"S": ""},
-                        ]
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            player = Player("player1")
+            gateway.store_game(player.player_id, example_game)
+
+            assert all(question.is_stored for question in example_game.questions)
+            stubber.assert_no_pending_responses()
+
+    def test_store_game_batches(self, example_game, example_gameservice):
+        example_game.questions_limit = 30
+        for _ in range(30):
+            example_game.quiz(example_gameservice).answer(1)
+
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        # the game item and the first 24 questions, then the remaining 6
+        stubber.add_response("batch_write_item", {})
+        stubber.add_response("batch_write_item", {})
+
+        with stubber:
+            gateway = DynamoGateway(client, max_workers=1)
+
+            player = Player("player1")
+            gateway.store_game(player.player_id, example_game)
+
+            stubber.assert_no_pending_responses()
+
+    def test_store_game_unprocessed(self, example_game):
+        unprocessed = {
+            "DummyGameTable": [
+                {
+                    "PutRequest": {
+                        "Item": {
+                            "PlayerId": {"S": "player1"},
+                            "GameId": {"S": "1"},
+                        },
                     },
-                    "Solution": {"N": "1"},
-                    "Choice": {"N": "1"},
-                    "Clarification": {"S": ""},
                 },
-            },
-        )
+            ],
+        }
 
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response("batch_write_item", {"UnprocessedItems": unprocessed})
         stubber.add_response(
-            "put_item",
+            "batch_write_item",
             {},
-            expected_params={
-                "TableName": "DummyQuestionTable",
-                "Item": {
-                    "GameId": {"S": "1"},
-                    "QuestionId": {"N": "2"},
-                    "Prompt": {"S": ""},
-                    "Options": {
-                        "L": [
-                            {"S": ""},
-                            {"S": ""},
-                        ]
-                    },
-                    "Solution": {"N": "1"},
-                    "Clarification": {"S": ""},
-                },
-            },
+            expected_params={"RequestItems": unprocessed},
         )
 
         with stubber:
@@ -390,18 +563,60 @@ class TestDynamoGateway:
         client = boto3.client("dynamodb")
         stubber = Stubber(client)
 
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            player = Player("player1")
+            assert gateway.flush(player.player_id, example_game)
+
+            stubber.assert_no_pending_responses()
+
+    def test_update_game_current_unanswered(self, example_game, example_gameservice):
+        example_question = example_game.quiz(example_gameservice)
+        example_question.is_stored = True
+
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            player = Player("player1")
+            assert gateway.flush(player.player_id, example_game)
+
+            stubber.assert_no_pending_responses()
+
+    def test_update_game_current_answered(self, example_game, example_gameservice):
+        example_question = example_game.quiz(example_gameservice)
+        example_question.is_stored = True
+        example_question.answer(1)
+
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
         stubber.add_response(
-            "query",
-            {
-                "Count": 0,
-            },
+            "transact_write_items",
+            {},
             expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
-                "ExpressionAttributeValues": {
-                    ":game_id": {"S": "1"},
-                },
-                "Select": "COUNT",
+                "TransactItems": [
+                    ANSWER_QUESTION_1,
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": {
+                                "PlayerId": {"S": "player1"},
+                                "GameId": {"S": "1"},
+                            },
+                            "UpdateExpression": "ADD QuestionsAsked :asked, "
+                            "QuestionsAnswered :answered, QuestionsCorrect :correct",
+                            "ExpressionAttributeValues": {
+                                ":asked": {"N": "0"},
+                                ":answered": {"N": "1"},
+                                ":correct": {"N": "1"},
+                            },
+                        }
+                    },
+                ],
             },
         )
 
@@ -409,28 +624,30 @@ class TestDynamoGateway:
             gateway = DynamoGateway(client)
 
             player = Player("player1")
-            gateway.update_game(player.player_id, example_game)
+            assert gateway.flush(player.player_id, example_game)
+            assert not example_question.is_dirty
+
+            # nothing left to write
+            assert gateway.flush(player.player_id, example_game)
 
             stubber.assert_no_pending_responses()
 
-    def test_update_game_current_unanswered(self, example_game, example_gameservice):
-        example_game.quiz(example_gameservice)
+    def test_update_game_already_answered(self, example_game, example_gameservice):
+        example_question = example_game.quiz(example_gameservice)
+        example_question.is_stored = True
+        example_question.answer(1)
 
         client = boto3.client("dynamodb")
         stubber = Stubber(client)
 
-        stubber.add_response(
-            "query",
-            {
-                "Count": 1,
-            },
-            expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
-                "ExpressionAttributeValues": {
-                    ":game_id": {"S": "1"},
-                },
-                "Select": "COUNT",
+        stubber.add_client_error(
+            "transact_write_items",
+            service_error_code="TransactionCanceledException",
+            modeled_fields={
+                "CancellationReasons": [
+                    {"Code": "ConditionalCheckFailed"},
+                    {"Code": "None"},
+                ],
             },
         )
 
@@ -438,45 +655,126 @@ class TestDynamoGateway:
             gateway = DynamoGateway(client)
 
             player = Player("player1")
-            gateway.update_game(player.player_id, example_game)
+            assert not gateway.flush(player.player_id, example_game)
+            assert example_question.is_dirty
 
             stubber.assert_no_pending_responses()
 
-    def test_update_game_current_answered(self, example_game, example_gameservice):
+    def test_update_game_new_questions(self, example_game, example_gameservice):
         example_question = example_game.quiz(example_gameservice)
+        example_question.is_stored = True
         example_question.answer(1)
+        example_game.quiz(example_gameservice)
 
         client = boto3.client("dynamodb")
         stubber = Stubber(client)
 
         stubber.add_response(
-            "query",
-            {
-                "Count": 1,
-            },
+            "transact_write_items",
+            {},
             expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
-                "ExpressionAttributeValues": {
-                    ":game_id": {"S": "1"},
-                },
-                "Select": "COUNT",
+                "TransactItems": [
+                    ANSWER_QUESTION_1,
+                    {
+                        "Put": {
+                            "TableName": "DummyQuestionTable",
+                            "Item": {
+                                "GameId": {"S": "1"},
+                                "QuestionId": {"N": "2"},
+                                "PlayerId": {"S": "player1"},
+                                "Prompt": {"S": ""},
+                                "Options": {
+                                    "L": [
+                                        {"S": ""},
+                                        {"S": ""},
+                                    ]
+                                },
+                                "Solution": {"N": "1"},
+                                "Clarification": {"S": ""},
+                            },
+                            "ConditionExpression": "attribute_not_exists(QuestionId)",
+                        }
+                    },
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": {
+                                "PlayerId": {"S": "player1"},
+                                "GameId": {"S": "1"},
+                            },
+                            "UpdateExpression": "ADD QuestionsAsked :asked, "
+                            "QuestionsAnswered :answered, QuestionsCorrect :correct "
+                            "SET NextQuestionId = "
+                            "if_not_exists(NextQuestionId, :next) + :allocated",
+                            "ConditionExpression": "(NextQuestionId = :next OR "
+                            "attribute_not_exists(NextQuestionId)) "
+                            "AND :last <= QuestionsLimit",
+                            "ExpressionAttributeValues": {
+                                ":asked": {"N": "1"},
+                                ":answered": {"N": "1"},
+                                ":correct": {"N": "1"},
+                                ":next": {"N": "2"},
+                                ":allocated": {"N": "1"},
+                                ":last": {"N": "2"},
+                            },
+                        }
+                    },
+                ],
             },
         )
 
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            player = Player("player1")
+            assert gateway.flush(player.player_id, example_game)
+
+            stubber.assert_no_pending_responses()
+
+    def test_update_game_reveal_pending(self, example_game):
+        pending = Question.create("", ["", ""], "", 1)
+        pending.pending = True
+        pending.mark_clean()
+        example_game.pending_question = pending
+
+        example_game.quiz(None)
+
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
         stubber.add_response(
-            "update_item",
+            "transact_write_items",
             {},
             expected_params={
-                "TableName": "DummyQuestionTable",
-                "Key": {
-                    "GameId": {"S": "1"},
-                    "QuestionId": {"N": "1"},
-                },
-                "UpdateExpression": "SET Choice = :choice",
-                "ExpressionAttributeValues": {
-                    ":choice": {"N": "1"},
-                },
+                "TransactItems": [
+                    {
+                        "Update": {
+                            "TableName": "DummyQuestionTable",
+                            "Key": {
+                                "GameId": {"S": "1"},
+                                "QuestionId": {"N": "1"},
+                            },
+                            "UpdateExpression": "REMOVE Pending",
+                            "ConditionExpression": "attribute_exists(Pending)",
+                        }
+                    },
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": {
+                                "PlayerId": {"S": "player1"},
+                                "GameId": {"S": "1"},
+                            },
+                            "UpdateExpression": "ADD QuestionsAsked :asked, "
+                            "QuestionsAnswered :answered, QuestionsCorrect :correct",
+                            "ExpressionAttributeValues": {
+                                ":asked": {"N": "1"},
+                                ":answered": {"N": "0"},
+                                ":correct": {"N": "0"},
+                            },
+                        }
+                    },
+                ],
             },
         )
 
@@ -484,12 +782,15 @@ class TestDynamoGateway:
             gateway = DynamoGateway(client)
 
             player = Player("player1")
-            gateway.update_game(player.player_id, example_game)
+            assert gateway.flush(player.player_id, example_game)
 
             stubber.assert_no_pending_responses()
 
-    def test_update_game_new_questions(self, example_game, example_gameservice):
+    def test_update_game_without_counters(self, example_game, example_gameservice):
+        # a game stored before the counters existed, loaded with its questions
+        example_game.summary = None
         example_question = example_game.quiz(example_gameservice)
+        example_question.is_stored = True
         example_question.answer(1)
         example_game.quiz(example_gameservice)
 
@@ -497,44 +798,61 @@ class TestDynamoGateway:
         stubber = Stubber(client)
 
         stubber.add_response(
-            "query",
-            {
-                "Count": 1,
-            },
-            expected_params={
-                "TableName": "DummyQuestionTable",
-                "KeyConditionExpression": "GameId = :game_id",
-                "ExpressionAttributeValues": {
-                    ":game_id": {"S": "1"},
-                },
-                "Select": "COUNT",
-            },
-        )
-
-        stubber.add_response(
-            "update_item",
+            "transact_write_items",
             {},
             expected_params={
-                "TableName": "DummyQuestionTable",
-                "Key": {
-                    "GameId": {"S": "1"},
-                    "QuestionId": {"N": "1"},
-                },
-                "UpdateExpression": "SET Choice = :choice",
-                "ExpressionAttributeValues": {
-                    ":choice": {"N": "1"},
-                },
+                "TransactItems": [
+                    ANSWER_QUESTION_1,
+                    ANY,
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": {
+                                "PlayerId": {"S": "player1"},
+                                "GameId": {"S": "1"},
+                            },
+                            "UpdateExpression": "SET QuestionsAsked = :asked, "
+                            "QuestionsAnswered = :answered, "
+                            "QuestionsCorrect = :correct, "
+                            "NextQuestionId = "
+                            "if_not_exists(NextQuestionId, :next) + :allocated",
+                            "ConditionExpression": "attribute_not_exists("
+                            "QuestionsAsked) AND (NextQuestionId = :next OR "
+                            "attribute_not_exists(NextQuestionId)) "
+                            "AND :last <= QuestionsLimit",
+                            "ExpressionAttributeValues": {
+                                ":asked": {"N": "2"},
+                                ":answered": {"N": "1"},
+                                ":correct": {"N": "1"},
+                                ":next": {"N": "2"},
+                                ":allocated": {"N": "1"},
+                                ":last": {"N": "2"},
+                            },
+                        }
+                    },
+                ],
             },
         )
 
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            assert gateway.flush("player1", example_game)
+
+            stubber.assert_no_pending_responses()
+
+    @pytest.mark.parametrize("owner", ["player1", "player2"])
+    def test_get_game_question(self, owner):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
         stubber.add_response(
-            "put_item",
-            {},
-            expected_params={
-                "TableName": "DummyQuestionTable",
+            "get_item",
+            {
                 "Item": {
                     "GameId": {"S": "1"},
                     "QuestionId": {"N": "2"},
+                    "PlayerId": {"S": owner},
                     "Prompt": {"S": ""},
                     "Options": {
                         "L": [
@@ -543,20 +861,33 @@ class TestDynamoGateway:
                         ]
                     },
                     "Solution": {"N": "1"},
-                    "Clarification": {"S": ""},
                 },
             },
+            expected_params={
+                "TableName": "DummyQuestionTable",
+                "Key": {
+                    "GameId": {"S": "1"},
+                    "QuestionId": {"N": "2"},
+                },
+                "ProjectionExpression": "GameId, QuestionId, PlayerId, Prompt, "
+                "Options, OptionsZ, Solution, Choice, Pending",
+            },
         )
 
         with stubber:
             gateway = DynamoGateway(client)
 
-            player = Player("player1")
-            gateway.update_game(player.player_id, example_game)
+            if owner == "player1":
+                question = gateway.get_game_question("player1", "1", 2, View.RESULTS)
+                assert question.solution == 1
+            else:
+                with pytest.raises(NoSuchQuestion):
+                    gateway.get_game_question("player1", "1", 2, View.RESULTS)
 
             stubber.assert_no_pending_responses()
 
-    def test_get_game_question(self):
+    @pytest.mark.parametrize("owned", [True, False])
+    def test_get_game_question_without_owner(self, owned):
         client = boto3.client("dynamodb")
         stubber = Stubber(client)
 
@@ -567,30 +898,33 @@ class TestDynamoGateway:
                     "GameId": {"S": "1"},
                     "QuestionId": {"N": "2"},
                     "Prompt": {"S": ""},
-                    "Options": {
-                        "L": [
-                            {"S": ""},
-                            {"S": ""},
-                        ]
-                    },
+                    "Options": {"L": [{"S": ""}, {"S": ""}]},
                     "Solution": {"N": "1"},
                     "Clarification": {"S": ""},
                 },
             },
+        )
+        stubber.add_response(
+            "get_item",
+            {"Item": {"GameId": {"S": "1"}}} if owned else {},
             expected_params={
-                "TableName": "DummyQuestionTable",
+                "TableName": "DummyGameTable",
                 "Key": {
+                    "PlayerId": {"S": "player1"},
                     "GameId": {"S": "1"},
-                    "QuestionId": {"N": "2"},
                 },
+                "ProjectionExpression": "GameId",
             },
         )
 
         with stubber:
             gateway = DynamoGateway(client)
 
-            question = gateway.get_game_question("1", 2)
-            assert question.solution == 1
+            if owned:
+                assert gateway.get_game_question("player1", "1", 2).solution == 1
+            else:
+                with pytest.raises(NoSuchQuestion):
+                    gateway.get_game_question("player1", "1", 2)
 
             stubber.assert_no_pending_responses()
 
@@ -614,6 +948,212 @@ class TestDynamoGateway:
             gateway = DynamoGateway(client)
 
             with pytest.raises(NoSuchQuestion):
-                gateway.get_game_question("1", 2)
+                gateway.get_game_question("player1", "1", 2)
+
+            stubber.assert_no_pending_responses()
+
+    def test_answer_question(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+        game_item = {
+            "PlayerId": {"S": "player1"},
+            "GameId": {"S": "1"},
+            "Keywords": {"SS": ["movies"]},
+            "CreationTime": {"N": "1687468904"},
+            "QuestionsLimit": {"N": "15"},
+            "QuestionsAsked": {"N": "1"},
+            "QuestionsAnswered": {"N": "0"},
+            "QuestionsCorrect": {"N": "0"},
+        }
+
+        stubber.add_response(
+            "get_item",
+            {"Item": game_item},
+            expected_params={
+                "TableName": "DummyGameTable",
+                "Key": {
+                    "PlayerId": {"S": "player1"},
+                    "GameId": {"S": "1"},
+                },
+            },
+        )
+        stubber.add_response(
+            "get_item",
+            {
+                "Item": {
+                    "GameId": {"S": "1"},
+                    "QuestionId": {"N": "1"},
+                    "Prompt": {"S": "What is this?"},
+                    "Options": {"L": [{"S": "this"}, {"S": "that"}]},
+                    "Solution": {"N": "1"},
+                    "Clarification": {"S": "It's this"},
+                },
+            },
+            expected_params={
+                "TableName": "DummyQuestionTable",
+                "Key": {
+                    "GameId": {"S": "1"},
+                    "QuestionId": {"N": "1"},
+                },
+            },
+        )
+        stubber.add_response(
+            "transact_write_items",
+            {},
+            expected_params={
+                "TransactItems": [
+                    ANSWER_QUESTION_1,
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": {
+                                "PlayerId": {"S": "player1"},
+                                "GameId": {"S": "1"},
+                            },
+                            "UpdateExpression": "ADD QuestionsAsked :asked, "
+                            "QuestionsAnswered :answered, QuestionsCorrect :correct",
+                            "ExpressionAttributeValues": {
+                                ":asked": {"N": "0"},
+                                ":answered": {"N": "1"},
+                                ":correct": {"N": "1"},
+                            },
+                        }
+                    },
+                ],
+            },
+        )
+        # the answer is already recorded, the retry reads the game alone
+        stubber.add_response(
+            "get_item",
+            {
+                "Item": {
+                    **game_item,
+                    "QuestionsAnswered": {"N": "1"},
+                    "QuestionsCorrect": {"N": "1"},
+                }
+            },
+        )
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            game, feedback = gateway.answer_question("player1", "1", 1)
+
+            assert feedback.result and feedback.clarification == "It's this"
+            assert game.to_dict()["questions_count"] == 1
+            assert game.can_prefetch()
+
+            with pytest.raises(NoOpenQuestion):
+                gateway.answer_question("player1", "1", 1)
+
+            stubber.assert_no_pending_responses()
+
+    def test_answer_question_without_counters(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "get_item",
+            {
+                "Item": {
+                    "PlayerId": {"S": "player1"},
+                    "GameId": {"S": "1"},
+                    "Keywords": {"SS": ["movies"]},
+                    "CreationTime": {"N": "1687468904"},
+                    "QuestionsLimit": {"N": "15"},
+                }
+            },
+        )
+        stubber.add_response(
+            "query",
+            {
+                "Items": [
+                    {
+                        "GameId": {"S": "1"},
+                        "QuestionId": {"N": "1"},
+                        "Prompt": {"S": "What is this?"},
+                        "Solution": {"N": "1"},
+                    },
+                ],
+            },
+        )
+        stubber.add_response(
+            "get_item",
+            {
+                "Item": {
+                    "GameId": {"S": "1"},
+                    "QuestionId": {"N": "1"},
+                    "Prompt": {"S": "What is this?"},
+                    "Options": {"L": [{"S": "this"}, {"S": "that"}]},
+                    "Solution": {"N": "1"},
+                    "Clarification": {"S": "It's this"},
+                },
+            },
+        )
+        stubber.add_response(
+            "transact_write_items",
+            {},
+            expected_params={
+                "TransactItems": [
+                    ANSWER_QUESTION_1,
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": {
+                                "PlayerId": {"S": "player1"},
+                                "GameId": {"S": "1"},
+                            },
+                            # the totals of the game, not just this answer
+                            "UpdateExpression": "SET QuestionsAsked = :asked, "
+                            "QuestionsAnswered = :answered, "
+                            "QuestionsCorrect = :correct",
+                            "ConditionExpression": "attribute_not_exists("
+                            "QuestionsAsked)",
+                            "ExpressionAttributeValues": {
+                                ":asked": {"N": "1"},
+                                ":answered": {"N": "1"},
+                                ":correct": {"N": "1"},
+                            },
+                        }
+                    },
+                ],
+            },
+        )
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            game, feedback = gateway.answer_question("player1", "1", 1)
+
+            assert feedback.result
+            assert game.progress == GameProgress(asked=1, answered=1, correct=1)
+            stubber.assert_no_pending_responses()
+
+    @pytest.mark.parametrize("sequence", [True, False])
+    def test_count_game_questions(self, sequence):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "get_item",
+            {"Item": {"NextQuestionId": {"N": "4"}}} if sequence else {"Item": {}},
+            expected_params={
+                "TableName": "DummyGameTable",
+                "Key": {
+                    "PlayerId": {"S": "player1"},
+                    "GameId": {"S": "1"},
+                },
+                "ProjectionExpression": "NextQuestionId",
+            },
+        )
+
+        if not sequence:
+            stubber.add_response("query", {"Count": 2, "Items": []})
+
+        with stubber:
+            gateway = DynamoGateway(client)
 
+            assert gateway.count_game_questions("player1", "1") == (
+                3 if sequence else 2
+            )
             stubber.assert_no_pending_responses()
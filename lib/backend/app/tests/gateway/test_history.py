@@ -0,0 +1,145 @@
+import boto3
+from botocore.stub import Stubber
+from langchain.schema import AIMessage, HumanMessage
+
+from app.gateway.history import DynamoChatHistory
+
+
+def message_item(seq: int, message_type: str, content: str):
+    return {
+        "SessionId": {"S": "1"},
+        "Seq": {"N": str(seq)},
+        "Type": {"S": message_type},
+        "Content": {"S": content},
+    }
+
+
+WINDOW_QUERY = {
+    "TableName": "DummyHistoryTable",
+    "KeyConditionExpression": "SessionId = :session_id",
+    "ExpressionAttributeValues": {":session_id": {"S": "1"}},
+    "ScanIndexForward": False,
+    "Limit": 2,
+}
+
+
+class TestDynamoChatHistory:
+    def test_messages(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "query",
+            {
+                "Items": [
+                    message_item(8, "ai", "Second"),
+                    message_item(7, "human", "Go"),
+                ]
+            },
+            WINDOW_QUERY,
+        )
+
+        with stubber:
+            history = DynamoChatHistory(
+                session_id="1",
+                history_table="DummyHistoryTable",
+                window=2,
+                client=client,
+            )
+
+            assert history.messages == [
+                HumanMessage(content="Go"),
+                AIMessage(content="Second"),
+            ]
+            # the window is read once per instance
+            assert len(history.messages) == 2
+            stubber.assert_no_pending_responses()
+
+    def test_add_message(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "query", {"Items": [message_item(8, "ai", "Second")]}, WINDOW_QUERY
+        )
+        stubber.add_client_error(
+            "put_item",
+            service_error_code="ConditionalCheckFailedException",
+            expected_params={
+                "TableName": "DummyHistoryTable",
+                "Item": message_item(9, "human", "Go"),
+                "ConditionExpression": "attribute_not_exists(Seq)",
+            },
+        )
+        stubber.add_response(
+            "query",
+            {
+                "Items": [
+                    message_item(9, "human", "Other"),
+                    message_item(8, "ai", "Second"),
+                ]
+            },
+            WINDOW_QUERY,
+        )
+        stubber.add_response(
+            "put_item",
+            {},
+            {
+                "TableName": "DummyHistoryTable",
+                "Item": message_item(10, "human", "Go"),
+                "ConditionExpression": "attribute_not_exists(Seq)",
+            },
+        )
+
+        with stubber:
+            history = DynamoChatHistory(
+                session_id="1",
+                history_table="DummyHistoryTable",
+                window=2,
+                client=client,
+            )
+            history.add_user_message("Go")
+
+            assert history.messages == [
+                HumanMessage(content="Other"),
+                HumanMessage(content="Go"),
+            ]
+            stubber.assert_no_pending_responses()
+
+    def test_clear(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        keys = [{"SessionId": {"S": "1"}, "Seq": {"N": str(seq)}} for seq in [1, 2]]
+        deletes = [{"DeleteRequest": {"Key": key}} for key in keys]
+
+        stubber.add_response(
+            "query",
+            {"Items": keys},
+            {
+                "TableName": "DummyHistoryTable",
+                "KeyConditionExpression": "SessionId = :session_id",
+                "ExpressionAttributeValues": {":session_id": {"S": "1"}},
+                "ProjectionExpression": "SessionId, Seq",
+            },
+        )
+        # the second delete is left unprocessed once
+        stubber.add_response(
+            "batch_write_item",
+            {"UnprocessedItems": {"DummyHistoryTable": deletes[1:]}},
+            {"RequestItems": {"DummyHistoryTable": deletes}},
+        )
+        stubber.add_response(
+            "batch_write_item",
+            {},
+            {"RequestItems": {"DummyHistoryTable": deletes[1:]}},
+        )
+
+        with stubber:
+            history = DynamoChatHistory(
+                session_id="1", history_table="DummyHistoryTable", client=client
+            )
+            history.clear()
+
+            assert history.messages == []
+            stubber.assert_no_pending_responses()
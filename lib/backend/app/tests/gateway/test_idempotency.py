@@ -0,0 +1,117 @@
+import boto3
+from botocore.stub import Stubber
+
+from app.gateway import DynamoIdempotencyStore
+from app.gateway.idempotency import StoredResponse
+
+
+class TestDynamoIdempotencyStore:
+    def test_claim(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        get_params = {
+            "TableName": "DummyIdempotencyTable",
+            "Key": {"IdempotencyKey": {"S": "player1#/games#key"}},
+            "ProjectionExpression": "Fingerprint, ResponseBody, ExpiresAt",
+            "ConsistentRead": True,
+        }
+        put_params = {
+            "TableName": "DummyIdempotencyTable",
+            "Item": {
+                "IdempotencyKey": {"S": "player1#/games#key"},
+                "Fingerprint": {"S": "abc"},
+                "ExpiresAt": {"N": "1060"},
+            },
+            "ConditionExpression": "attribute_not_exists(IdempotencyKey) "
+            "OR ExpiresAt < :now",
+            "ExpressionAttributeValues": {":now": {"N": "1000"}},
+        }
+
+        # missing key, then an expired one
+        for response in [
+            {},
+            {"Item": {"Fingerprint": {"S": "old"}, "ExpiresAt": {"N": "999"}}},
+        ]:
+            stubber.add_response("get_item", response, expected_params=get_params)
+            stubber.add_response("put_item", {}, expected_params=put_params)
+
+        # claimed by a request still in progress, then completed
+        for item in [
+            {"Fingerprint": {"S": "abc"}, "ExpiresAt": {"N": "1060"}},
+            {
+                "Fingerprint": {"S": "abc"},
+                "ResponseBody": {"S": '{"result": true}'},
+                "ExpiresAt": {"N": "87400"},
+            },
+        ]:
+            stubber.add_response("get_item", {"Item": item}, expected_params=get_params)
+
+        # claimed concurrently between the read and the put
+        stubber.add_response("get_item", {}, expected_params=get_params)
+        stubber.add_client_error(
+            "put_item",
+            service_error_code="ConditionalCheckFailedException",
+            expected_params=put_params,
+        )
+        stubber.add_response(
+            "get_item",
+            {"Item": {"Fingerprint": {"S": "def"}, "ExpiresAt": {"N": "1060"}}},
+            expected_params=get_params,
+        )
+
+        with stubber:
+            store = DynamoIdempotencyStore(
+                client, "DummyIdempotencyTable", clock=lambda: 1000
+            )
+
+            assert store.claim("player1#/games#key", "abc", 60) is None
+            assert store.claim("player1#/games#key", "abc", 60) is None
+            assert store.claim("player1#/games#key", "abc", 60) == StoredResponse("abc")
+            assert store.claim("player1#/games#key", "abc", 60) == StoredResponse(
+                "abc", '{"result": true}'
+            )
+            assert store.claim("player1#/games#key", "abc", 60) == StoredResponse("def")
+
+            stubber.assert_no_pending_responses()
+
+    def test_complete_release(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "put_item",
+            {},
+            expected_params={
+                "TableName": "DummyIdempotencyTable",
+                "Item": {
+                    "IdempotencyKey": {"S": "player1#/games#key"},
+                    "Fingerprint": {"S": "abc"},
+                    "ResponseBody": {"S": '{"result": true}'},
+                    "ExpiresAt": {"N": "87400"},
+                },
+            },
+        )
+        stubber.add_response(
+            "delete_item",
+            {},
+            expected_params={
+                "TableName": "DummyIdempotencyTable",
+                "Key": {"IdempotencyKey": {"S": "player1#/games#other"}},
+                "ConditionExpression": "attribute_not_exists(ResponseBody)",
+            },
+        )
+
+        with stubber:
+            store = DynamoIdempotencyStore(
+                client, "DummyIdempotencyTable", clock=lambda: 1000
+            )
+
+            store.complete(
+                "player1#/games#key",
+                StoredResponse("abc", '{"result": true}'),
+                86400,
+            )
+            store.release("player1#/games#other")
+
+            stubber.assert_no_pending_responses()
@@ -0,0 +1,71 @@
+import boto3
+from botocore.stub import Stubber
+
+from app.gateway import DynamoLeaseStore, MemoryLeaseStore
+
+
+class TestMemoryLeaseStore:
+    def test_acquire_release(self):
+        now = [0.0]
+        leases = MemoryLeaseStore(clock=lambda: now[0])
+
+        assert leases.acquire("game", "first", 10)
+        assert not leases.acquire("game", "second", 10)
+
+        leases.release("game", "second")
+        assert not leases.acquire("game", "second", 10)
+
+        now[0] = 11
+        assert leases.acquire("game", "second", 10)
+
+        leases.release("game", "first")
+        assert leases.leases["game"][0] == "second"
+
+
+class TestDynamoLeaseStore:
+    def test_acquire_release(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "put_item",
+            {},
+            expected_params={
+                "TableName": "DummyLeaseTable",
+                "Item": {
+                    "LeaseKey": {"S": "player1#1"},
+                    "Holder": {"S": "first"},
+                    "ExpiresAt": {"N": "1060"},
+                },
+                "ConditionExpression": "attribute_not_exists(LeaseKey) "
+                "OR ExpiresAt < :now",
+                "ExpressionAttributeValues": {":now": {"N": "1000"}},
+            },
+        )
+        stubber.add_client_error(
+            "put_item", service_error_code="ConditionalCheckFailedException"
+        )
+        stubber.add_response(
+            "delete_item",
+            {},
+            expected_params={
+                "TableName": "DummyLeaseTable",
+                "Key": {"LeaseKey": {"S": "player1#1"}},
+                "ConditionExpression": "Holder = :holder",
+                "ExpressionAttributeValues": {":holder": {"S": "first"}},
+            },
+        )
+        stubber.add_client_error(
+            "delete_item", service_error_code="ConditionalCheckFailedException"
+        )
+
+        with stubber:
+            leases = DynamoLeaseStore(client, "DummyLeaseTable", clock=lambda: 1000)
+
+            assert leases.acquire("player1#1", "first", 60)
+            assert not leases.acquire("player1#1", "second", 60)
+
+            leases.release("player1#1", "first")
+            leases.release("player1#1", "first")
+
+            stubber.assert_no_pending_responses()
@@ -0,0 +1,111 @@
+import pytest
+
+from app.game import Game, NoOpenQuestion
+from app.gateway import MemoryGateway, NoSuchGame, NoSuchQuestion, View
+from app.question import Question
+
+
+class TestMemoryGateway:
+    @pytest.fixture
+    def gateway(self):
+        gateway = MemoryGateway()
+        game = Game(
+            game_id="1",
+            keywords={"history"},
+            questions_limit=15,
+            questions=[
+                Question.create("What is this?", ["this", "that"], "It's this", 1),
+                Question.create("What is that?", ["this", "that"], "It's that", 2),
+            ],
+        )
+        game.questions[0].answer(1)
+        gateway.store_game("player1", game)
+
+        return gateway
+
+    def test_get_game_views(self, gateway):
+        summary = gateway.get_game("player1", "1", View.SUMMARY)
+        prompts = gateway.get_game("player1", "1", View.PROMPTS)
+        full = gateway.get_game("player1", "1")
+
+        assert summary.questions == []
+        assert summary.to_dict()["questions_count"] == 1
+        assert prompts.questions[1].prompt == "What is that?"
+        assert prompts.questions[1].options is None
+        assert full.questions[1].clarification == "It's that"
+        assert all(q.is_stored and not q.is_dirty for q in full.questions)
+
+        with pytest.raises(NoSuchGame):
+            gateway.get_game("player2", "1")
+
+    def test_flush_answer(self, gateway):
+        game = gateway.get_game("player1", "1")
+        game.questions[1].answer(2)
+
+        assert gateway.flush("player1", game)
+        assert gateway.get_game_question("player1", "1", 2).choice == 2
+        assert gateway.calls == {
+            "store_game": 1,
+            "get_game": 1,
+            "flush": 1,
+            "get_game_question": 1,
+        }
+
+        with pytest.raises(NoSuchQuestion):
+            gateway.get_game_question("player1", "1", 3)
+
+    def test_flush_conflict(self, gateway):
+        first = gateway.get_game("player1", "1")
+        second = gateway.get_game("player1", "1")
+
+        first.questions[1].answer(1)
+        second.questions[1].answer(2)
+
+        assert gateway.flush("player1", first)
+        assert not gateway.flush("player1", second)
+        assert second.questions[1].is_dirty
+        assert gateway.get_game_question("player1", "1", 2).choice == 1
+
+    def test_pending_question(self, gateway):
+        game = gateway.get_game("player1", "1")
+        game.questions[1].answer(1)
+        gateway.flush("player1", game)
+
+        pending = Question.create("What now?", ["this", "that"], "", 1)
+        pending.pending = True
+
+        assert gateway.store_pending_question("player1", "1", 3, pending)
+        assert not gateway.store_pending_question("player1", "1", 3, pending)
+
+        # a question generated while the pending one was stored loses the slot
+        game.questions.append(Question.create("What else?", ["this", "that"], "", 1))
+        assert not gateway.flush("player1", game)
+
+        game = gateway.get_game("player1", "1")
+        assert game.pending_question.prompt == "What now?"
+        assert game.to_dict()["questions_count"] == 2
+
+    def test_answer_question(self, gateway):
+        game, feedback = gateway.answer_question("player1", "1", 2)
+
+        assert feedback.result and feedback.clarification == "It's that"
+        assert game.can_prefetch()
+
+        with pytest.raises(NoOpenQuestion):
+            gateway.answer_question("player1", "1", 1)
+
+        assert gateway.get_game_question("player1", "1", 2).choice == 2
+
+    def test_questions_limit(self, gateway):
+        game = gateway.get_game("player1", "1")
+        game.questions_limit = 3
+        game.questions[1].answer(1)
+        game.questions.append(Question.create("What now?", ["this", "that"], "", 1))
+        gateway.store_game("player1", game)
+
+        game = gateway.get_game("player1", "1")
+        game.questions[2].answer(1)
+        game.questions.append(Question.create("What else?", ["this", "that"], "", 1))
+
+        assert not gateway.flush("player1", game)
+        assert not gateway.store_pending_question("player1", "1", 4, game.questions[3])
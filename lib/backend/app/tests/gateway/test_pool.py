@@ -0,0 +1,55 @@
+import boto3
+from moto import mock_dynamodb
+import pytest
+
+from app.gateway import DynamoQuestionPool
+from app.question import Question
+
+
+class TestDynamoQuestionPool:
+    @pytest.fixture
+    def pool(self, monkeypatch):
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+
+        with mock_dynamodb():
+            client = boto3.client("dynamodb")
+            client.create_table(
+                TableName="DummyPoolTable",
+                KeySchema=[
+                    {"AttributeName": "Topic", "KeyType": "HASH"},
+                    {"AttributeName": "QuestionId", "KeyType": "RANGE"},
+                ],
+                AttributeDefinitions=[
+                    {"AttributeName": "Topic", "AttributeType": "S"},
+                    {"AttributeName": "QuestionId", "AttributeType": "N"},
+                ],
+                BillingMode="PAY_PER_REQUEST",
+            )
+
+            yield DynamoQuestionPool(client, "DummyPoolTable")
+
+    def test_add_questions(self, pool):
+        questions = [
+            Question.create(f"Pooled {n}?", ["yes", "no"], "Because " * 40, 1)
+            for n in range(3)
+        ]
+
+        assert pool.size("history") == 0
+        assert pool.add_questions("history", questions[:2]) == 2
+        assert pool.add_questions("history", questions[2:]) == 3
+        assert pool.size("history") == 3
+
+        question = pool.get_question("history", 2)
+        assert question.prompt == "Pooled 2?"
+        assert question.options == ["yes", "no"]
+        assert question.clarification == "Because " * 40
+        assert pool.get_question("history", 3) is None
+
+        assert [q.prompt for q in pool.list_questions("history")] == [
+            "Pooled 0?",
+            "Pooled 1?",
+            "Pooled 2?",
+        ]
+        assert pool.list_questions("movies") == []
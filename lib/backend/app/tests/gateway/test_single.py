@@ -0,0 +1,173 @@
+from datetime import datetime, timezone
+
+import boto3
+from botocore.stub import ANY, Stubber
+import pytest
+
+from app.game import Game
+from app.gateway import NoSuchQuestion, SingleItemGateway, View
+from app.gateway.codec import encode_question_list
+from app.question import Question
+
+
+GAME_ITEM = {
+    "PlayerId": {"S": "player1"},
+    "GameId": {"S": "1"},
+    "Keywords": {"SS": ["Napoleon", "history"]},
+    "QuestionsLimit": {"N": "15"},
+    "CreationTime": {"N": "1687468904"},
+    "QuestionsAsked": {"N": "1"},
+    "QuestionsAnswered": {"N": "0"},
+    "QuestionsCorrect": {"N": "0"},
+    "QuestionCount": {"N": "1"},
+}
+
+
+class TestSingleItemGateway:
+    @pytest.fixture
+    def example_question(self):
+        return Question.create("What?", ["this", "that"], "Because", 1)
+
+    def test_store_game(self, example_question):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+        game = Game(
+            game_id="1",
+            keywords=set(["history", "Napoleon"]),
+            questions_limit=15,
+            creation_time=datetime.fromtimestamp(1687468904, tz=timezone.utc),
+            questions=[example_question],
+        )
+
+        stubber.add_response(
+            "put_item",
+            {},
+            {
+                "TableName": "DummyGameTable",
+                "Item": {
+                    **GAME_ITEM,
+                    **encode_question_list([example_question]),
+                },
+            },
+        )
+
+        with stubber:
+            gateway = SingleItemGateway(client)
+            gateway.store_game("player1", game)
+
+        assert example_question.is_stored
+
+    def test_list_player_games(self, example_question):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "query",
+            {"Items": [{**GAME_ITEM, **encode_question_list([example_question])}]},
+            {
+                "TableName": "DummyGameTable",
+                "IndexName": "creation-time-index",
+                "KeyConditionExpression": "PlayerId = :player_id",
+                "ExpressionAttributeValues": {":player_id": {"S": "player1"}},
+                "ScanIndexForward": False,
+                "Select": "ALL_ATTRIBUTES",
+            },
+        )
+
+        with stubber:
+            gateway = SingleItemGateway(client)
+            (game,) = gateway.list_player_games("player1", View.RESULTS)
+
+        assert game.questions[0].prompt == "What?"
+        stubber.assert_no_pending_responses()
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_get_game_answer_flush(self, example_question, compress):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "get_item",
+            {"Item": {**GAME_ITEM, **encode_question_list([example_question])}},
+            {
+                "TableName": "DummyGameTable",
+                "Key": {"PlayerId": {"S": "player1"}, "GameId": {"S": "1"}},
+            },
+        )
+        stubber.add_response(
+            "update_item",
+            {},
+            {
+                "TableName": "DummyGameTable",
+                "Key": {"PlayerId": {"S": "player1"}, "GameId": {"S": "1"}},
+                "UpdateExpression": (
+                    f"SET {'QuestionsZ' if compress else 'Questions'} = :questions, "
+                    "QuestionCount = :count, QuestionsAsked = :asked, "
+                    "QuestionsAnswered = :answered, QuestionsCorrect = :correct "
+                    f"REMOVE {'Questions' if compress else 'QuestionsZ'}"
+                ),
+                "ConditionExpression": ANY,
+                "ExpressionAttributeValues": {
+                    ":questions": ANY,
+                    ":count": {"N": "1"},
+                    ":asked": {"N": "1"},
+                    ":answered": {"N": "1"},
+                    ":correct": {"N": "1"},
+                    ":loaded": {"N": "1"},
+                    ":loaded_answered": {"N": "0"},
+                    ":zero": {"N": "0"},
+                },
+            },
+        )
+
+        with stubber:
+            gateway = SingleItemGateway(client, compress=compress)
+            game = gateway.get_game("player1", "1")
+
+            # nothing changed, nothing written
+            assert gateway.flush("player1", game)
+
+            game.quiz(None).answer(1)
+
+            assert gateway.flush("player1", game)
+            assert not game.questions[0].is_dirty
+            stubber.assert_no_pending_responses()
+
+    def test_flush_conflict(self, example_question):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+        game = Game(game_id="1", keywords=set(["history"]), questions_limit=15)
+        game.questions.append(example_question)
+
+        stubber.add_client_error(
+            "update_item", service_error_code="ConditionalCheckFailedException"
+        )
+
+        with stubber:
+            gateway = SingleItemGateway(client)
+
+            assert not gateway.flush("player1", game)
+            assert not example_question.is_stored
+
+    def test_get_game_question(self, example_question):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response(
+            "get_item",
+            {"Item": encode_question_list([example_question])},
+            {
+                "TableName": "DummyGameTable",
+                "Key": {"PlayerId": {"S": "player1"}, "GameId": {"S": "1"}},
+                "ProjectionExpression": "Questions[1], QuestionsZ",
+            },
+        )
+        stubber.add_response("get_item", {"Item": {}})
+
+        with stubber:
+            gateway = SingleItemGateway(client)
+
+            assert gateway.get_game_question("player1", "1", 2) == example_question
+
+            with pytest.raises(NoSuchQuestion):
+                gateway.get_game_question("player1", "1", 3)
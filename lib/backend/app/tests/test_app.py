@@ -0,0 +1,135 @@
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+from tests.game_service.fakes import FakeChatModel, OUTPUT
+
+import app.app as api
+from app.game import Game
+from app.game_service import DedupGameService, PooledGameService
+from app.gateway import MemoryGateway, MemoryIdempotencyStore
+from app.idempotency import Idempotency
+from app.player import Player
+
+EMAIL = "player@example.com"
+PLAYER_ID = Player.from_email(EMAIL).player_id
+
+CONTEXT = SimpleNamespace(
+    function_name="test",
+    memory_limit_in_mb=128,
+    invoked_function_arn="arn:aws:lambda:eu-west-1:123456789012:function:test",
+    aws_request_id="test",
+)
+
+
+def event(method: str, path: str, body: dict, idempotency_key: str) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {
+            "content-type": "application/json",
+            "idempotency-key": idempotency_key,
+        },
+        "requestContext": {
+            "accountId": "123456789012",
+            "apiId": "test",
+            "authorizer": {"jwt": {"claims": {"email": EMAIL}, "scopes": []}},
+            "domainName": "test.example.com",
+            "domainPrefix": "test",
+            "http": {
+                "method": method,
+                "path": path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "127.0.0.1",
+                "userAgent": "test",
+            },
+            "requestId": "test",
+            "routeKey": "$default",
+            "stage": "$default",
+            "time": "01/Jan/2024:00:00:00 +0000",
+            "timeEpoch": 1704067200000,
+        },
+        "body": json.dumps(body),
+        "isBase64Encoded": False,
+    }
+
+
+class TestIdempotentRoutes:
+    @pytest.fixture
+    def gateway(self, monkeypatch):
+        gateway = MemoryGateway()
+        monkeypatch.setattr(api, "gateway", gateway)
+        return gateway
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        store = MemoryIdempotencyStore()
+        monkeypatch.setattr(api, "idempotency", Idempotency(store))
+        return store
+
+    def test_replay(self, gateway, store):
+        request = event("POST", "/games", {"keywords": ["history"]}, "key")
+
+        first = api.app.resolve(request, CONTEXT)
+        second = api.app.resolve(request, CONTEXT)
+
+        assert first["statusCode"] == second["statusCode"] == 200
+        assert json.loads(first["body"]) == json.loads(second["body"])
+        assert len(list(gateway.list_player_games(PLAYER_ID))) == 1
+
+    def test_key_reused(self, gateway, store):
+        api.app.resolve(
+            event("POST", "/games", {"keywords": ["history"]}, "key"), CONTEXT
+        )
+        response = api.app.resolve(
+            event("POST", "/games", {"keywords": ["science"]}, "key"), CONTEXT
+        )
+
+        assert response["statusCode"] == 422
+        assert json.loads(response["body"])["errors"][0]["field"] == "Idempotency-Key"
+        assert len(list(gateway.list_player_games(PLAYER_ID))) == 1
+
+    def test_key_in_progress(self, gateway, store):
+        request = event("POST", "/games", {"keywords": ["history"]}, "key")
+
+        # claimed by a concurrent request that has not completed yet
+        store.claim(
+            f"{PLAYER_ID}#/games#key",
+            hashlib.sha256(request["body"].encode()).hexdigest(),
+            60,
+        )
+        response = api.app.resolve(request, CONTEXT)
+
+        assert response["statusCode"] == 409
+        assert json.loads(response["body"])["errors"][0]["field"] == "Idempotency-Key"
+        assert list(gateway.list_player_games(PLAYER_ID)) == []
+
+
+class TestBuildService:
+    @pytest.fixture(autouse=True)
+    def secrets(self, monkeypatch):
+        monkeypatch.setattr(api.secrets, "get", lambda name: "dummy")
+
+    def test_topic_duplicates(self, monkeypatch):
+        monkeypatch.delenv("POOL_TABLE", raising=False)
+        service = api.build_service()
+        service.service.llm = FakeChatModel(output=OUTPUT)
+
+        assert isinstance(service, DedupGameService)
+
+        Game.create(keywords=["history"], questions_limit=3).quiz(service)
+        # another game on the topic gets the same question from the LLM
+        Game.create(keywords=["History"], questions_limit=3).quiz(service)
+
+        assert service.counters == {"accepted": 1, "rejected": 3}
+
+    def test_pool_shares_duplicates(self, monkeypatch):
+        monkeypatch.setenv("POOL_TABLE", "DummyPoolTable")
+        service = api.build_service()
+
+        assert isinstance(service, PooledGameService)
+        assert service.duplicates is service.fallback.duplicates
+        assert service.duplicates.check_topic
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 import pytest
 
-from app.game import Game, QuestionsLimitReached
+from app.game import Game, GameProgress, NoOpenQuestion, QuestionsLimitReached
 from app.game_service.base import BaseGameService
 from app.gateway.base import BaseGateway
 from app.question import Question
@@ -97,3 +97,83 @@ class TestGame:
             game.quiz(example_gameservice)
 
         assert len(game.questions) == 2
+
+    def test_progress(
+        self,
+        example_gameservice,
+    ):
+        game = Game.create(
+            keywords=["history", "Napoleon"],
+            questions_limit=2,
+        )
+        question1 = game.quiz(example_gameservice)
+        question1.answer(1)
+        game.quiz(example_gameservice)
+
+        assert game.progress == GameProgress(asked=2, answered=1, correct=1)
+        assert game.questions_answered == 1
+
+    def test_progress_summary(self):
+        game = Game.create(
+            keywords=["history", "Napoleon"],
+            questions_limit=15,
+        )
+        game.summary = GameProgress(asked=4, answered=3, correct=2)
+
+        assert game.progress == game.summary
+        assert game.to_dict()["questions_count"] == 3
+
+    def test_quiz_pending(
+        self,
+        example_gameservice,
+    ):
+        game = Game.create(
+            keywords=["history", "Napoleon"],
+            questions_limit=2,
+        )
+        game.quiz(example_gameservice).answer(1)
+
+        pending = Question.create("Prefetched?", ["yes", "no"], "", 1)
+        pending.pending = True
+        game.pending_question = pending
+
+        question = game.quiz(example_gameservice)
+
+        assert question is pending
+        assert not question.pending
+        assert "pending" in question.changes
+        assert game.pending_question is None
+        assert len(game.questions) == 2
+
+    def test_can_prefetch(
+        self,
+        example_gameservice,
+    ):
+        game = Game.create(
+            keywords=["history", "Napoleon"],
+            questions_limit=2,
+        )
+        assert not game.can_prefetch()
+
+        question = game.quiz(example_gameservice)
+        assert not game.can_prefetch()
+
+        question.answer(1)
+        assert game.can_prefetch()
+        assert not game.can_prefetch(min_answered=2)
+
+        game.quiz(example_gameservice).answer(1)
+        assert not game.can_prefetch()
+
+    def test_open_question(self, example_gameservice):
+        game = Game.create(keywords=["history"], questions_limit=2)
+
+        with pytest.raises(NoOpenQuestion):
+            game.open_question
+
+        question = game.quiz(example_gameservice)
+        assert game.open_question is question
+
+        question.answer(1)
+        with pytest.raises(NoOpenQuestion):
+            game.open_question
@@ -0,0 +1,126 @@
+import hashlib
+import itertools
+import threading
+
+import pytest
+
+from app.game import Game, normalize_keywords
+from app.game_service import PooledGameService
+from app.game_service.base import BaseGameService
+from app.gateway import MemoryQuestionPool
+from app.generator import PoolGenerator
+from app.question import Question
+
+
+class CountingGameService(BaseGameService):
+    def __init__(self, invalid_every: int = 0):
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+        self.invalid_every = invalid_every
+        self.calls = 0
+
+    def generate_question(self, game: Game) -> Question:
+        with self.lock:
+            self.calls += 1
+            n = next(self.counter)
+
+        solution = 3 if self.invalid_every and n % self.invalid_every == 0 else 1
+        prompt = f"What does {hashlib.sha1(str(n).encode()).hexdigest()} mean?"
+        return Question(prompt, ["yes", "no"], "", solution)
+
+
+class TestPoolGenerator:
+    def test_normalize_keywords(self):
+        assert normalize_keywords({"Napoleon", " history "}) == "history,napoleon"
+        assert normalize_keywords(["World  War", "world war"]) == "world war"
+
+    def test_generate(self):
+        pool = MemoryQuestionPool()
+        service = CountingGameService(invalid_every=3)
+        generator = PoolGenerator(
+            service_factory=lambda: service,
+            pool=pool,
+            concurrency=4,
+        )
+
+        questions = generator.generate({"History", "napoleon"}, 10)
+
+        assert len(questions) == 10
+        assert pool.size("history,napoleon") == 10
+        assert all(question.solution == 1 for question in questions)
+        assert len(set(question.prompt for question in questions)) == 10
+
+    def test_generate_again(self):
+        pool = MemoryQuestionPool()
+        PoolGenerator(
+            service_factory=CountingGameService, pool=pool, concurrency=1
+        ).generate({"history"}, 5)
+
+        # a fresh service starts over, repeating the pooled questions first
+        questions = PoolGenerator(
+            service_factory=CountingGameService, pool=pool, concurrency=1
+        ).generate({"history"}, 5)
+
+        assert len(questions) == 5
+        assert pool.size("history") == 10
+        assert len(set(q.prompt for q in pool.list_questions("history"))) == 10
+
+    def test_service_per_worker(self):
+        threads = {}
+        shared = CountingGameService()
+
+        class ThreadBoundGameService(CountingGameService):
+            def __init__(self):
+                super().__init__()
+                # distinct prompts across the workers' services
+                self.counter, self.lock = shared.counter, shared.lock
+
+            def generate_question(self, game: Game) -> Question:
+                assert threads.setdefault(id(self), threading.get_ident()) == (
+                    threading.get_ident()
+                )
+                return super().generate_question(game)
+
+        generator = PoolGenerator(
+            service_factory=ThreadBoundGameService,
+            pool=MemoryQuestionPool(),
+            concurrency=4,
+        )
+
+        assert len(generator.generate({"history"}, 20)) == 20
+        assert 1 <= len(threads) <= 4
+
+
+class TestPooledGameService:
+    @pytest.fixture
+    def example_pool(self):
+        pool = MemoryQuestionPool()
+        pool.add_questions(
+            "history",
+            [Question(f"Pooled {n}?", ["yes", "no"], "", 1) for n in range(3)],
+        )
+
+        return pool
+
+    def test_pool_hit(self, example_pool):
+        fallback = CountingGameService()
+        service = PooledGameService(pool=example_pool, fallback=fallback)
+        game = Game.create(keywords={"History"}, questions_limit=3)
+
+        for _ in range(3):
+            game.quiz(service).answer(1)
+
+        assert fallback.calls == 0
+        assert len(set(question.prompt for question in game.questions)) == 3
+        assert service.counters["pool_hit"] == 3
+
+    def test_pool_miss(self, example_pool):
+        fallback = CountingGameService()
+        service = PooledGameService(pool=example_pool, fallback=fallback)
+        game = Game.create(keywords={"movies"}, questions_limit=3)
+
+        question = game.quiz(service)
+
+        assert question.prompt.startswith("What does")
+        assert fallback.calls == 1
+        assert service.counters["pool_miss"] == 1
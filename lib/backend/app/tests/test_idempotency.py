@@ -0,0 +1,101 @@
+import threading
+
+import pytest
+
+from app.gateway import MemoryIdempotencyStore
+from app.idempotency import (
+    Idempotency,
+    IdempotencyKeyInProgress,
+    IdempotencyKeyReused,
+)
+
+
+class TestIdempotency:
+    @pytest.fixture
+    def clock(self):
+        return [0.0]
+
+    @pytest.fixture
+    def idempotency(self, clock):
+        return Idempotency(MemoryIdempotencyStore(clock=lambda: clock[0]), window=60)
+
+    @pytest.fixture
+    def handler(self):
+        calls = []
+
+        def handler():
+            calls.append(1)
+            return {"game_id": f"game-{len(calls)}"}
+
+        handler.calls = calls
+        return handler
+
+    def test_replay(self, idempotency, handler):
+        first = idempotency.handle("player1#/games#key", '{"keywords": []}', handler)
+        second = idempotency.handle("player1#/games#key", '{"keywords": []}', handler)
+
+        assert first == second == {"game_id": "game-1"}
+        assert len(handler.calls) == 1
+        assert idempotency.counters == {"handled": 1, "replayed": 1}
+
+    def test_window(self, idempotency, handler, clock):
+        idempotency.handle("player1#/games#key", "", handler)
+        clock[0] = 61
+
+        assert idempotency.handle("player1#/games#key", "", handler) == {
+            "game_id": "game-2"
+        }
+
+    def test_failure(self, idempotency, handler):
+        def failing():
+            raise ValueError
+
+        with pytest.raises(ValueError):
+            idempotency.handle("player1#/games#key", "", failing)
+
+        assert idempotency.handle("player1#/games#key", "", handler) == {
+            "game_id": "game-1"
+        }
+
+    def test_key_reused(self, idempotency, handler):
+        idempotency.handle("player1#/games#key", '{"keywords": ["a"]}', handler)
+
+        with pytest.raises(IdempotencyKeyReused):
+            idempotency.handle("player1#/games#key", '{"keywords": ["b"]}', handler)
+
+        assert len(handler.calls) == 1
+
+    def test_in_progress(self, idempotency, handler, clock):
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_handler():
+            started.set()
+            finish.wait()
+            return handler()
+
+        first = threading.Thread(
+            target=idempotency.handle, args=("player1#/games#key", "", slow_handler)
+        )
+        first.start()
+        started.wait()
+
+        # a double tap while the first request is handled
+        with pytest.raises(IdempotencyKeyInProgress):
+            idempotency.handle("player1#/games#key", "", handler)
+
+        finish.set()
+        first.join()
+
+        assert idempotency.handle("player1#/games#key", "", handler) == {
+            "game_id": "game-1"
+        }
+        assert len(handler.calls) == 1
+
+    def test_claim_expired(self, idempotency, handler, clock):
+        # a request that died while handling the key
+        idempotency.store.claim("player1#/games#key", "", idempotency.claim_ttl)
+        clock[0] = idempotency.claim_ttl + 1
+
+        assert idempotency.handle("player1#/games#key", "", handler) == {
+            "game_id": "game-1"
+        }
@@ -0,0 +1,126 @@
+import time
+
+from aws_lambda_powertools import Metrics
+from aws_lambda_powertools.utilities.data_classes import APIGatewayProxyEventV2
+import pytest
+
+from app.cache import LRUCache
+from app.identity import IdentityResolver
+from app.player import Player
+
+
+def make_event(claims, token="token1"):
+    return APIGatewayProxyEventV2(
+        {
+            "headers": {"authorization": f"Bearer {token}"},
+            "requestContext": {
+                "authorizer": {"jwt": {"claims": claims, "scopes": []}},
+            },
+        }
+    )
+
+
+class TestLRUCache:
+    def test_eviction(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert cache.stats.evictions == 1
+
+    def test_expiry(self):
+        now = [0.0]
+        cache = LRUCache(maxsize=2, ttl=10, clock=lambda: now[0])
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+
+        now[0] = 10.0
+        assert cache.get("a") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.expirations == 1
+
+
+class TestIdentityResolver:
+    @pytest.fixture
+    def userinfo_calls(self):
+        return []
+
+    @pytest.fixture
+    def resolver(self, userinfo_calls):
+        def userinfo(domain, token):
+            userinfo_calls.append((domain, token))
+            return {"email": "player@example.com"}
+
+        return IdentityResolver(
+            email_claims=["https://example.com/email", "email"],
+            userinfo=userinfo,
+        )
+
+    def test_resolve_from_claims(self, resolver, userinfo_calls):
+        event = make_event(
+            {
+                "iss": "https://example.eu.auth0.com/",
+                "https://example.com/email": "player@example.com",
+            }
+        )
+
+        player = resolver.resolve(event)
+
+        assert player == Player.from_email("player@example.com")
+        assert userinfo_calls == []
+        assert resolver.counters["claims"] == 1
+
+    def test_resolve_cached(self, resolver, userinfo_calls):
+        event = make_event(
+            {
+                "iss": "https://example.eu.auth0.com/",
+                "exp": str(int(time.time()) + 3600),
+            }
+        )
+
+        player1 = resolver.resolve(event)
+        player2 = resolver.resolve(event)
+
+        assert player1 == player2 == Player.from_email("player@example.com")
+        assert userinfo_calls == [("example.eu.auth0.com", "token1")]
+        assert resolver.counters["cache_miss"] == 1
+        assert resolver.counters["cache_hit"] == 1
+
+    def test_resolve_expired_token(self, resolver, userinfo_calls):
+        event = make_event(
+            {
+                "iss": "https://example.eu.auth0.com/",
+                "exp": str(int(time.time()) - 1),
+            }
+        )
+
+        resolver.resolve(event)
+        resolver.resolve(event)
+
+        assert len(userinfo_calls) == 2
+        assert resolver.counters["cache_miss"] == 2
+
+    def test_metrics(self, resolver):
+        resolver.metrics = Metrics(namespace="Test")
+        resolver.metrics.clear_metrics()
+        event = make_event(
+            {
+                "iss": "https://example.eu.auth0.com/",
+                "exp": str(int(time.time()) + 3600),
+            }
+        )
+
+        resolver.resolve(event)
+        resolver.resolve(event)
+        resolver.resolve(event)
+
+        metric_set = resolver.metrics.metric_set
+        assert metric_set["identity_cache_miss"]["Value"] == [1]
+        assert metric_set["identity_cache_hit"]["Value"] == [1, 1]
+        resolver.metrics.clear_metrics()
@@ -0,0 +1,97 @@
+import boto3
+from botocore.stub import Stubber
+
+from app.gateway import DynamoGateway, SingleItemGateway
+from app.gateway.codec import encode_question, encode_question_list
+from app.migrate import migrate
+from app.question import Question
+
+
+GAME_ITEM = {
+    "PlayerId": {"S": "player1"},
+    "GameId": {"S": "1"},
+    "Keywords": {"SS": ["history"]},
+    "QuestionsLimit": {"N": "15"},
+    "CreationTime": {"N": "1687468904"},
+    "QuestionsAsked": {"N": "1"},
+    "QuestionsAnswered": {"N": "0"},
+    "QuestionsCorrect": {"N": "0"},
+}
+
+
+class TestMigrate:
+    def test_migrate(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+        questions = [
+            Question.create("What?", ["this", "that"], "", 1),
+            Question.create("Which?", ["one", "other"], "", 2),
+        ]
+        questions[1].pending = True
+
+        stubber.add_response(
+            "scan", {"Items": [GAME_ITEM]}, {"TableName": "DummyGameTable"}
+        )
+        stubber.add_response(
+            "batch_get_item",
+            {
+                "Responses": {
+                    "DummyQuestionTable": [
+                        encode_question("1", i + 1, q) for i, q in enumerate(questions)
+                    ]
+                }
+            },
+            {
+                "RequestItems": {
+                    "DummyQuestionTable": {
+                        "Keys": [
+                            {"GameId": {"S": "1"}, "QuestionId": {"N": "1"}},
+                            {"GameId": {"S": "1"}, "QuestionId": {"N": "2"}},
+                        ]
+                    }
+                }
+            },
+        )
+        stubber.add_response(
+            "put_item",
+            {},
+            {
+                "TableName": "DummyGameTable",
+                "Item": {
+                    **GAME_ITEM,
+                    **encode_question_list(questions, compress=True),
+                    "QuestionCount": {"N": "2"},
+                },
+                "ConditionExpression": "attribute_not_exists(QuestionCount)",
+            },
+        )
+
+        with stubber:
+            migrated = migrate(
+                DynamoGateway(client),
+                SingleItemGateway(client, compress=True),
+            )
+
+        assert migrated == 1
+        stubber.assert_no_pending_responses()
+
+    def test_migrate_again(self):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+        migrated_item = {**GAME_ITEM, "GameId": {"S": "2"}, "QuestionCount": {"N": "0"}}
+
+        stubber.add_response("scan", {"Items": [GAME_ITEM, migrated_item]})
+        stubber.add_response("batch_get_item", {"Responses": {}})
+        # the API wrote the game in the new layout after the scan
+        stubber.add_client_error(
+            "put_item", service_error_code="ConditionalCheckFailedException"
+        )
+
+        with stubber:
+            migrated = migrate(
+                DynamoGateway(client),
+                SingleItemGateway(client, compress=True),
+            )
+
+        assert migrated == 0
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,141 @@
+import boto3
+from botocore.stub import ANY, Stubber
+import pytest
+
+from app.game import Game
+from app.game_service.base import BaseGameService
+from app.gateway import DynamoGateway
+from app.prefetch import prefetch_question
+from app.question import Question
+
+
+GAME_ITEM = {
+    "PlayerId": {"S": "player1"},
+    "GameId": {"S": "1"},
+    "Keywords": {"SS": ["history"]},
+    "CreationTime": {"N": "1687468904"},
+    "QuestionsLimit": {"N": "15"},
+    "QuestionsAsked": {"N": "1"},
+    "QuestionsAnswered": {"N": "1"},
+    "QuestionsCorrect": {"N": "1"},
+}
+
+ANSWERED_QUESTION_ITEM = {
+    "GameId": {"S": "1"},
+    "QuestionId": {"N": "1"},
+    "Prompt": {"S": "What is this?"},
+    "Options": {"L": [{"S": "this"}, {"S": "that"}]},
+    "Solution": {"N": "1"},
+    "Choice": {"N": "1"},
+    "Clarification": {"S": "It's this"},
+}
+
+
+class TestPrefetch:
+    @pytest.fixture
+    def example_gameservice(self):
+        class DummyGameService(BaseGameService):
+            calls = 0
+
+            def generate_question(self, game: Game) -> Question:
+                self.calls += 1
+                return Question.create("What is that?", ["this", "that"], "", 2)
+
+        return DummyGameService()
+
+    def test_prefetch(self, example_gameservice):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response("get_item", {"Item": GAME_ITEM})
+        stubber.add_response("query", {"Items": [ANSWERED_QUESTION_ITEM]})
+        stubber.add_response(
+            "transact_write_items",
+            {},
+            expected_params={
+                "TransactItems": [
+                    {
+                        "Put": {
+                            "TableName": "DummyQuestionTable",
+                            "Item": ANY,
+                            "ConditionExpression": "attribute_not_exists(QuestionId)",
+                        }
+                    },
+                    {
+                        "Update": {
+                            "TableName": "DummyGameTable",
+                            "Key": ANY,
+                            "UpdateExpression": ANY,
+                            "ConditionExpression": "(NextQuestionId = :next OR "
+                            "attribute_not_exists(NextQuestionId)) "
+                            "AND :last <= QuestionsLimit",
+                            "ExpressionAttributeValues": ANY,
+                        }
+                    },
+                ]
+            },
+        )
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            question = prefetch_question(gateway, example_gameservice, "player1", "1")
+
+            assert question.pending
+            assert question.is_stored
+            assert example_gameservice.calls == 1
+            stubber.assert_no_pending_responses()
+
+    def test_prefetch_lost_race(self, example_gameservice):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response("get_item", {"Item": GAME_ITEM})
+        stubber.add_response("query", {"Items": [ANSWERED_QUESTION_ITEM]})
+        stubber.add_client_error(
+            "transact_write_items",
+            service_error_code="TransactionCanceledException",
+            modeled_fields={
+                "CancellationReasons": [{"Code": "ConditionalCheckFailed"}],
+            },
+        )
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            assert (
+                prefetch_question(gateway, example_gameservice, "player1", "1") is None
+            )
+            stubber.assert_no_pending_responses()
+
+    def test_prefetch_already_pending(self, example_gameservice):
+        client = boto3.client("dynamodb")
+        stubber = Stubber(client)
+
+        stubber.add_response("get_item", {"Item": GAME_ITEM})
+        stubber.add_response(
+            "query",
+            {
+                "Items": [
+                    ANSWERED_QUESTION_ITEM,
+                    {
+                        "GameId": {"S": "1"},
+                        "QuestionId": {"N": "2"},
+                        "Prompt": {"S": "What is that?"},
+                        "Options": {"L": [{"S": "this"}, {"S": "that"}]},
+                        "Solution": {"N": "2"},
+                        "Clarification": {"S": "It's that"},
+                        "Pending": {"BOOL": True},
+                    },
+                ]
+            },
+        )
+
+        with stubber:
+            gateway = DynamoGateway(client)
+
+            assert (
+                prefetch_question(gateway, example_gameservice, "player1", "1") is None
+            )
+            assert example_gameservice.calls == 0
+            stubber.assert_no_pending_responses()
@@ -0,0 +1,82 @@
+import boto3
+from botocore.stub import Stubber
+
+from app.secrets_provider import SecretsProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSecretsProvider:
+    def make_provider(self, values):
+        client = boto3.client("secretsmanager")
+        stubber = Stubber(client)
+
+        for value in values:
+            if isinstance(value, str):
+                stubber.add_response(
+                    "get_secret_value",
+                    {"SecretString": value},
+                    {"SecretId": "openai"},
+                )
+            else:
+                stubber.add_client_error("get_secret_value", "InternalServiceError")
+
+        refreshes = []
+        clock = FakeClock()
+        provider = SecretsProvider(
+            client=client, ttl=60, clock=clock, spawn=refreshes.append
+        )
+
+        return provider, stubber, clock, refreshes
+
+    def test_cached(self):
+        provider, stubber, clock, refreshes = self.make_provider(["key1"])
+
+        with stubber:
+            assert provider.get("openai") == "key1"
+            clock.now = 59
+            assert provider.get("openai") == "key1"
+
+        assert refreshes == []
+        stubber.assert_no_pending_responses()
+
+    def test_stale_while_revalidate(self):
+        provider, stubber, clock, refreshes = self.make_provider(["key1", "key2"])
+
+        with stubber:
+            provider.get("openai")
+            clock.now = 61
+
+            # stale values are served while a single refresh is scheduled
+            assert provider.get("openai") == "key1"
+            assert provider.get("openai") == "key1"
+            assert len(refreshes) == 1
+
+            refreshes.pop()()
+
+            assert provider.get("openai") == "key2"
+            assert refreshes == []
+
+        stubber.assert_no_pending_responses()
+
+    def test_failed_refresh(self):
+        provider, stubber, clock, refreshes = self.make_provider(["key1", None, "key2"])
+
+        with stubber:
+            provider.get("openai")
+            clock.now = 61
+
+            provider.get("openai")
+            refreshes.pop()()
+            assert provider.get("openai") == "key1"
+
+            refreshes.pop()()
+            assert provider.get("openai") == "key2"
+
+        stubber.assert_no_pending_responses()
@@ -0,0 +1,29 @@
+from app.similarity import LSHIndex, MinHash
+
+
+class TestSimilarity:
+    def test_signature_similarity(self):
+        minhash = MinHash()
+
+        original = minhash.signature("In which year did Napoleon crown himself?")
+        rephrased = minhash.signature("In what year did Napoleon crown himself?")
+        unrelated = minhash.signature("How many moons does Jupiter have?")
+
+        assert minhash.signature("in which YEAR did napoleon crown himself") == original
+        assert MinHash.similarity(original, rephrased) > 0.6
+        assert MinHash.similarity(original, unrelated) < 0.2
+
+    def test_index(self):
+        minhash = MinHash()
+        index = LSHIndex()
+
+        index.add(1, minhash.signature("In which year did Napoleon crown himself?"))
+        index.add(2, minhash.signature("How many moons does Jupiter have?"))
+
+        matches = index.query(
+            minhash.signature("In what year did Napoleon crown himself?")
+        )
+
+        assert [key for key, _ in matches] == [1]
+        assert index.query(minhash.signature("Who painted the Mona Lisa?")) == []
+        assert len(index) == 2
@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+import pytest
+
+from app.game import Game
+from app.game_service.base import BaseGameService
+from app.gateway import MemoryGateway, MemoryLeaseStore, View
+from app.prefetch import prefetch_question
+from app.question import Question
+from app.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    @pytest.fixture
+    def gateway(self):
+        gateway = MemoryGateway()
+        game = Game(
+            game_id="1",
+            keywords={"history"},
+            questions_limit=15,
+            questions=[Question.create("What is this?", ["this", "that"], "", 1)],
+        )
+        game.questions[0].answer(1)
+        gateway.store_game("player1", game)
+
+        return gateway
+
+    @pytest.fixture
+    def slow_gameservice(self):
+        class SlowGameService(BaseGameService):
+            def __init__(self):
+                self.calls = 0
+                self._lock = threading.Lock()
+
+            def generate_question(self, game: Game) -> Question:
+                with self._lock:
+                    self.calls += 1
+                    prompt = f"Question {self.calls}?"
+
+                time.sleep(0.2)
+                return Question.create(prompt, ["this", "that"], "", 1)
+
+        return SlowGameService()
+
+    def test_parallel_asks(self, gateway, slow_gameservice):
+        single_flight = SingleFlight(MemoryLeaseStore(), poll_interval=0.01)
+        asks = 10
+        barrier = threading.Barrier(asks)
+
+        def ask(_) -> str:
+            barrier.wait()
+            game = gateway.get_game("player1", "1", View.RESULTS)
+
+            with single_flight.generation(
+                gateway, "player1", game, View.RESULTS
+            ) as game:
+                question = game.quiz(slow_gameservice)
+                assert gateway.flush("player1", game)
+
+            return question.prompt
+
+        with ThreadPoolExecutor(max_workers=asks) as executor:
+            prompts = list(executor.map(ask, range(asks)))
+
+        assert slow_gameservice.calls == 1
+        assert prompts == ["Question 1?"] * asks
+        assert gateway.count_game_questions("player1", "1") == 2
+        assert single_flight.counters == {"generated": 1, "reused": asks - 1}
+        # each waiter loaded the game once more, after the question was stored
+        assert gateway.calls["get_game"] <= 2 * asks - 1
+
+    def test_expired_lease(self, gateway, slow_gameservice):
+        now = [0.0]
+        leases = MemoryLeaseStore(clock=lambda: now[0])
+
+        def sleep(seconds: float):
+            now[0] += seconds
+
+        single_flight = SingleFlight(leases, sleep=sleep, clock=lambda: now[0])
+        leases.acquire("player1#1", "crashed", single_flight.ttl)
+        game = gateway.get_game("player1", "1")
+        gateway.calls.clear()
+
+        with single_flight.generation(gateway, "player1", game) as game:
+            game.quiz(slow_gameservice)
+            assert gateway.flush("player1", game)
+
+        assert slow_gameservice.calls == 1
+        assert single_flight.counters == {"generated": 1}
+        assert leases.leases == {}
+        # waiting only polled the question count
+        assert gateway.calls["get_game"] == 0
+
+    def test_question_to_serve(self, gateway, slow_gameservice):
+        leases = MemoryLeaseStore()
+        single_flight = SingleFlight(leases)
+        game = gateway.get_game("player1", "1")
+        game.quiz(slow_gameservice)
+        gateway.flush("player1", game)
+
+        with single_flight.generation(gateway, "player1", game) as served:
+            assert served is game
+            assert leases.leases == {}
+
+    def test_ask_during_prefetch(self, gateway, slow_gameservice):
+        single_flight = SingleFlight(MemoryLeaseStore(), poll_interval=0.01)
+        prefetch = threading.Thread(
+            target=prefetch_question,
+            args=(gateway, slow_gameservice, "player1", "1", 1, single_flight),
+        )
+        prefetch.start()
+
+        # the player asks while the question is being prefetched
+        while slow_gameservice.calls == 0:
+            time.sleep(0.01)
+
+        game = gateway.get_game("player1", "1", View.RESULTS)
+        with single_flight.generation(gateway, "player1", game, View.RESULTS) as game:
+            question = game.quiz(slow_gameservice)
+            assert gateway.flush("player1", game)
+
+        prefetch.join()
+
+        assert slow_gameservice.calls == 1
+        assert question.prompt == "Question 1?"
+        assert single_flight.counters == {"generated": 1, "reused": 1}
+
+    def test_prefetch_during_ask(self, gateway, slow_gameservice):
+        leases = MemoryLeaseStore()
+        single_flight = SingleFlight(leases)
+        leases.acquire("player1#1", "ask", single_flight.ttl)
+
+        assert (
+            prefetch_question(
+                gateway, slow_gameservice, "player1", "1", 1, single_flight
+            )
+            is None
+        )
+        assert slow_gameservice.calls == 0
+        assert single_flight.counters == {"skipped": 1}
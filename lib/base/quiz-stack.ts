@@ -23,7 +23,11 @@ export class QuizStack extends cdk.Stack {
 
     const quizApi = new Api(this, 'QuizApi', {
       gameTable: data.gameTable,
+      historyTable: chatMemory.historyTable,
+      idempotencyTable: data.idempotencyTable,
+      leaseTable: data.leaseTable,
       memoryTable: chatMemory.memoryTable,
+      poolTable: data.poolTable,
       questionTable: data.questionTable,
     });
 
@@ -1,4 +1,6 @@
 export class Auth0Settings {
   static readonly AUDIENCE_URL = "https://auth0-jwt-authorizer"
   static readonly ISSUER_URL = "https://dev-o5gx50q8iijtjzk5.eu.auth0.com/"
+  // custom claims added to access tokens by an Auth0 action must be namespaced
+  static readonly EMAIL_CLAIM = "https://auth0-jwt-authorizer/email"
 }
@@ -9,6 +9,9 @@ interface DataProps {
 export class Data extends Construct {
   public readonly gameTable: dynamodb.Table;
   public readonly questionTable: dynamodb.Table;
+  public readonly poolTable: dynamodb.Table;
+  public readonly leaseTable: dynamodb.Table;
+  public readonly idempotencyTable: dynamodb.Table;
 
   constructor(scope: Construct, id: string, props: DataProps) {
     super(scope, id);
@@ -49,7 +52,43 @@ export class Data extends Construct {
       removalPolicy: props.retainData ? cdk.RemovalPolicy.RETAIN : cdk.RemovalPolicy.DESTROY,
     });
 
+    // pre-generated questions per normalized keyword set, see app/generator.py
+    const poolTable = new dynamodb.Table(this, 'PoolTable', {
+      partitionKey: {
+        name: 'Topic',
+        type: dynamodb.AttributeType.STRING,
+      },
+      sortKey: {
+        name: 'QuestionId',
+        type: dynamodb.AttributeType.NUMBER,
+      },
+      removalPolicy: props.retainData ? cdk.RemovalPolicy.RETAIN : cdk.RemovalPolicy.DESTROY,
+    });
+
+    // short-lived generation leases, see app/single_flight.py
+    const leaseTable = new dynamodb.Table(this, 'LeaseTable', {
+      partitionKey: {
+        name: 'LeaseKey',
+        type: dynamodb.AttributeType.STRING,
+      },
+      timeToLiveAttribute: 'ExpiresAt',
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
+    // responses to requests sent with an Idempotency-Key, see app/idempotency.py
+    const idempotencyTable = new dynamodb.Table(this, 'IdempotencyTable', {
+      partitionKey: {
+        name: 'IdempotencyKey',
+        type: dynamodb.AttributeType.STRING,
+      },
+      timeToLiveAttribute: 'ExpiresAt',
+      removalPolicy: cdk.RemovalPolicy.DESTROY,
+    });
+
     this.gameTable = gameTable;
     this.questionTable = questionTable;
+    this.poolTable = poolTable;
+    this.leaseTable = leaseTable;
+    this.idempotencyTable = idempotencyTable;
   }
 }
@@ -7,6 +7,7 @@ interface ChatMemoryProps {
 }
 
 export class ChatMemory extends Construct {
+  public readonly historyTable : dynamodb.Table;
   public readonly memoryTable : dynamodb.Table;
 
   constructor(scope: Construct, id: string, props: ChatMemoryProps) {
@@ -20,6 +21,20 @@ export class ChatMemory extends Construct {
       removalPolicy: props.retainData ? cdk.RemovalPolicy.RETAIN : cdk.RemovalPolicy.DESTROY,
     });
 
+    // one item per message, read in windows from the latest Seq backwards
+    const historyTable = new dynamodb.Table(this, 'HistoryTable', {
+      partitionKey: {
+        name: 'SessionId',
+        type: dynamodb.AttributeType.STRING,
+      },
+      sortKey: {
+        name: 'Seq',
+        type: dynamodb.AttributeType.NUMBER,
+      },
+      removalPolicy: props.retainData ? cdk.RemovalPolicy.RETAIN : cdk.RemovalPolicy.DESTROY,
+    });
+
+    this.historyTable = historyTable;
     this.memoryTable = memoryTable;
   }
 }